@@ -0,0 +1,164 @@
+"""
+Módulo de saídas de áudio
+Implementa saídas de áudio intercambiáveis para reprodução de PCM: alto-falante via PyAudio e saída nula
+"""
+
+import time
+
+
+class AudioSink:
+    """
+    Interface base para saídas de áudio mono int16
+    
+    A saída é aberta uma vez e recebe blocos de PCM com `write`, que bloqueia
+    até o bloco ser aceito pelo dispositivo. Blocos escritos em sequência são
+    reproduzidos sem intervalo.
+    """
+    
+    def open(self, sample_rate):
+        """
+        Abre a saída de áudio
+        
+        Args:
+            sample_rate (int): Taxa de amostragem do áudio em Hz
+        """
+        self.sample_rate = sample_rate
+    
+    def write(self, data):
+        """
+        Escreve um bloco de áudio
+        
+        Args:
+            data (bytes): Amostras int16
+        """
+        raise NotImplementedError
+    
+    @property
+    def latency(self):
+        """Latência de saída do dispositivo em segundos (áudio ainda no buffer após write)"""
+        return 0.0
+    
+    def close(self):
+        """Fecha a saída de áudio"""
+    
+    def terminate(self):
+        """Libera recursos permanentes da saída (ex: instância do PyAudio)"""
+        self.close()
+
+
+class PyAudioSink(AudioSink):
+    """Reprodução no alto-falante via PyAudio, inicializado apenas ao abrir a saída"""
+    
+    def __init__(self, output_device_index=None, frames_per_buffer=1024):
+        """
+        Inicializa a saída de alto-falante
+        
+        Args:
+            output_device_index (int): Índice do dispositivo de saída (padrão do sistema se None)
+            frames_per_buffer (int): Amostras por buffer do PortAudio
+        """
+        self.output_device_index = output_device_index
+        self.frames_per_buffer = frames_per_buffer
+        self.p = None
+        self.stream = None
+    
+    def open(self, sample_rate):
+        super().open(sample_rate)
+        
+        # Importar PyAudio apenas quando o alto-falante for realmente usado
+        import pyaudio
+        
+        if self.p is None:
+            self.p = pyaudio.PyAudio()
+        
+        self.stream = self.p.open(
+            format=pyaudio.paInt16,
+            channels=1,
+            rate=sample_rate,
+            output=True,
+            output_device_index=self.output_device_index,
+            frames_per_buffer=self.frames_per_buffer
+        )
+    
+    def write(self, data):
+        self.stream.write(data)
+    
+    @property
+    def latency(self):
+        if self.stream is None:
+            return 0.0
+        return self.stream.get_output_latency()
+    
+    def close(self):
+        if self.stream:
+            self.stream.stop_stream()
+            self.stream.close()
+            self.stream = None
+    
+    def terminate(self):
+        self.close()
+        if self.p:
+            self.p.terminate()
+            self.p = None
+
+
+class NullSink(AudioSink):
+    """
+    Saída de áudio que descarta as amostras, para uso sem dispositivo (testes, servidores)
+    
+    Com realtime=True a escrita é cadenciada pela duração de cada bloco,
+    simulando um alto-falante; com realtime=False retorna imediatamente.
+    """
+    
+    def __init__(self, realtime=True, keep_audio=False):
+        """
+        Inicializa a saída nula
+        
+        Args:
+            realtime (bool): Se True, cada escrita dura o tempo do áudio escrito
+            keep_audio (bool): Se True, guarda as amostras escritas em `audio`
+        """
+        self.realtime = realtime
+        self.keep_audio = keep_audio
+        self.audio = bytearray()
+        self.frames_written = 0
+        self.opens = 0
+        self._next_write_time = None
+    
+    def open(self, sample_rate):
+        super().open(sample_rate)
+        self.opens += 1
+        self._next_write_time = None
+    
+    def write(self, data):
+        frames = len(data) // 2
+        self.frames_written += frames
+        if self.keep_audio:
+            self.audio.extend(data)
+        
+        if self.realtime:
+            # Como um dispositivo real: esperar até o bloco anterior ter sido "tocado"
+            now = time.monotonic()
+            if self._next_write_time is None or self._next_write_time < now:
+                self._next_write_time = now
+            delay = self._next_write_time - now
+            if delay > 0:
+                time.sleep(delay)
+            self._next_write_time += frames / self.sample_rate
+    
+    def close(self):
+        self._next_write_time = None
+
+
+def default_sink():
+    """
+    Saída de áudio padrão
+    
+    Returns:
+        AudioSink: PyAudioSink se o PyAudio estiver instalado, senão None
+    """
+    try:
+        import pyaudio
+    except ImportError:
+        return None
+    return PyAudioSink()
@@ -0,0 +1,232 @@
+"""
+Módulo de fontes de áudio
+Implementa entradas de áudio intercambiáveis: microfone, arquivos WAV/PCM e arrays em memória
+"""
+
+import time
+import wave
+import numpy as np
+
+
+class AudioStreamClosed(Exception):
+    """Sinaliza que o stream de áudio foi encerrado durante uma leitura"""
+
+
+class AudioSource:
+    """
+    Interface base para fontes de áudio mono int16
+    
+    As subclasses implementam `read`, que devolve `chunk_size` amostras em
+    bytes e levanta AudioStreamClosed quando não há mais áudio.
+    """
+    
+    # Indica se a fonte pode entregar frames por callback (modo não bloqueante)
+    supports_callback = False
+    
+    def open(self, sample_rate, chunk_size, on_frame=None):
+        """
+        Abre a fonte de áudio
+        
+        Args:
+            sample_rate (int): Taxa de amostragem esperada em Hz
+            chunk_size (int): Amostras por frame
+            on_frame (callable): Função chamada com (dados, overflow) a cada frame,
+                apenas em fontes que suportam callback
+        """
+        self.sample_rate = sample_rate
+        self.chunk_size = chunk_size
+    
+    def read(self, chunk_size):
+        """
+        Lê um frame de áudio
+        
+        Args:
+            chunk_size (int): Número de amostras
+        
+        Returns:
+            bytes: Amostras int16
+        """
+        raise NotImplementedError
+    
+    def close(self):
+        """Fecha a fonte de áudio"""
+    
+    def terminate(self):
+        """Libera recursos permanentes da fonte (ex: instância do PyAudio)"""
+        self.close()
+
+
+class MicrophoneSource(AudioSource):
+    """Captura do microfone via PyAudio, inicializado apenas ao abrir a fonte"""
+    
+    supports_callback = True
+    
+    def __init__(self, input_device_index=None):
+        """
+        Inicializa a fonte de microfone
+        
+        Args:
+            input_device_index (int): Índice do dispositivo de entrada (padrão do sistema se None)
+        """
+        self.input_device_index = input_device_index
+        self.p = None
+        self.stream = None
+        self._on_frame = None
+    
+    def open(self, sample_rate, chunk_size, on_frame=None):
+        super().open(sample_rate, chunk_size, on_frame)
+        
+        # Importar PyAudio apenas quando o microfone for realmente usado
+        import pyaudio
+        self._pyaudio = pyaudio
+        
+        if self.p is None:
+            self.p = pyaudio.PyAudio()
+        
+        self._on_frame = on_frame
+        self.stream = self.p.open(
+            format=pyaudio.paInt16,
+            channels=1,
+            rate=sample_rate,
+            input=True,
+            input_device_index=self.input_device_index,
+            frames_per_buffer=chunk_size,
+            stream_callback=self._stream_callback if on_frame else None
+        )
+    
+    def _stream_callback(self, in_data, frame_count, time_info, status_flags):
+        """Callback do PyAudio executado na thread de áudio do PortAudio"""
+        overflowed = bool(status_flags & self._pyaudio.paInputOverflow)
+        self._on_frame(in_data, overflowed)
+        return (None, self._pyaudio.paContinue)
+    
+    def read(self, chunk_size):
+        if self.stream is None:
+            raise AudioStreamClosed()
+        return self.stream.read(chunk_size, exception_on_overflow=False)
+    
+    def close(self):
+        if self.stream:
+            self.stream.stop_stream()
+            self.stream.close()
+            self.stream = None
+    
+    def terminate(self):
+        self.close()
+        if self.p:
+            self.p.terminate()
+            self.p = None
+
+
+class ArraySource(AudioSource):
+    """
+    Fonte de áudio a partir de amostras em memória
+    
+    Com realtime=False (modo velocidade máxima) os frames são entregues tão
+    rápido quanto o consumidor os processa; com realtime=True a leitura é
+    cadenciada pela duração de cada frame, simulando um microfone.
+    """
+    
+    def __init__(self, samples, sample_rate=16000, realtime=False):
+        """
+        Inicializa a fonte de array
+        
+        Args:
+            samples (numpy.ndarray): Amostras mono int16
+            sample_rate (int): Taxa de amostragem das amostras em Hz
+            realtime (bool): Se True, entrega os frames em tempo real
+        """
+        self.samples = np.asarray(samples, dtype=np.int16).reshape(-1)
+        self.source_rate = sample_rate
+        self.realtime = realtime
+        self.position = 0
+        self._next_frame_time = None
+    
+    @property
+    def duration(self):
+        """Duração total do áudio em segundos"""
+        return len(self.samples) / self.source_rate
+    
+    def open(self, sample_rate, chunk_size, on_frame=None):
+        super().open(sample_rate, chunk_size, on_frame)
+        
+        if sample_rate != self.source_rate:
+            raise ValueError(
+                f"Taxa de amostragem da fonte ({self.source_rate} Hz) "
+                f"diferente da esperada ({sample_rate} Hz)"
+            )
+        
+        self.position = 0
+        self._next_frame_time = None
+    
+    def read(self, chunk_size):
+        if self.position >= len(self.samples):
+            raise AudioStreamClosed()
+        
+        if self.realtime:
+            self._wait_frame(chunk_size)
+        
+        chunk = self.samples[self.position:self.position + chunk_size]
+        self.position += chunk_size
+        
+        # Completar o último frame com silêncio para manter o tamanho fixo
+        if len(chunk) < chunk_size:
+            chunk = np.concatenate([chunk, np.zeros(chunk_size - len(chunk), dtype=np.int16)])
+        
+        return chunk.tobytes()
+    
+    def _wait_frame(self, chunk_size):
+        """Aguarda até o instante em que o frame estaria disponível em tempo real"""
+        now = time.monotonic()
+        if self._next_frame_time is None:
+            self._next_frame_time = now
+        
+        delay = self._next_frame_time - now
+        if delay > 0:
+            time.sleep(delay)
+        self._next_frame_time += chunk_size / self.source_rate
+
+
+class WavFileSource(ArraySource):
+    """Fonte de áudio a partir de um arquivo WAV mono de 16 bits"""
+    
+    def __init__(self, path, realtime=False):
+        """
+        Inicializa a fonte de arquivo WAV
+        
+        Args:
+            path (str): Caminho para o arquivo WAV (ou objeto de arquivo)
+            realtime (bool): Se True, entrega os frames em tempo real
+        """
+        with wave.open(path, 'rb') as wf:
+            if wf.getnchannels() != 1 or wf.getsampwidth() != 2:
+                raise ValueError("O arquivo WAV deve ser mono com amostras de 16 bits")
+            sample_rate = wf.getframerate()
+            samples = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+        
+        self.path = path
+        super().__init__(samples, sample_rate=sample_rate, realtime=realtime)
+
+
+class RawPCMSource(ArraySource):
+    """Fonte de áudio a partir de PCM bruto (int16 little-endian, mono)"""
+    
+    def __init__(self, data, sample_rate=16000, realtime=False):
+        """
+        Inicializa a fonte de PCM bruto
+        
+        Args:
+            data: Caminho para o arquivo, bytes ou objeto de arquivo binário
+            sample_rate (int): Taxa de amostragem do áudio em Hz
+            realtime (bool): Se True, entrega os frames em tempo real
+        """
+        if isinstance(data, str):
+            with open(data, 'rb') as f:
+                data = f.read()
+        elif hasattr(data, 'read'):
+            data = data.read()
+        
+        # Descartar um byte final incompleto
+        data = data[:len(data) - len(data) % 2]
+        samples = np.frombuffer(data, dtype='<i2').astype(np.int16)
+        super().__init__(samples, sample_rate=sample_rate, realtime=realtime)
@@ -0,0 +1,268 @@
+"""
+Módulo de reconhecimento rápido de comandos por gramática
+Reconhece os comandos curtos de GeneralCommandProcessor com um vocabulário fechado antes de recorrer ao Whisper
+
+As frases da gramática são obtidas expandindo os padrões de
+`command_patterns` que não têm texto livre (ex: "que horas são",
+"(aumente|diminua) o volume"). Grupos de texto livre, como o cômodo em
+"(acenda|apague) a luz d[ao] ([\\w\\s]+)", só entram na gramática quando há
+valores de slot configurados para a categoria.
+"""
+
+import io
+import json
+import time
+import numpy as np
+
+try:
+    import re._parser as sre_parse
+    from re._constants import LITERAL, IN, SUBPATTERN, BRANCH, MAX_REPEAT, MIN_REPEAT, AT
+except ImportError:
+    import sre_parse
+    from sre_constants import LITERAL, IN, SUBPATTERN, BRANCH, MAX_REPEAT, MIN_REPEAT, AT
+
+from modules.stt_backends import VOSK_AVAILABLE
+from modules.speech_recognition import decode_wav, pcm_to_float32, WHISPER_SAMPLE_RATE
+
+if VOSK_AVAILABLE:
+    import vosk
+
+
+def _expand(parsed, slots, limit):
+    """
+    Enumera as frases aceitas por uma expressão regular analisada
+    
+    Args:
+        parsed: Sequência de (opcode, argumento) de sre_parse
+        slots (list): Valores para grupos de captura de texto livre
+        limit (int): Número máximo de frases
+    
+    Returns:
+        list: Frases possíveis ou None se a expressão não for finita
+    """
+    phrases = [""]
+    for op, av in parsed:
+        if op is LITERAL:
+            options = [chr(av)]
+        elif op is IN:
+            if not all(item_op is LITERAL for item_op, _ in av):
+                return None
+            options = [chr(value) for _, value in av]
+        elif op is SUBPATTERN:
+            group, _, _, pattern = av
+            options = _expand(pattern, slots, limit)
+            if options is None:
+                # Texto livre em grupo de captura: usar os valores de slot
+                if group is None or not slots:
+                    return None
+                options = list(slots)
+        elif op is BRANCH:
+            options = []
+            for branch in av[1]:
+                expanded = _expand(branch, slots, limit)
+                if expanded is None:
+                    return None
+                options.extend(expanded)
+        elif op in (MAX_REPEAT, MIN_REPEAT):
+            low, high, pattern = av
+            expanded = _expand(pattern, slots, limit)
+            if (low, high) != (0, 1) or expanded is None:
+                return None
+            options = [""] + expanded
+        elif op is AT:
+            options = [""]
+        else:
+            return None
+        
+        phrases = [p + o for p in phrases for o in options]
+        if len(phrases) > limit:
+            return None
+    
+    return phrases
+
+
+def expand_pattern(pattern, slots=None, limit=64):
+    """
+    Expande um padrão de comando em frases
+    
+    Args:
+        pattern (str): Expressão regular do comando
+        slots (list): Valores para grupos de texto livre (ex: nomes de cômodos)
+        limit (int): Número máximo de frases por padrão
+    
+    Returns:
+        list: Frases normalizadas ou lista vazia se o padrão não for finito
+    """
+    phrases = _expand(sre_parse.parse(pattern), slots, limit)
+    if phrases is None:
+        return []
+    return sorted({" ".join(p.lower().split()) for p in phrases if p.strip()})
+
+
+def build_grammar(command_patterns, slot_values=None, limit=64):
+    """
+    Constrói a gramática a partir dos padrões de comando
+    
+    Args:
+        command_patterns (dict): Categoria -> lista de expressões regulares
+        slot_values (dict): Categoria -> valores para os grupos de texto livre
+        limit (int): Número máximo de frases por padrão
+    
+    Returns:
+        dict: Frase -> categoria
+    """
+    slot_values = slot_values or {}
+    grammar = {}
+    for category, patterns in command_patterns.items():
+        for pattern in patterns:
+            for phrase in expand_pattern(pattern, slot_values.get(category), limit):
+                grammar.setdefault(phrase, category)
+    return grammar
+
+
+class GrammarRecognizer:
+    """
+    Reconhecedor de comandos com vocabulário fechado (Vosk com gramática)
+    
+    Um resultado só é aceito se for exatamente uma das frases da gramática e
+    todas as palavras tiverem confiança mínima; caso contrário o áudio segue
+    para o WhisperRecognizer.
+    """
+    
+    def __init__(self, recognizer, command_patterns=None, slot_values=None,
+                 model_path="vosk-model-small-pt-0.3", min_confidence=0.8):
+        """
+        Inicializa o reconhecedor por gramática
+        
+        Args:
+            recognizer (WhisperRecognizer): Reconhecedor usado quando a gramática não aceita
+            command_patterns (dict): Padrões de comando (padrão: GeneralCommandProcessor)
+            slot_values (dict): Categoria -> valores dos grupos de texto livre
+                (ex: {"luzes": ["sala", "cozinha"]})
+            model_path (str): Diretório ou nome de um modelo Vosk pequeno
+            min_confidence (float): Confiança mínima de cada palavra
+        """
+        if command_patterns is None:
+            from modules.general_command_processor import GeneralCommandProcessor
+            command_patterns = GeneralCommandProcessor().command_patterns
+        
+        self.recognizer = recognizer
+        self.grammar = build_grammar(command_patterns, slot_values)
+        self.min_confidence = min_confidence
+        self.model = None
+        
+        # Contadores
+        self.attempts = 0
+        self.hits = 0
+        self.grammar_time = 0.0
+        self.hit_time = 0.0
+        self.fallback_time = 0.0
+        self.fallbacks = 0
+        
+        if VOSK_AVAILABLE and self.grammar:
+            try:
+                vosk.SetLogLevel(-1)
+                if model_path.startswith("vosk-model"):
+                    self.model = vosk.Model(model_name=model_path)
+                else:
+                    self.model = vosk.Model(model_path)
+                self._grammar_json = json.dumps(sorted(self.grammar) + ["[unk]"], ensure_ascii=False)
+                print(f"Gramática de comandos carregada: {len(self.grammar)} frases")
+            except Exception as e:
+                print(f"Erro ao carregar modelo Vosk: {e}")
+                self.model = None
+        else:
+            print("Reconhecimento por gramática indisponível, usando apenas Whisper")
+    
+    def recognize(self, audio):
+        """
+        Reconhece um comando da gramática
+        
+        Args:
+            audio (numpy.ndarray): Amostras float32 a 16 kHz
+        
+        Returns:
+            tuple: (frase, categoria) ou None se nenhum comando for aceito com confiança
+        """
+        recognizer = vosk.KaldiRecognizer(self.model, WHISPER_SAMPLE_RATE, self._grammar_json)
+        recognizer.SetWords(True)
+        recognizer.AcceptWaveform((np.clip(audio, -1.0, 1.0) * 32767).astype('<i2').tobytes())
+        result = json.loads(recognizer.FinalResult())
+        
+        text = result.get("text", "").strip()
+        words = result.get("result", [])
+        if text not in self.grammar or not words:
+            return None
+        if min(w.get("conf", 0.0) for w in words) < self.min_confidence:
+            return None
+        return text, self.grammar[text]
+    
+    def transcribe(self, audio_data):
+        """
+        Transcreve um comando, tentando a gramática antes do Whisper
+        
+        Args:
+            audio_data: Objeto BytesIO com áudio WAV, bytes WAV, caminho para
+                arquivo WAV ou array numpy a 16 kHz
+        
+        Returns:
+            str: Texto reconhecido
+        """
+        audio = self._load_audio(audio_data) if self.model is not None else None
+        
+        if audio is not None:
+            self.attempts += 1
+            start = time.perf_counter()
+            match = self.recognize(audio)
+            elapsed = time.perf_counter() - start
+            self.grammar_time += elapsed
+            if match is not None:
+                self.hits += 1
+                self.hit_time += elapsed
+                return match[0]
+        
+        start = time.perf_counter()
+        text = self.recognizer.transcribe(audio_data)
+        self.fallback_time += time.perf_counter() - start
+        self.fallbacks += 1
+        return text
+    
+    @staticmethod
+    def _load_audio(audio_data):
+        """Converte a entrada em amostras float32 a 16 kHz (None se não for WAV nem array)"""
+        if isinstance(audio_data, np.ndarray):
+            return pcm_to_float32(audio_data)
+        if isinstance(audio_data, (bytes, bytearray, io.BytesIO)):
+            return decode_wav(audio_data)
+        if isinstance(audio_data, str) and audio_data.lower().endswith(".wav"):
+            return decode_wav(audio_data)
+        return None
+    
+    def get_stats(self):
+        """
+        Obtém estatísticas do caminho rápido
+        
+        A economia por acerto é a latência média do Whisper (medida nas
+        transcrições que não foram aceitas pela gramática) menos a latência
+        média da gramática nos acertos.
+        
+        Returns:
+            dict: Tentativas, acertos, taxa de acerto e latências
+        """
+        hit_latency = self.hit_time / self.hits if self.hits else None
+        whisper_latency = self.fallback_time / self.fallbacks if self.fallbacks else None
+        saved = None
+        if hit_latency is not None and whisper_latency is not None:
+            saved = whisper_latency - hit_latency
+        
+        return {
+            "phrases": len(self.grammar),
+            "attempts": self.attempts,
+            "hits": self.hits,
+            "hit_rate": self.hits / self.attempts if self.attempts else 0.0,
+            "grammar_latency_mean": self.grammar_time / self.attempts if self.attempts else None,
+            "hit_latency_mean": hit_latency,
+            "whisper_latency_mean": whisper_latency,
+            "latency_saved_per_hit": saved,
+            "latency_saved_total": saved * self.hits if saved is not None else None
+        }
@@ -86,6 +86,14 @@ class CommandProcessor:
                 r"como integrar chatbots em um site"
             ]
         }
+        
+        # Respostas genéricas quando nada é encontrado
+        self.respostas_fallback = [
+            "Não tenho informações específicas sobre isso. Posso falar sobre assistentes virtuais como Siri e Alexa, modelos de linguagem como ChatGPT e Gemini, ou outros tipos de IA.",
+            "Não encontrei informações sobre esse tópico na minha base de conhecimento. Posso ajudar com informações sobre assistentes virtuais, LLMs, chatbots e outras tecnologias de IA.",
+            "Não tenho dados suficientes para responder a essa pergunta. Que tal me perguntar sobre assistentes virtuais populares, modelos de linguagem ou chatbots?",
+            "Não consegui entender completamente sua pergunta. Posso fornecer informações sobre Siri, Alexa, Google Assistente, ChatGPT, Gemini e muitas outras tecnologias de IA."
+        ]
     
     def process_command(self, text):
         """
@@ -293,14 +301,24 @@ class CommandProcessor:
                     response += "\nPode me perguntar mais especificamente sobre algum desses tópicos?"
                     return response
         
-        # Respostas genéricas quando nada é encontrado
-        generic_responses = [
-            "Não tenho informações específicas sobre isso. Posso falar sobre assistentes virtuais como Siri e Alexa, modelos de linguagem como ChatGPT e Gemini, ou outros tipos de IA.",
-            "Não encontrei informações sobre esse tópico na minha base de conhecimento. Posso ajudar com informações sobre assistentes virtuais, LLMs, chatbots e outras tecnologias de IA.",
-            "Não tenho dados suficientes para responder a essa pergunta. Que tal me perguntar sobre assistentes virtuais populares, modelos de linguagem ou chatbots?",
-            "Não consegui entender completamente sua pergunta. Posso fornecer informações sobre Siri, Alexa, Google Assistente, ChatGPT, Gemini e muitas outras tecnologias de IA."
-        ]
-        return random.choice(generic_responses)
+        return random.choice(self.respostas_fallback)
+    
+    def static_responses(self):
+        """
+        Lista as respostas fixas do processador (ex: para pré-síntese de voz)
+        
+        Inclui as respostas genéricas e os resumos da base de conhecimento
+        usados quando uma busca encontra um único item.
+        
+        Returns:
+            list: Respostas que não dependem do texto do comando
+        """
+        responses = list(self.respostas_fallback)
+        for categoria in ('assistentes_virtuais', 'llms', 'outras_ias', 'chatbots'):
+            for item in self.knowledge_base.listar_itens_categoria(categoria):
+                info = self.knowledge_base.obter_informacao(categoria, item)
+                responses.append(self.knowledge_base.formatar_resposta(info, 'resumido'))
+        return responses
 
 # Exemplo de uso
 if __name__ == "__main__":
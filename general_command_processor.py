@@ -235,16 +235,17 @@ class GeneralCommandProcessor:
         }
         
         # Respostas pré-definidas para comandos sem integração real
+        # (as de hora e data são modelos preenchidos a cada pedido)
         self.respostas = {
             "hora": [
-                f"Agora são {datetime.datetime.now().strftime('%H:%M')}.",
-                f"São {datetime.datetime.now().strftime('%H:%M')} no momento.",
-                f"O horário atual é {datetime.datetime.now().strftime('%H:%M')}."
+                "Agora são {hora}.",
+                "São {hora} no momento.",
+                "O horário atual é {hora}."
             ],
             "data": [
-                f"Hoje é {datetime.datetime.now().strftime('%d/%m/%Y')}.",
-                f"Estamos em {datetime.datetime.now().strftime('%d de %B de %Y')}.",
-                f"A data de hoje é {datetime.datetime.now().strftime('%d/%m/%Y')}."
+                "Hoje é {data}.",
+                "Estamos em {data_extenso}.",
+                "A data de hoje é {data}."
             ],
             "piada": [
                 "Por que o computador foi ao médico? Porque estava com vírus!",
@@ -279,6 +280,27 @@ class GeneralCommandProcessor:
                 "Posso jogar um jogo de perguntas e respostas com você. Quer começar?"
             ]
         }
+        
+        # Categorias cujas respostas dependem do momento do pedido
+        self.respostas_dinamicas = {"hora", "data"}
+        
+        # Confirmações fixas de comandos sem parâmetros
+        self.respostas_comando = {
+            "noticias": "As notícias mais recentes incluem atualizações sobre política, economia, esportes e entretenimento. Posso buscar notícias específicas sobre algum tópico de seu interesse.",
+            "lista_compras_mostrar": "Sua lista de compras está vazia ou não está disponível no momento.",
+            "calendario_consulta": "Você não tem compromissos agendados para hoje ou seu calendário não está disponível no momento.",
+            "ler_mensagens": "Você não tem novas mensagens ou suas mensagens não estão disponíveis no momento.",
+            "musica_atual": "Nenhuma música está tocando no momento.",
+            "audiolivro": "Continuando a reprodução do seu audiolivro..."
+        }
+        
+        # Respostas genéricas quando nada é encontrado
+        self.respostas_fallback = [
+            "Não entendi completamente o que você pediu. Pode reformular de outra maneira?",
+            "Não tenho certeza do que você está pedindo. Pode ser mais específico?",
+            "Desculpe, não consegui processar esse comando. Tente algo como 'Brandini, que horas são?' ou 'Brandini, defina um alarme para 8h'.",
+            "Não reconheci esse comando. Diga 'Brandini, o que você pode fazer?' para ver algumas sugestões."
+        ]
     
     def process_command(self, text):
         """
@@ -334,7 +356,18 @@ class GeneralCommandProcessor:
         """
         # Respostas para categorias com respostas pré-definidas
         if category in self.respostas:
-            return random.choice(self.respostas[category])
+            resposta = random.choice(self.respostas[category])
+            if category in self.respostas_dinamicas:
+                agora = datetime.datetime.now()
+                resposta = resposta.format(
+                    hora=agora.strftime('%H:%M'),
+                    data=agora.strftime('%d/%m/%Y'),
+                    data_extenso=agora.strftime('%d de %B de %Y')
+                )
+            return resposta
+        
+        if category in self.respostas_comando:
+            return self.respostas_comando[category]
         
         # Respostas para categorias específicas
         if category == "tempo":
@@ -360,9 +393,6 @@ class GeneralCommandProcessor:
             idioma = params[1] if len(params) > 1 else ""
             return f"A tradução de '{texto}' para {idioma} não está disponível no momento. Posso buscar isso para você em um serviço de tradução."
         
-        elif category == "noticias":
-            return "As notícias mais recentes incluem atualizações sobre política, economia, esportes e entretenimento. Posso buscar notícias específicas sobre algum tópico de seu interesse."
-        
         elif category == "distancia" or category == "tempo_viagem":
             destino = params[0] if params else ""
             if category == "distancia":
@@ -411,17 +441,11 @@ class GeneralCommandProcessor:
             item = params[0] if params else ""
             return f"{item} adicionado à sua lista de compras."
         
-        elif category == "lista_compras_mostrar":
-            return "Sua lista de compras está vazia ou não está disponível no momento."
-        
         elif category == "calendario_evento":
             evento = params[0] if len(params) > 0 else ""
             horario = params[1] if len(params) > 1 else ""
             return f"Evento adicionado ao calendário: {evento} às {horario}."
         
-        elif category == "calendario_consulta":
-            return "Você não tem compromissos agendados para hoje ou seu calendário não está disponível no momento."
-        
         elif category == "anotacao":
             texto = params[0] if params else ""
             return f"Anotação salva: {texto}"
@@ -435,9 +459,6 @@ class GeneralCommandProcessor:
             mensagem = params[1] if len(params) > 1 else ""
             return f"Mensagem enviada para {contato}: '{mensagem}'"
         
-        elif category == "ler_mensagens":
-            return "Você não tem novas mensagens ou suas mensagens não estão disponíveis no momento."
-        
         elif category == "videochamada":
             contato = params[0] if params else ""
             return f"Iniciando videochamada com {contato}..."
@@ -454,12 +475,6 @@ class GeneralCommandProcessor:
             acao = params[0] if params else ""
             return f"Música {acao}."
         
-        elif category == "musica_atual":
-            return "Nenhuma música está tocando no momento."
-        
-        elif category == "audiolivro":
-            return "Continuando a reprodução do seu audiolivro..."
-        
         elif category == "luzes":
             acao = params[0] if len(params) > 0 else ""
             local = params[1] if len(params) > 1 else ""
@@ -504,14 +519,24 @@ class GeneralCommandProcessor:
         Returns:
             str: Resposta gerada
         """
-        # Respostas genéricas quando nada é encontrado
-        generic_responses = [
-            "Não entendi completamente o que você pediu. Pode reformular de outra maneira?",
-            "Não tenho certeza do que você está pedindo. Pode ser mais específico?",
-            "Desculpe, não consegui processar esse comando. Tente algo como 'Brandini, que horas são?' ou 'Brandini, defina um alarme para 8h'.",
-            "Não reconheci esse comando. Diga 'Brandini, o que você pode fazer?' para ver algumas sugestões."
+        return random.choice(self.respostas_fallback)
+    
+    def static_responses(self):
+        """
+        Lista as respostas fixas do processador (ex: para pré-síntese de voz)
+        
+        As respostas de hora e data e as confirmações que repetem parâmetros
+        do comando (ex: "Alarme definido para 7h.") mudam a cada pedido e
+        ficam de fora.
+        
+        Returns:
+            list: Respostas pré-definidas, confirmações fixas e respostas genéricas
+        """
+        responses = [
+            r for category, options in self.respostas.items()
+            if category not in self.respostas_dinamicas for r in options
         ]
-        return random.choice(generic_responses)
+        return responses + list(self.respostas_comando.values()) + self.respostas_fallback
 
 # Exemplo de uso
 if __name__ == "__main__":
@@ -7,6 +7,8 @@ import os
 import time
 import json
 
+from modules.thread_budget import thread_budget
+
 # Verificar se OpenAI está disponível
 try:
     import openai
@@ -61,6 +63,7 @@ class LLMManager:
         if self.local_generator is None and TRANSFORMERS_AVAILABLE:
             try:
                 print(f"Inicializando modelo local {self.local_model}...")
+                thread_budget.apply_torch("llm")
                 self.local_generator = pipeline('text-generation', model=self.local_model)
                 print("Modelo local inicializado com sucesso!")
             except Exception as e:
@@ -163,8 +166,9 @@ class LLMManager:
                 
                 context += "Assistente: "
                 
-                # Gerar resposta
+                # Gerar resposta com o orçamento de threads do LLM
                 try:
+                    thread_budget.apply_torch("llm", verbose=False)
                     result = self.local_generator(
                         context, 
                         max_length=len(context.split()) + max_tokens,
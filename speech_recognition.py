@@ -4,106 +4,1074 @@ Implementa funcionalidades de transcrição de áudio para texto
 """
 
 import os
+import re
+import gc
+import time
 import tempfile
+import threading
 import io
 import numpy as np
 import wave
+import hashlib
+import asyncio
+import multiprocessing
+from collections import deque, OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, CancelledError, as_completed
+
+from modules.thread_budget import thread_budget
+from modules.stt_backends import (
+    WHISPER_AVAILABLE, TranscriptionCancelled, backend_available, load_backend_model
+)
 
 # Verificar se Whisper está disponível, caso contrário usar mock
-try:
-    import whisper
-    WHISPER_AVAILABLE = True
-except ImportError:
-    WHISPER_AVAILABLE = False
+if not WHISPER_AVAILABLE:
     print("Aviso: Whisper não está disponível. Usando implementação simulada.")
 
+# Taxa de amostragem esperada pelo Whisper
+WHISPER_SAMPLE_RATE = 16000
+
+# Perfis de decodificação
+#   decode_options: argumentos repassados a model.transcribe
+#   deadline: tempo máximo de decodificação em segundos (None sem limite)
+#   min_rms_db: energia mínima do clipe; abaixo dela não há decodificação
+#   max_seconds: duração máxima do clipe decodificado
+DECODING_PROFILES = {
+    "default": {
+        "decode_options": {},
+        "deadline": None,
+        "min_rms_db": None,
+        "max_seconds": None
+    },
+    # Comandos curtos: decodificação gulosa única, sem fallback de temperatura
+    # nem contexto anterior, e rejeição de segmentos sem fala
+    "command": {
+        "decode_options": {
+            "temperature": 0.0,
+            "condition_on_previous_text": False,
+            "compression_ratio_threshold": None,
+            "logprob_threshold": None,
+            "no_speech_threshold": 0.6,
+            "without_timestamps": True,
+            "sample_len": 64
+        },
+        "deadline": 3.0,
+        "min_rms_db": -50.0,
+        "max_seconds": 10.0
+    }
+}
+
+
+def decode_wav(wav_data):
+    """
+    Decodifica áudio WAV PCM de 16 bits a 16 kHz para float32 mono, em memória
+    
+    Outras taxas de amostragem não são reamostradas aqui: o ffmpeg usado pelo
+    Whisper aplica um filtro anti-aliasing adequado.
+    
+    Args:
+        wav_data: Objeto BytesIO, bytes ou caminho para arquivo WAV
+        
+    Returns:
+        numpy.ndarray: Amostras float32 no intervalo [-1, 1] ou None se o
+            formato não puder ser decodificado sem ffmpeg
+    """
+    if isinstance(wav_data, (bytes, bytearray)):
+        wav_data = io.BytesIO(wav_data)
+    elif isinstance(wav_data, io.BytesIO):
+        wav_data.seek(0)
+    
+    try:
+        with wave.open(wav_data, 'rb') as wf:
+            if (wf.getsampwidth() != 2 or wf.getcomptype() != 'NONE'
+                    or wf.getframerate() != WHISPER_SAMPLE_RATE):
+                return None
+            channels = wf.getnchannels()
+            pcm = wf.readframes(wf.getnframes())
+    except (wave.Error, EOFError):
+        return None
+    
+    audio = np.frombuffer(pcm, dtype='<i2').astype(np.float32) / 32768.0
+    if channels > 1:
+        audio = audio.reshape(-1, channels).mean(axis=1, dtype=np.float32)
+    
+    return audio
+
+
+def pcm_to_float32(samples):
+    """
+    Converte amostras PCM a 16 kHz para o formato de entrada do Whisper
+    
+    Args:
+        samples (numpy.ndarray): Amostras int16 (ou float no intervalo [-1, 1])
+        
+    Returns:
+        numpy.ndarray: Amostras float32 mono
+    """
+    samples = np.asarray(samples).reshape(-1)
+    if np.issubdtype(samples.dtype, np.integer):
+        audio = samples.astype(np.float32) / 32768.0
+    else:
+        audio = samples.astype(np.float32, copy=False)
+    return audio
+
+
+class _RegistryEntry:
+    """Modelo registrado com contagem de referências"""
+    
+    def __init__(self):
+        self.model = None
+        self.refs = 0
+        self.last_used = time.monotonic()
+        self.load_lock = threading.Lock()
+        # A mesma instância não pode decodificar em duas threads ao mesmo tempo
+        # (o openai-whisper instala hooks de kv-cache nos módulos do decodificador)
+        self.inference_lock = threading.Lock()
+
+
+class WhisperModelRegistry:
+    """
+    Registro de modelos Whisper compartilhados pelo processo
+    
+    Os modelos são indexados por (backend, tamanho, dispositivo, precisão), carregados
+    no primeiro uso e entregues como a mesma instância a todos os
+    reconhecedores. Modelos sem referências por mais de `idle_ttl` segundos
+    são descarregados.
+    """
+    
+    def __init__(self, idle_ttl=600.0, loader=None):
+        """
+        Inicializa o registro
+        
+        Args:
+            idle_ttl (float): Segundos sem referências antes de descarregar um modelo (None desativa)
+            loader (callable): Função (backend, tamanho, dispositivo, precisão) -> modelo
+                (padrão: load_backend_model)
+        """
+        self.idle_ttl = idle_ttl
+        self.loader = loader or load_backend_model
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._janitor = None
+        
+        # Contadores
+        self.loads = 0
+        self.evictions = 0
+    
+    @staticmethod
+    def make_key(model_size, device=None, precision="fp32", backend="whisper"):
+        """Chave de registro de um modelo"""
+        return (backend, model_size, device or "auto", precision)
+    
+    def acquire(self, model_size, device=None, precision="fp32", backend="whisper"):
+        """
+        Obtém um modelo, carregando-o se necessário, e incrementa suas referências
+        
+        Args:
+            model_size (str): Tamanho do modelo Whisper
+            device (str): Dispositivo ('cpu', 'cuda' ou None para automático)
+            precision (str): Precisão dos pesos ('fp32' ou 'fp16')
+            backend (str): Backend de reconhecimento (ver STT_BACKENDS)
+            
+        Returns:
+            Modelo Whisper compartilhado
+        """
+        key = self.make_key(model_size, device, precision, backend)
+        with self._lock:
+            entry = self._entries.setdefault(key, _RegistryEntry())
+            entry.refs += 1
+        
+        # Carregamento fora do lock global: outros modelos continuam disponíveis
+        with entry.load_lock:
+            if entry.model is None:
+                try:
+                    print(f"Carregando modelo Whisper {model_size} ({backend})...")
+                    entry.model = self.loader(backend, model_size, device, precision)
+                    self.loads += 1
+                    print("Modelo Whisper carregado com sucesso!")
+                except Exception:
+                    with self._lock:
+                        entry.refs -= 1
+                        if entry.refs == 0 and self._entries.get(key) is entry:
+                            del self._entries[key]
+                    raise
+        
+        entry.last_used = time.monotonic()
+        self._start_janitor()
+        return entry.model
+    
+    def inference_lock(self, model_size, device=None, precision="fp32", backend="whisper"):
+        """
+        Obtém o lock de inferência de um modelo registrado
+        
+        Todas as chamadas a `transcribe` do modelo compartilhado devem ser
+        feitas com este lock.
+        
+        Args:
+            model_size (str): Tamanho do modelo Whisper
+            device (str): Dispositivo usado em acquire
+            precision (str): Precisão usada em acquire
+            backend (str): Backend usado em acquire
+            
+        Returns:
+            threading.Lock: Lock do modelo
+        """
+        key = self.make_key(model_size, device, precision, backend)
+        with self._lock:
+            return self._entries.setdefault(key, _RegistryEntry()).inference_lock
+    
+    def release(self, model_size, device=None, precision="fp32", backend="whisper"):
+        """
+        Libera uma referência a um modelo
+        
+        Args:
+            model_size (str): Tamanho do modelo Whisper
+            device (str): Dispositivo usado em acquire
+            precision (str): Precisão usada em acquire
+            backend (str): Backend usado em acquire
+        """
+        key = self.make_key(model_size, device, precision, backend)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.refs == 0:
+                return
+            entry.refs -= 1
+            entry.last_used = time.monotonic()
+    
+    def evict_idle(self):
+        """
+        Descarrega modelos sem referências há mais de `idle_ttl` segundos
+        
+        Returns:
+            list: Chaves dos modelos descarregados
+        """
+        if self.idle_ttl is None:
+            return []
+        
+        now = time.monotonic()
+        with self._lock:
+            evicted = [
+                key for key, entry in self._entries.items()
+                if entry.refs == 0 and now - entry.last_used > self.idle_ttl
+            ]
+            for key in evicted:
+                del self._entries[key]
+        
+        if evicted:
+            self.evictions += len(evicted)
+            self._free_memory()
+            print(f"Modelos Whisper descarregados por inatividade: {evicted}")
+        return evicted
+    
+    def clear(self):
+        """Descarrega todos os modelos, independentemente das referências"""
+        with self._lock:
+            self._entries.clear()
+        self._free_memory()
+    
+    @staticmethod
+    def _free_memory():
+        """Devolve a memória dos modelos descarregados"""
+        gc.collect()
+        try:
+            import torch
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+        except ImportError:
+            pass
+    
+    def _start_janitor(self):
+        """Inicia a thread que descarrega modelos inativos, se necessário"""
+        if self.idle_ttl is None or (self._janitor and self._janitor.is_alive()):
+            return
+        
+        self._janitor = threading.Thread(target=self._janitor_loop)
+        self._janitor.daemon = True
+        self._janitor.start()
+    
+    def _janitor_loop(self):
+        """Verifica periodicamente os modelos inativos enquanto houver modelos carregados"""
+        interval = max(1.0, min(60.0, self.idle_ttl / 2.0))
+        while True:
+            time.sleep(interval)
+            self.evict_idle()
+            with self._lock:
+                if not self._entries:
+                    return
+    
+    def get_stats(self):
+        """
+        Obtém o estado do registro
+        
+        Returns:
+            dict: Modelos carregados com referências e tempo ocioso, cargas e descarregamentos
+        """
+        now = time.monotonic()
+        with self._lock:
+            models = {
+                "/".join(key): {
+                    "refs": entry.refs,
+                    "loaded": entry.model is not None,
+                    "idle_seconds": now - entry.last_used if entry.refs == 0 else 0.0
+                }
+                for key, entry in self._entries.items()
+            }
+        return {"models": models, "loads": self.loads, "evictions": self.evictions}
+
+
+# Registro compartilhado por todos os reconhecedores do processo
+model_registry = WhisperModelRegistry()
+
+
+class TranscriptCache:
+    """
+    Cache LRU de transcrições indexado por uma impressão digital do áudio
+    
+    O clipe é aparado (silêncio nas pontas) e resumido em um hash espectral
+    quantizado: energia em bandas de frequência por segmento de tempo,
+    normalizada pelo ganho e arredondada em passos de `quant_db`. Falas quase
+    idênticas geram a mesma chave. Com exact_only=True a chave é o hash das
+    amostras aparadas, e só áudio idêntico é reaproveitado.
+    """
+    
+    def __init__(self, max_entries=256, exact_only=False, time_segments=24, bands=16, quant_db=4.0):
+        """
+        Inicializa o cache
+        
+        Args:
+            max_entries (int): Número máximo de transcrições guardadas
+            exact_only (bool): Se True, reaproveita apenas áudio idêntico
+            time_segments (int): Segmentos de tempo da impressão espectral
+            bands (int): Bandas de frequência por segmento
+            quant_db (float): Passo de quantização da energia em dB
+        """
+        self.max_entries = max_entries
+        self.exact_only = exact_only
+        self.time_segments = time_segments
+        self.bands = bands
+        self.quant_db = quant_db
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        
+        # Contadores
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def trim(audio, frame_size=160, threshold_db=-40.0):
+        """
+        Remove o silêncio do início e do fim do clipe
+        
+        Args:
+            audio (numpy.ndarray): Amostras float32
+            frame_size (int): Amostras por quadro de análise (10 ms a 16 kHz)
+            threshold_db (float): Limiar relativo ao quadro mais forte
+            
+        Returns:
+            numpy.ndarray: Amostras aparadas (vista do array original)
+        """
+        frames = len(audio) // frame_size
+        if frames == 0:
+            return audio
+        
+        energy = np.mean(np.square(audio[:frames * frame_size].reshape(frames, frame_size)), axis=1)
+        peak = energy.max()
+        if peak <= 0:
+            return audio[:0]
+        
+        voiced = np.nonzero(energy >= peak * 10 ** (threshold_db / 10))[0]
+        return audio[voiced[0] * frame_size:(voiced[-1] + 1) * frame_size]
+    
+    def fingerprint(self, audio):
+        """
+        Calcula a impressão digital de um clipe
+        
+        Args:
+            audio (numpy.ndarray): Amostras float32 a 16 kHz
+            
+        Returns:
+            str: Hash hexadecimal do clipe
+        """
+        audio = self.trim(np.asarray(audio, dtype=np.float32))
+        
+        if self.exact_only:
+            return hashlib.sha1(np.ascontiguousarray(audio).tobytes()).hexdigest()
+        
+        # Duração quantizada em 100 ms para separar falas de tamanhos diferentes
+        duration = int(round(len(audio) / (WHISPER_SAMPLE_RATE * 0.1)))
+        if len(audio) < self.time_segments * 2:
+            return f"{duration}:" + hashlib.sha1(audio.tobytes()).hexdigest()
+        
+        segment = len(audio) // self.time_segments
+        frames = audio[:segment * self.time_segments].reshape(self.time_segments, segment)
+        spectrum = np.abs(np.fft.rfft(frames, axis=1)) ** 2
+        
+        # Agrupar em bandas de largura logarítmica
+        edges = np.unique(np.geomspace(1, spectrum.shape[1], self.bands + 1).astype(int))
+        band_energy = np.add.reduceat(spectrum, edges[:-1], axis=1)
+        log_energy = 10 * np.log10(band_energy + 1e-10)
+        
+        # Normalizar o ganho e quantizar
+        log_energy -= log_energy.mean()
+        quantized = np.round(log_energy / self.quant_db).astype(np.int8)
+        return f"{duration}:" + hashlib.sha1(quantized.tobytes()).hexdigest()
+    
+    def get(self, key):
+        """
+        Busca uma transcrição
+        
+        Args:
+            key: Chave do clipe (ver make_key)
+            
+        Returns:
+            str: Texto transcrito ou None se ausente
+        """
+        with self._lock:
+            text = self._entries.get(key)
+            if text is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return text
+    
+    def put(self, key, text):
+        """Guarda uma transcrição, descartando a menos usada se o cache estiver cheio"""
+        with self._lock:
+            self._entries[key] = text
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def make_key(self, audio, language, profile, backend="whisper", model_size=None):
+        """
+        Chave do cache: modelo, idioma, perfil de decodificação e impressão digital
+        
+        O backend e o tamanho do modelo fazem parte da chave para que
+        reconhecedores com modelos diferentes possam compartilhar o cache.
+        """
+        return (backend, model_size, language, profile, self.fingerprint(audio))
+    
+    def clear(self):
+        """Esvazia o cache e zera os contadores"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+    
+    def get_stats(self):
+        """
+        Obtém estatísticas do cache
+        
+        Returns:
+            dict: Entradas, acertos, falhas e taxa de acerto
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "exact_only": self.exact_only,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+
+# Reconhecedor de cada processo do pool de transcrição em lote
+_batch_recognizer = None
+
+
+def _batch_worker_init(model_size, language, offline, device, precision, profile, backend, num_threads):
+    """
+    Inicializa um processo do pool de transcrição em lote
+    
+    Define o orçamento de Whisper do processo como a fatia de CPU do lote
+    (usada pelo PyTorch e pelo faster-whisper) e carrega o modelo uma única
+    vez, reutilizado em todos os itens.
+    """
+    global _batch_recognizer
+    # O número de threads do lote prevalece sobre o orçamento padrão do Whisper
+    thread_budget.set("whisper", intra=num_threads, inter=1)
+    
+    _batch_recognizer = WhisperRecognizer(
+        model_size=model_size,
+        language=language,
+        offline=offline,
+        device=device,
+        precision=precision,
+        preload=True,
+        profile=profile,
+        backend=backend
+    )
+
+
+def _batch_worker_transcribe(index, item):
+    """Transcreve um item no processo do pool, capturando erros"""
+    return _transcribe_item(_batch_recognizer, index, item)
+
+
+def _transcribe_item(recognizer, index, item):
+    """
+    Transcreve um item do lote
+    
+    Returns:
+        dict: Índice, texto (None em caso de erro), mensagem de erro e duração
+    """
+    start = time.perf_counter()
+    try:
+        if isinstance(item, (bytes, bytearray)):
+            item = io.BytesIO(item)
+        text = recognizer.transcribe(item)
+        error = None
+    except Exception as e:
+        text = None
+        error = f"{type(e).__name__}: {e}"
+    
+    return {
+        "index": index,
+        "text": text,
+        "error": error,
+        "seconds": time.perf_counter() - start
+    }
+
+
+class _AsyncRequest:
+    """Pedido de transcrição assíncrona com cancelamento e prazo"""
+    
+    def __init__(self, timeout=None):
+        self.cancel_event = threading.Event()
+        self.deadline = time.monotonic() + timeout if timeout is not None else None
+        self.future = None
+    
+    @property
+    def expired(self):
+        return self.deadline is not None and time.monotonic() >= self.deadline
+    
+    def cancel(self):
+        """Descarta o pedido se ainda estiver na fila e sinaliza o cancelamento se estiver em execução"""
+        self.cancel_event.set()
+        if self.future is not None:
+            self.future.cancel()
+
+
+class _CancelSignal:
+    """Cancelamento sinalizado por qualquer um de vários eventos (interface de threading.Event.is_set)"""
+    
+    def __init__(self, *events):
+        self.events = [event for event in events if event is not None]
+    
+    def is_set(self):
+        return any(event.is_set() for event in self.events)
+
+
 class WhisperRecognizer:
     """Reconhecedor de fala usando Whisper ou simulação"""
     
-    def __init__(self, model_size="base", language="pt", offline=True):
+    def __init__(self, model_size="base", language="pt", offline=True, device=None,
+                 precision="fp32", preload=False, registry=None, profile="default",
+                 cache=None, backend="whisper"):
         """
         Inicializa o reconhecedor de fala
         
+        O modelo é obtido do registro compartilhado no primeiro uso, de modo que
+        reconhecedores com a mesma configuração usam a mesma instância.
+        
         Args:
             model_size (str): Tamanho do modelo Whisper ('tiny', 'base', 'small', 'medium', 'large')
             language (str): Código do idioma (ex: 'pt', 'en')
             offline (bool): Se True, tenta usar Whisper, caso contrário usa simulação
+            device (str): Dispositivo ('cpu', 'cuda' ou None para automático)
+            precision (str): Precisão dos pesos ('fp32' ou 'fp16'; fp16 apenas em GPU)
+            preload (bool): Se True, carrega o modelo imediatamente
+            registry (WhisperModelRegistry): Registro de modelos (padrão: model_registry)
+            profile (str): Perfil de decodificação padrão (ver DECODING_PROFILES)
+            cache (TranscriptCache): Cache de transcrições (desativado se None)
+            backend (str): Backend de reconhecimento ('whisper', 'faster-whisper', 'vosk';
+                ver stt_backends.STT_BACKENDS)
         """
+        if profile not in DECODING_PROFILES:
+            raise ValueError(f"Perfil de decodificação desconhecido: {profile}")
+        
         self.model_size = model_size
         self.language = language
         self.offline = offline
+        self.device = device
+        self.precision = precision
+        self.backend = backend
+        self.registry = registry or model_registry
+        self._model = None
+        self._model_acquired = False
+        self._model_disabled = False
+        self._model_lock = threading.Lock()
+        self._inference_lock = threading.Lock()
+        self.profile = profile
+        self.cache = cache
         
-        # Inicializar modelo se disponível
-        if WHISPER_AVAILABLE and offline:
-            try:
-                print(f"Carregando modelo Whisper {model_size}...")
-                self.model = whisper.load_model(model_size)
-                print("Modelo Whisper carregado com sucesso!")
-            except Exception as e:
-                print(f"Erro ao carregar modelo Whisper: {e}")
-                self.model = None
-        else:
-            self.model = None
+        # Informações da última decodificação (perfil, duração, rejeição, prazo)
+        self.last_decode = None
+        
+        # Executor dedicado da API assíncrona (criado no primeiro uso)
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._pending = set()
+        self._local = threading.local()
+        self.cancelled = 0
+        
+        if not (backend_available(backend) and offline):
             print("Usando reconhecedor de fala simulado")
+        elif preload:
+            self.preload()
+    
+    @property
+    def model(self):
+        """Modelo Whisper, obtido do registro no primeiro acesso (None na simulação)"""
+        if (self._model is None and self.offline and not self._model_disabled
+                and backend_available(self.backend)):
+            with self._model_lock:
+                if self._model is None and not self._model_disabled:
+                    try:
+                        self._model = self.registry.acquire(
+                            self.model_size, self.device, self.precision, self.backend
+                        )
+                        self._inference_lock = self.registry.inference_lock(
+                            self.model_size, self.device, self.precision, self.backend
+                        )
+                        self._model_acquired = True
+                    except Exception as e:
+                        print(f"Erro ao carregar modelo Whisper: {e}")
+                        self._model_disabled = True
+        return self._model
+    
+    @model.setter
+    def model(self, value):
+        # Atribuir None desativa o modelo (simulação); outro valor substitui o registro
+        self.close()
+        self._model = value
+        self._model_disabled = value is None
+    
+    @property
+    def fp16(self):
+        """Indica se a decodificação usa meia precisão"""
+        return self.precision == "fp16"
+    
+    def preload(self):
+        """
+        Carrega o modelo imediatamente (ex: em segundo plano na inicialização)
+        
+        Returns:
+            bool: True se há um modelo Whisper disponível
+        """
+        return self.model is not None
+    
+    def close(self):
+        """Libera a referência ao modelo compartilhado"""
+        with self._model_lock:
+            if self._model_acquired:
+                self.registry.release(self.model_size, self.device, self.precision, self.backend)
+                self._model_acquired = False
+            self._model = None
     
-    def transcribe(self, audio_data):
+    def __del__(self):
+        """Liberar a referência ao modelo ao destruir o objeto"""
+        if hasattr(self, "_model_lock"):
+            self.close()
+        if getattr(self, "_executor", None):
+            self._executor.shutdown(wait=False, cancel_futures=True)
+    
+    def transcribe(self, audio_data, profile=None):
         """
         Transcreve áudio para texto
         
         Args:
-            audio_data: Objeto BytesIO contendo áudio WAV ou caminho para arquivo de áudio
+            audio_data: Objeto BytesIO contendo áudio WAV, caminho para arquivo de
+                áudio ou array numpy (int16 ou float32) a 16 kHz
+            profile (str): Perfil de decodificação (padrão: o do reconhecedor)
             
         Returns:
-            str: Texto transcrito
+            str: Texto transcrito (vazio se o áudio foi rejeitado ou o prazo expirou)
         """
+        profile = profile or self.profile
+        settings = DECODING_PROFILES[profile]
+        # Informações locais à chamada: chamadas concorrentes não compartilham o dicionário
+        info = {
+            "profile": profile,
+            "seconds": 0.0,
+            "rejected": False,
+            "timed_out": False,
+            "cached": False
+        }
+        start = time.perf_counter()
+        try:
+            return self._transcribe_with(audio_data, settings, info)
+        finally:
+            info["seconds"] = time.perf_counter() - start
+            self.last_decode = info
+    
+    def _transcribe_with(self, audio_data, settings, info):
+        """Transcreve com as configurações de um perfil, registrando a decodificação em info"""
         # Se não tiver modelo, usar simulação
         if self.model is None:
             return self._mock_transcribe(audio_data)
         
-        # Se audio_data for um objeto BytesIO, salvar em arquivo temporário
+        # Decodificar em memória (WAV PCM ou array), sem arquivo temporário nem ffmpeg
+        audio = self._load_audio(audio_data)
+        if audio is not None:
+            if settings["max_seconds"]:
+                audio = audio[:int(settings["max_seconds"] * WHISPER_SAMPLE_RATE)]
+            
+            # Rejeitar clipes sem energia antes de executar o modelo
+            if settings["min_rms_db"] is not None:
+                rms = np.sqrt(np.mean(np.square(audio))) if len(audio) else 0.0
+                if 20 * np.log10(rms + 1e-10) < settings["min_rms_db"]:
+                    info["rejected"] = True
+                    return ""
+            
+            if self.cache is None:
+                return self._run_model(audio, settings, info)
+            
+            key = self.cache.make_key(
+                audio, self.language, info["profile"], self.backend, self.model_size
+            )
+            text = self.cache.get(key)
+            if text is not None:
+                info["cached"] = True
+                return text
+            
+            text = self._run_model(audio, settings, info)
+            # Não guardar resultados truncados pelo prazo
+            if not info["timed_out"]:
+                self.cache.put(key, text)
+            return text
+        
+        # Formatos não suportados em memória: salvar em arquivo temporário para o ffmpeg
         if isinstance(audio_data, io.BytesIO):
             with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_file:
                 temp_file.write(audio_data.getvalue())
                 temp_path = temp_file.name
             
             try:
-                result = self.model.transcribe(
-                    temp_path,
-                    language=self.language,
-                    fp16=False  # Usar precisão FP32 para CPU
-                )
-                return result["text"].strip()
+                return self._run_model(temp_path, settings, info)
             finally:
                 # Limpar arquivo temporário
                 if os.path.exists(temp_path):
                     os.remove(temp_path)
         else:
             # Se for um caminho de arquivo
-            result = self.model.transcribe(
-                audio_data,
-                language=self.language,
-                fp16=False
+            return self._run_model(audio_data, settings, info)
+    
+    def _run_model(self, audio, settings, info):
+        """
+        Executa o modelo respeitando o prazo do perfil
+        
+        Com prazo definido, a decodificação roda em uma thread auxiliar; se o
+        prazo expirar, o texto retornado é vazio. O prazo apenas descarta o
+        resultado: nos backends com cancelamento (faster-whisper) a
+        decodificação para no próximo segmento, mas no openai-whisper ela
+        continua até o fim em segundo plano, segurando o lock de inferência
+        do modelo, e o pedido seguinte espera por ela em vez de decodificar
+        em paralelo.
+        
+        Args:
+            audio: Amostras float32 ou caminho para arquivo de áudio
+            settings (dict): Configurações do perfil de decodificação
+            info (dict): Informações da decodificação (marca timed_out)
+            
+        Returns:
+            str: Texto transcrito
+        """
+        options = dict(settings["decode_options"])
+        
+        # Cancelamento entre segmentos (pedido assíncrono ou prazo), nos backends que permitem
+        deadline_event = threading.Event()
+        if getattr(self.model, "supports_cancel", False):
+            options["cancel_event"] = _CancelSignal(
+                getattr(self._local, "cancel_event", None), deadline_event
             )
-            return result["text"].strip()
+        
+        def decode():
+            return self._model_transcribe(audio, **options)["text"].strip()
+        
+        if settings["deadline"] is None:
+            return decode()
+        
+        outcome = {}
+        
+        def worker():
+            try:
+                outcome["text"] = decode()
+            except Exception as e:
+                outcome["error"] = e
+        
+        thread = threading.Thread(target=worker, daemon=True)
+        thread.start()
+        thread.join(settings["deadline"])
+        
+        if thread.is_alive():
+            deadline_event.set()
+            print(f"Prazo de decodificação excedido ({settings['deadline']:.1f} s)")
+            info["timed_out"] = True
+            return ""
+        if "error" in outcome:
+            raise outcome["error"]
+        return outcome["text"]
+    
+    def _model_transcribe(self, audio, **options):
+        """Chama o modelo com o lock de inferência (o modelo é compartilhado entre reconhecedores)"""
+        model = self.model
+        with self._inference_lock:
+            if self.backend == "whisper":
+                # O pool de threads do PyTorch é do processo: reaplicar o orçamento a cada chamada
+                thread_budget.apply_torch("whisper", verbose=False)
+            return model.transcribe(audio, language=self.language, fp16=self.fp16, **options)
+    
+    async def transcribe_async(self, audio_data, profile=None, timeout=None):
+        """
+        Transcreve áudio sem bloquear o loop asyncio
+        
+        Os pedidos são executados em ordem por um executor dedicado de uma
+        thread. Se a tarefa for cancelada ou o prazo expirar, um pedido ainda
+        na fila é descartado sem usar o modelo; um pedido em execução é
+        interrompido entre segmentos quando o backend permite (faster-whisper)
+        e, nos demais, tem o resultado descartado.
+        
+        Args:
+            audio_data: Objeto BytesIO contendo áudio WAV, caminho para arquivo de
+                áudio ou array numpy a 16 kHz
+            profile (str): Perfil de decodificação (padrão: o do reconhecedor)
+            timeout (float): Prazo em segundos, contado desde o envio (None sem prazo)
+            
+        Returns:
+            str: Texto transcrito
+            
+        Raises:
+            asyncio.CancelledError: Se o pedido for cancelado (ex: por cancel_pending)
+            asyncio.TimeoutError: Se o prazo expirar
+        """
+        request = _AsyncRequest(timeout)
+        request.future = self._get_executor().submit(self._run_request, request, audio_data, profile)
+        self._pending.add(request)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(request.future), timeout)
+        except (asyncio.CancelledError, asyncio.TimeoutError, CancelledError):
+            request.cancel()
+            self.cancelled += 1
+            raise
+        finally:
+            self._pending.discard(request)
+    
+    def cancel_pending(self):
+        """
+        Cancela todos os pedidos assíncronos em andamento
+        
+        Útil para descartar falas obsoletas quando o usuário já falou de novo.
+        Um pedido em execução num backend sem cancelamento termina de
+        decodificar, mas a tarefa recebe CancelledError em vez do texto.
+        
+        Returns:
+            int: Número de pedidos cancelados
+        """
+        pending = list(self._pending)
+        for request in pending:
+            request.cancel()
+        return len(pending)
+    
+    def _get_executor(self):
+        """Cria o executor dedicado na primeira chamada assíncrona"""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="whisper")
+            return self._executor
+    
+    def _run_request(self, request, audio_data, profile):
+        """Executa um pedido assíncrono no executor dedicado"""
+        # Pedido cancelado ou vencido enquanto esperava na fila: não usar o modelo
+        if request.cancel_event.is_set() or request.expired:
+            raise CancelledError()
+        
+        self._local.cancel_event = request.cancel_event
+        try:
+            text = self.transcribe(audio_data, profile=profile)
+        except TranscriptionCancelled:
+            raise CancelledError()
+        finally:
+            self._local.cancel_event = None
+        
+        # Backends sem cancelamento terminam a decodificação: descartar o resultado
+        if request.cancel_event.is_set():
+            raise CancelledError()
+        return text
+    
+    def transcribe_many(self, items, num_workers=None, ordered=True, threads_per_worker=None):
+        """
+        Transcreve um lote de áudios em um pool de processos
+        
+        Cada processo carrega o modelo uma vez e usa uma fatia das CPUs
+        disponíveis, de modo que o total de threads não excede o número de
+        núcleos. Erros de um item são capturados no resultado e não
+        interrompem o lote.
+        
+        Args:
+            items (iterable): Caminhos de arquivo, bytes/BytesIO com WAV ou arrays numpy
+            num_workers (int): Número de processos (padrão: número de CPUs; 1 executa neste processo)
+            ordered (bool): Se True, entrega na ordem de entrada; senão, à medida que terminam
+            threads_per_worker (int): Threads de Whisper por processo (padrão: CPUs / processos;
+                prevalece sobre o orçamento de thread_budget)
+            
+        Yields:
+            dict: Resultado de cada item (index, text, error, seconds)
+        """
+        # BytesIO é convertido em bytes para ser enviado aos processos
+        items = [item.getvalue() if isinstance(item, io.BytesIO) else item for item in items]
+        cpus = os.cpu_count() or 1
+        num_workers = min(num_workers or cpus, max(1, len(items)))
+        
+        if num_workers <= 1:
+            for index, item in enumerate(items):
+                yield _transcribe_item(self, index, item)
+            return
+        
+        threads_per_worker = threads_per_worker or max(1, cpus // num_workers)
+        print(f"Transcrevendo {len(items)} itens com {num_workers} processos "
+              f"({threads_per_worker} threads cada)")
+        
+        # spawn evita herdar o estado de threads do PyTorch do processo pai
+        executor = ProcessPoolExecutor(
+            max_workers=num_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_batch_worker_init,
+            initargs=(self.model_size, self.language, self.offline,
+                      self.device, self.precision, self.profile, self.backend,
+                      threads_per_worker)
+        )
+        with executor:
+            futures = [
+                executor.submit(_batch_worker_transcribe, index, item)
+                for index, item in enumerate(items)
+            ]
+            for future in (futures if ordered else as_completed(futures)):
+                yield future.result()
+    
+    def _load_audio(self, audio_data):
+        """
+        Converte a entrada em amostras float32 a 16 kHz quando possível sem ffmpeg
+        
+        Args:
+            audio_data: Objeto BytesIO, caminho para arquivo ou array numpy
+            
+        Returns:
+            numpy.ndarray: Amostras float32 ou None se for preciso decodificar com ffmpeg
+        """
+        if isinstance(audio_data, np.ndarray):
+            return pcm_to_float32(audio_data)
+        
+        if isinstance(audio_data, io.BytesIO):
+            return decode_wav(audio_data)
+        
+        if isinstance(audio_data, str) and audio_data.lower().endswith(".wav"):
+            return decode_wav(audio_data)
+        
+        return None
+    
+    def transcribe_words(self, audio, initial_prompt=None):
+        """
+        Transcreve amostras e retorna as palavras com seus instantes
+        
+        Args:
+            audio (numpy.ndarray): Amostras float32 a 16 kHz
+            initial_prompt (str): Texto anterior usado como contexto pelo Whisper
+            
+        Returns:
+            list: Tuplas (início, fim, palavra) em segundos relativos ao início do áudio
+        """
+        if self.model is None:
+            # Simulação: distribuir as palavras uniformemente pela duração
+            words = self._mock_transcribe(audio).split()
+            duration = len(audio) / float(WHISPER_SAMPLE_RATE)
+            step = duration / max(1, len(words))
+            return [(i * step, (i + 1) * step, word) for i, word in enumerate(words)]
+        
+        result = self._model_transcribe(
+            audio,
+            word_timestamps=True,
+            condition_on_previous_text=False,
+            initial_prompt=initial_prompt
+        )
+        
+        words = []
+        for segment in result.get("segments", []):
+            if segment.get("words"):
+                words.extend(
+                    (w["start"], w["end"], w["word"].strip())
+                    for w in segment["words"] if w["word"].strip()
+                )
+            else:
+                # Sem instantes por palavra: distribuir pelo segmento
+                segment_words = segment["text"].split()
+                step = (segment["end"] - segment["start"]) / max(1, len(segment_words))
+                words.extend(
+                    (segment["start"] + i * step, segment["start"] + (i + 1) * step, word)
+                    for i, word in enumerate(segment_words)
+                )
+        return words
+    
+    def start_stream(self, **kwargs):
+        """
+        Inicia uma sessão de reconhecimento incremental
+        
+        Args:
+            **kwargs: Argumentos de StreamingSession
+            
+        Returns:
+            StreamingSession: Sessão que recebe áudio em partes
+        """
+        return StreamingSession(self, **kwargs)
+    
+    def stream_file(self, path, chunk_seconds=0.5, **kwargs):
+        """
+        Transcreve um arquivo WAV em modo incremental, simulando áudio ao vivo
+        
+        Args:
+            path (str): Caminho para o arquivo WAV (ou objeto BytesIO)
+            chunk_seconds (float): Duração de cada parte enviada à sessão
+            **kwargs: Argumentos de StreamingSession
+            
+        Yields:
+            dict: Hipóteses parciais e, por último, o resultado final (final=True)
+        """
+        audio = decode_wav(path)
+        if audio is None:
+            raise ValueError("O arquivo deve ser WAV PCM de 16 bits a 16 kHz")
+        
+        session = self.start_stream(**kwargs)
+        chunk = int(chunk_seconds * WHISPER_SAMPLE_RATE)
+        for start in range(0, len(audio), chunk):
+            partial = session.feed(audio[start:start + chunk])
+            if partial is not None:
+                yield partial
+        
+        yield session.finish()
     
     def _mock_transcribe(self, audio_data):
         """
         Simulação de transcrição quando Whisper não está disponível
         
         Args:
-            audio_data: Objeto BytesIO contendo áudio WAV ou caminho para arquivo
+            audio_data: Objeto BytesIO contendo áudio WAV, caminho para arquivo ou array numpy
             
         Returns:
             str: Texto simulado
         """
         # Verificar se há áudio real
-        if isinstance(audio_data, io.BytesIO):
+        if isinstance(audio_data, (io.BytesIO, np.ndarray)):
             # Extrair duração do áudio
-            audio_data.seek(0)
-            with wave.open(audio_data, 'rb') as wf:
-                frames = wf.getnframes()
-                rate = wf.getframerate()
-                duration = frames / float(rate)
+            if isinstance(audio_data, np.ndarray):
+                duration = len(audio_data) / float(WHISPER_SAMPLE_RATE)
+            else:
+                audio_data.seek(0)
+                with wave.open(audio_data, 'rb') as wf:
+                    frames = wf.getnframes()
+                    rate = wf.getframerate()
+                    duration = frames / float(rate)
             
             # Simular texto baseado na duração
             if duration < 1.0:
@@ -117,6 +1085,192 @@ class WhisperRecognizer:
             return "Olá, como posso ajudar você hoje? Estou ouvindo."
 
 
+def _normalize_word(word):
+    """Normaliza uma palavra para comparação (minúsculas, sem pontuação)"""
+    return re.sub(r"[^\w]", "", word.lower())
+
+
+class StreamingSession:
+    """
+    Sessão de reconhecimento incremental com política de concordância local
+    
+    O áudio recebido é acumulado em uma janela deslizante que é
+    retranscrita a cada `step_seconds` de áudio novo. Uma palavra só é
+    confirmada quando as últimas `agreement` hipóteses concordam no prefixo,
+    de modo que as palavras já confirmadas não mudam. Quando a janela excede
+    `window_seconds`, o áudio até a última palavra confirmada é descartado e
+    o texto confirmado passa a ser usado como contexto (initial_prompt).
+    """
+    
+    def __init__(self, recognizer, step_seconds=1.0, window_seconds=15.0, agreement=2,
+                 on_partial=None):
+        """
+        Inicializa a sessão
+        
+        Args:
+            recognizer (WhisperRecognizer): Reconhecedor usado nas decodificações
+            step_seconds (float): Áudio novo necessário para uma nova decodificação
+            window_seconds (float): Duração máxima da janela retranscrita
+            agreement (int): Número de hipóteses consecutivas que devem concordar
+            on_partial (callable): Função chamada com cada hipótese parcial
+        """
+        self.recognizer = recognizer
+        self.step_samples = int(step_seconds * WHISPER_SAMPLE_RATE)
+        self.window_samples = int(window_seconds * WHISPER_SAMPLE_RATE)
+        self.agreement = max(1, agreement)
+        self.on_partial = on_partial
+        
+        self._chunks = []
+        self._buffer = np.zeros(0, dtype=np.float32)
+        self._buffer_offset = 0.0  # Instante absoluto do início da janela
+        self._pending_samples = 0
+        self._committed = []  # (início, fim, palavra) em instantes absolutos
+        self._history = deque(maxlen=self.agreement - 1)
+        self._unstable = []
+        self.decodes = 0
+    
+    @property
+    def committed_text(self):
+        """Texto confirmado (estável) até o momento"""
+        return " ".join(word for _, _, word in self._committed)
+    
+    def feed(self, audio):
+        """
+        Adiciona áudio à sessão
+        
+        Args:
+            audio: Amostras int16/float32 a 16 kHz ou bytes PCM int16
+            
+        Returns:
+            dict: Hipótese parcial se houve nova decodificação, senão None
+        """
+        if isinstance(audio, (bytes, bytearray)):
+            audio = np.frombuffer(audio, dtype=np.int16)
+        audio = pcm_to_float32(audio)
+        
+        self._chunks.append(audio)
+        self._pending_samples += len(audio)
+        if self._pending_samples < self.step_samples:
+            return None
+        
+        self._pending_samples = 0
+        self._decode()
+        partial = self._result(final=False)
+        if self.on_partial:
+            self.on_partial(partial)
+        return partial
+    
+    def finish(self):
+        """
+        Decodifica o áudio restante e confirma todas as palavras
+        
+        Returns:
+            dict: Resultado final (final=True)
+        """
+        self._decode(commit_all=True)
+        self._unstable = []
+        return self._result(final=True)
+    
+    def _decode(self, commit_all=False):
+        """Retranscreve a janela atual e atualiza as palavras confirmadas"""
+        if self._chunks:
+            self._buffer = np.concatenate([self._buffer] + self._chunks)
+            self._chunks = []
+        
+        if len(self._buffer) == 0:
+            return []
+        
+        # Texto confirmado fora da janela serve de contexto para o Whisper
+        prompt = self.committed_text[-200:] or None
+        relative = self.recognizer.transcribe_words(self._buffer, initial_prompt=prompt)
+        self.decodes += 1
+        
+        words = [(start + self._buffer_offset, end + self._buffer_offset, word)
+                 for start, end, word in relative]
+        words = self._drop_committed(words)
+        
+        if commit_all:
+            self._commit(words)
+        else:
+            self._apply_agreement(words)
+            self._trim_window()
+        return words
+    
+    def _drop_committed(self, words):
+        """Remove da hipótese as palavras que já foram confirmadas"""
+        last_end = self._committed[-1][1] if self._committed else 0.0
+        words = [w for w in words if w[0] > last_end - 0.1]
+        
+        # Remover repetição das últimas palavras confirmadas no início da hipótese
+        if words and self._committed:
+            for n in range(min(len(self._committed), len(words), 5), 0, -1):
+                tail = [_normalize_word(w[2]) for w in self._committed[-n:]]
+                head = [_normalize_word(w[2]) for w in words[:n]]
+                if tail == head:
+                    return words[n:]
+        return words
+    
+    def _apply_agreement(self, words):
+        """Confirma o prefixo comum às últimas `agreement` hipóteses"""
+        hypotheses = [list(h) for h in self._history] + [list(words)]
+        
+        agreed = []
+        if len(hypotheses) == self.agreement:
+            for position, word in enumerate(words):
+                normalized = _normalize_word(word[2])
+                if all(position < len(h) and _normalize_word(h[position][2]) == normalized
+                       for h in hypotheses[:-1]):
+                    agreed.append(word)
+                else:
+                    break
+        
+        self._commit(agreed)
+        
+        # As hipóteses guardadas continuam a partir da última palavra confirmada
+        self._history.append(words)
+        self._history = deque(
+            (h[len(agreed):] for h in self._history),
+            maxlen=self.agreement - 1
+        )
+        self._unstable = words[len(agreed):]
+    
+    def _commit(self, words):
+        """Adiciona palavras à transcrição confirmada"""
+        self._committed.extend(words)
+    
+    def _trim_window(self):
+        """Descarta o áudio já confirmado quando a janela excede o limite"""
+        if len(self._buffer) <= self.window_samples:
+            return
+        
+        if self._committed:
+            cut_time = self._committed[-1][1] - self._buffer_offset
+            cut = int(cut_time * WHISPER_SAMPLE_RATE)
+        else:
+            cut = 0
+        
+        # Sem palavra confirmada na janela: manter apenas o final da janela
+        if cut <= 0:
+            cut = len(self._buffer) - self.window_samples
+            self._history.clear()
+        
+        cut = min(cut, len(self._buffer))
+        self._buffer = self._buffer[cut:]
+        self._buffer_offset += cut / float(WHISPER_SAMPLE_RATE)
+    
+    def _result(self, final):
+        """Monta o dicionário de resultado"""
+        committed = self.committed_text
+        unstable = " ".join(word for _, _, word in self._unstable)
+        return {
+            "committed": committed,
+            "unstable": unstable,
+            "text": " ".join(part for part in (committed, unstable) if part),
+            "final": final,
+            "decodes": self.decodes
+        }
+
+
 # Exemplo de uso
 if __name__ == "__main__":
     import sys
@@ -0,0 +1,232 @@
+"""
+Módulo de backends de reconhecimento de fala
+Implementa adaptadores intercambiáveis (openai-whisper, faster-whisper, Vosk) com a mesma interface
+
+Todos os backends carregam modelos que expõem a interface do openai-whisper:
+    
+    model.transcribe(audio, language=..., fp16=..., **opções)
+        -> {"text": str, "segments": [{"start", "end", "text", "words"}]}
+
+onde `audio` é um array float32 a 16 kHz ou um caminho para arquivo. Assim
+o WhisperRecognizer, as sessões incrementais e a transcrição em lote
+funcionam com qualquer backend registrado em STT_BACKENDS.
+"""
+
+import json
+import wave
+import numpy as np
+
+from modules.thread_budget import thread_budget
+
+# Verificar os backends disponíveis
+try:
+    import whisper
+    WHISPER_AVAILABLE = True
+except ImportError:
+    WHISPER_AVAILABLE = False
+
+try:
+    from faster_whisper import WhisperModel
+    FASTER_WHISPER_AVAILABLE = True
+except ImportError:
+    FASTER_WHISPER_AVAILABLE = False
+
+try:
+    import vosk
+    VOSK_AVAILABLE = True
+except ImportError:
+    VOSK_AVAILABLE = False
+
+
+class TranscriptionCancelled(Exception):
+    """Sinaliza que uma transcrição foi cancelada entre segmentos"""
+
+
+def _read_wav_float32(path):
+    """Lê um arquivo WAV mono de 16 bits como float32"""
+    with wave.open(path, 'rb') as wf:
+        if wf.getnchannels() != 1 or wf.getsampwidth() != 2:
+            raise ValueError("O arquivo WAV deve ser mono com amostras de 16 bits")
+        pcm = wf.readframes(wf.getnframes())
+    return np.frombuffer(pcm, dtype='<i2').astype(np.float32) / 32768.0
+
+
+class FasterWhisperModel:
+    """Adaptador do faster-whisper (CTranslate2) para a interface do openai-whisper"""
+    
+    # Aceita a opção cancel_event (threading.Event), verificada entre segmentos
+    supports_cancel = True
+    
+    # Opções do openai-whisper com nome diferente no faster-whisper
+    OPTION_NAMES = {
+        "logprob_threshold": "log_prob_threshold",
+        "sample_len": "max_new_tokens"
+    }
+    
+    # Opções aceitas pelo faster-whisper; as demais são ignoradas
+    SUPPORTED_OPTIONS = {
+        "temperature", "beam_size", "best_of", "condition_on_previous_text",
+        "compression_ratio_threshold", "log_prob_threshold", "no_speech_threshold",
+        "without_timestamps", "initial_prompt", "word_timestamps", "max_new_tokens"
+    }
+    
+    def __init__(self, model_size, device=None, precision="fp32"):
+        """
+        Carrega o modelo
+        
+        Args:
+            model_size (str): Tamanho ou caminho do modelo convertido
+            device (str): Dispositivo ('cpu', 'cuda' ou None para automático)
+            precision (str): 'fp16' (float16) ou 'fp32' (int8 na CPU, float32 na GPU)
+        """
+        device = device or "auto"
+        if precision == "fp16":
+            compute_type = "float16"
+        elif device == "cuda":
+            compute_type = "float32"
+        else:
+            # Pesos quantizados em int8: o modo mais rápido em CPU
+            compute_type = "int8"
+        
+        intra, inter = thread_budget.threads("whisper")
+        self.model = WhisperModel(
+            model_size,
+            device=device,
+            compute_type=compute_type,
+            cpu_threads=intra,
+            num_workers=inter
+        )
+    
+    def transcribe(self, audio, language=None, fp16=False, cancel_event=None, **options):
+        kwargs = {}
+        for name, value in options.items():
+            name = self.OPTION_NAMES.get(name, name)
+            if name in self.SUPPORTED_OPTIONS:
+                kwargs[name] = value
+        
+        # Sem feixe explícito, decodificação gulosa como no openai-whisper
+        kwargs.setdefault("beam_size", 1)
+        
+        segments, _ = self.model.transcribe(audio, language=language, **kwargs)
+        result_segments = []
+        for segment in segments:
+            # Os segmentos são decodificados sob demanda: parar aqui evita o restante
+            if cancel_event is not None and cancel_event.is_set():
+                raise TranscriptionCancelled()
+            words = [
+                {"start": w.start, "end": w.end, "word": w.word}
+                for w in (segment.words or [])
+            ]
+            result_segments.append({
+                "start": segment.start,
+                "end": segment.end,
+                "text": segment.text,
+                "words": words
+            })
+        
+        return {
+            "text": "".join(s["text"] for s in result_segments),
+            "segments": result_segments
+        }
+
+
+class VoskModel:
+    """
+    Adaptador do Vosk (Kaldi) para a interface do openai-whisper
+    
+    O tamanho do modelo é o caminho de um diretório de modelo Vosk ou o nome
+    de um modelo para download (ex: 'vosk-model-small-pt-0.3'). As opções de
+    decodificação do Whisper não se aplicam e são ignoradas.
+    """
+    
+    def __init__(self, model_size, device=None, precision="fp32"):
+        vosk.SetLogLevel(-1)
+        if model_size.startswith("vosk-model"):
+            self.model = vosk.Model(model_name=model_size)
+        else:
+            self.model = vosk.Model(model_size)
+    
+    def transcribe(self, audio, language=None, fp16=False, **options):
+        if isinstance(audio, str):
+            audio = _read_wav_float32(audio)
+        pcm = (np.clip(audio, -1.0, 1.0) * 32767).astype('<i2').tobytes()
+        
+        recognizer = vosk.KaldiRecognizer(self.model, 16000)
+        recognizer.SetWords(bool(options.get("word_timestamps")))
+        recognizer.AcceptWaveform(pcm)
+        result = json.loads(recognizer.FinalResult())
+        
+        text = result.get("text", "")
+        words = [
+            {"start": w["start"], "end": w["end"], "word": w["word"]}
+            for w in result.get("result", [])
+        ]
+        segments = []
+        if text:
+            segments.append({
+                "start": words[0]["start"] if words else 0.0,
+                "end": words[-1]["end"] if words else len(audio) / 16000.0,
+                "text": text,
+                "words": words
+            })
+        return {"text": text, "segments": segments}
+
+
+def _load_whisper(model_size, device, precision):
+    """Carrega um modelo com a biblioteca openai-whisper"""
+    thread_budget.apply_torch("whisper")
+    model = whisper.load_model(model_size, device=device)
+    if precision == "fp16":
+        model = model.half()
+    return model
+
+
+# Backends registrados: nome -> disponibilidade e função de carga
+# (tamanho, dispositivo, precisão) -> modelo com a interface do openai-whisper
+STT_BACKENDS = {
+    "whisper": {"available": WHISPER_AVAILABLE, "load": _load_whisper},
+    "faster-whisper": {"available": FASTER_WHISPER_AVAILABLE, "load": FasterWhisperModel},
+    "vosk": {"available": VOSK_AVAILABLE, "load": VoskModel}
+}
+
+
+def register_backend(name, load, available=True):
+    """
+    Registra um backend de reconhecimento de fala
+    
+    Args:
+        name (str): Nome do backend
+        load (callable): Função (tamanho, dispositivo, precisão) -> modelo
+        available (bool): Se a biblioteca do backend está instalada
+    """
+    STT_BACKENDS[name] = {"available": available, "load": load}
+
+
+def backend_available(name):
+    """Indica se um backend está registrado e com a biblioteca instalada"""
+    return name in STT_BACKENDS and STT_BACKENDS[name]["available"]
+
+
+def available_backends():
+    """Lista os backends com biblioteca instalada"""
+    return [name for name in STT_BACKENDS if backend_available(name)]
+
+
+def load_backend_model(backend, model_size, device=None, precision="fp32"):
+    """
+    Carrega um modelo de um backend
+    
+    Args:
+        backend (str): Nome do backend (ver STT_BACKENDS)
+        model_size (str): Tamanho do modelo (ou caminho, conforme o backend)
+        device (str): Dispositivo ('cpu', 'cuda' ou None para automático)
+        precision (str): Precisão dos pesos ('fp32' ou 'fp16')
+    
+    Returns:
+        Modelo com a interface do openai-whisper
+    """
+    if backend not in STT_BACKENDS:
+        raise ValueError(f"Backend de reconhecimento desconhecido: {backend}")
+    if not STT_BACKENDS[backend]["available"]:
+        raise ImportError(f"A biblioteca do backend '{backend}' não está instalada")
+    return STT_BACKENDS[backend]["load"](model_size, device, precision)
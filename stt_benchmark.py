@@ -0,0 +1,288 @@
+"""
+Módulo de benchmark dos backends de reconhecimento de fala
+Mede fator de tempo real e taxa de erro de palavras (WER) sobre arquivos WAV com transcrição de referência
+e escolhe o backend e tamanho de modelo que cabem no orçamento de latência
+
+Referências: um arquivo transcripts.json no diretório, no formato
+    {"arquivo.wav": "liga a luz da sala"}
+ou um arquivo de texto ao lado de cada WAV (arquivo.txt). Arquivos sem
+referência são ignorados.
+"""
+
+import os
+import re
+import json
+import time
+import argparse
+
+from modules.speech_recognition import WhisperRecognizer, WhisperModelRegistry, decode_wav
+from modules.stt_backends import backend_available
+
+
+def load_references(directory):
+    """
+    Carrega as transcrições de referência de um diretório
+    
+    Args:
+        directory (str): Diretório com os arquivos WAV
+    
+    Returns:
+        dict: Nome do arquivo -> texto de referência
+    """
+    references = {}
+    references_path = os.path.join(directory, "transcripts.json")
+    if os.path.exists(references_path):
+        with open(references_path, encoding="utf-8") as f:
+            references.update(json.load(f))
+    
+    for filename in sorted(os.listdir(directory)):
+        if not filename.lower().endswith(".wav") or filename in references:
+            continue
+        
+        sidecar = os.path.join(directory, os.path.splitext(filename)[0] + ".txt")
+        if os.path.exists(sidecar):
+            with open(sidecar, encoding="utf-8") as f:
+                references[filename] = f.read().strip()
+    
+    return references
+
+
+def normalize_words(text):
+    """Separa o texto em palavras minúsculas sem pontuação"""
+    return re.findall(r"\w+", text.lower())
+
+
+def word_errors(reference, hypothesis):
+    """
+    Calcula a distância de edição entre as palavras da referência e da hipótese
+    
+    Args:
+        reference (str): Texto de referência
+        hypothesis (str): Texto transcrito
+    
+    Returns:
+        tuple: (número de erros, número de palavras da referência)
+    """
+    ref = normalize_words(reference)
+    hyp = normalize_words(hypothesis)
+    
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hyp, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ref_word != hyp_word)
+            ))
+        previous = current
+    
+    return previous[-1], len(ref)
+
+
+def run_candidate(backend, model_size, directory, references, language="pt",
+                  profile="default", device=None):
+    """
+    Avalia um backend com um tamanho de modelo
+    
+    Args:
+        backend (str): Nome do backend (ver STT_BACKENDS)
+        model_size (str): Tamanho do modelo
+        directory (str): Diretório com os arquivos WAV
+        references (dict): Nome do arquivo -> texto de referência
+        language (str): Código do idioma
+        profile (str): Perfil de decodificação
+        device (str): Dispositivo ('cpu', 'cuda' ou None para automático)
+    
+    Returns:
+        dict: Métricas do candidato (com "error" se o modelo não carregar)
+    """
+    # Registro próprio: o modelo é descarregado ao fim da avaliação
+    registry = WhisperModelRegistry(idle_ttl=None)
+    recognizer = WhisperRecognizer(
+        model_size=model_size,
+        language=language,
+        device=device,
+        profile=profile,
+        registry=registry,
+        backend=backend
+    )
+    
+    # Carregar antes de medir: o tempo de carga não entra no fator de tempo real
+    load_start = time.perf_counter()
+    loaded = recognizer.preload()
+    load_seconds = time.perf_counter() - load_start
+    
+    # Sem modelo o reconhecedor usaria a simulação: não medir nem concorrer
+    if not loaded:
+        recognizer.close()
+        registry.clear()
+        print(f"Falha ao carregar {backend}:{model_size}, candidato descartado")
+        return {
+            "backend": backend,
+            "model_size": model_size,
+            "error": "falha ao carregar o modelo",
+            "load_seconds": load_seconds,
+            "files": 0
+        }
+    
+    audio_seconds = 0.0
+    wall = 0.0
+    errors = 0
+    words = 0
+    latencies = []
+    
+    for filename, reference in sorted(references.items()):
+        audio = decode_wav(os.path.join(directory, filename))
+        if audio is None:
+            print(f"Ignorando {filename}: formato não suportado (use WAV PCM de 16 bits a 16 kHz)")
+            continue
+        
+        start = time.perf_counter()
+        text = recognizer.transcribe(audio)
+        elapsed = time.perf_counter() - start
+        
+        file_errors, file_words = word_errors(reference, text)
+        errors += file_errors
+        words += file_words
+        audio_seconds += len(audio) / 16000.0
+        wall += elapsed
+        latencies.append(elapsed)
+    
+    recognizer.close()
+    registry.clear()
+    
+    return {
+        "backend": backend,
+        "model_size": model_size,
+        "load_seconds": load_seconds,
+        "files": len(latencies),
+        "audio_seconds": audio_seconds,
+        "real_time_factor": wall / audio_seconds if audio_seconds else 0.0,
+        "latency_max": max(latencies) if latencies else 0.0,
+        "wer": errors / words if words else 0.0
+    }
+
+
+def select_candidate(results, latency_budget, utterance_seconds=3.0):
+    """
+    Escolhe o candidato mais preciso cuja latência estimada cabe no orçamento
+    
+    A latência estimada é o fator de tempo real vezes a duração típica de uma
+    fala. Empates na WER são decididos pelo menor fator de tempo real.
+    
+    Args:
+        results (list): Métricas dos candidatos (ver run_candidate)
+        latency_budget (float): Latência máxima em segundos
+        utterance_seconds (float): Duração típica de uma fala em segundos
+    
+    Returns:
+        dict: Candidato escolhido ou None se nenhum couber no orçamento
+    """
+    fitting = [
+        r for r in results
+        if not r.get("error") and r["files"]
+        and r["real_time_factor"] * utterance_seconds <= latency_budget
+    ]
+    if not fitting:
+        return None
+    return min(fitting, key=lambda r: (r["wer"], r["real_time_factor"]))
+
+
+def run_benchmark(directory, candidates, latency_budget=1.0, utterance_seconds=3.0,
+                  language="pt", profile="default", device=None):
+    """
+    Executa o benchmark sobre um diretório de arquivos WAV com referências
+    
+    Args:
+        directory (str): Diretório com os arquivos WAV
+        candidates (list): Pares (backend, tamanho do modelo)
+        latency_budget (float): Latência máxima em segundos para uma fala típica
+        utterance_seconds (float): Duração típica de uma fala em segundos
+        language (str): Código do idioma
+        profile (str): Perfil de decodificação
+        device (str): Dispositivo ('cpu', 'cuda' ou None para automático)
+    
+    Returns:
+        dict: Configuração, métricas por candidato e candidato escolhido
+    """
+    references = load_references(directory)
+    results = []
+    skipped = []
+    for backend, model_size in candidates:
+        if not backend_available(backend):
+            print(f"Backend {backend} indisponível, ignorando {backend}:{model_size}")
+            skipped.append(f"{backend}:{model_size}")
+            continue
+        
+        print(f"Avaliando {backend}:{model_size}...")
+        results.append(run_candidate(
+            backend, model_size, directory, references, language, profile, device
+        ))
+    
+    return {
+        "config": {
+            "directory": os.path.abspath(directory),
+            "files": len(references),
+            "latency_budget": latency_budget,
+            "utterance_seconds": utterance_seconds,
+            "language": language,
+            "profile": profile,
+            "skipped": skipped
+        },
+        "candidates": results,
+        "selected": select_candidate(results, latency_budget, utterance_seconds)
+    }
+
+
+def print_report(report):
+    """Exibe as métricas dos candidatos e a escolha"""
+    for r in report["candidates"]:
+        if r.get("error"):
+            print(f"{r['backend']}:{r['model_size']}: {r['error']}")
+            continue
+        print(f"{r['backend']}:{r['model_size']}: WER {r['wer'] * 100:.1f}%, "
+              f"fator de tempo real {r['real_time_factor']:.3f}, "
+              f"pior latência {r['latency_max'] * 1000:.0f} ms")
+    
+    selected = report["selected"]
+    if selected:
+        print(f"Escolhido: {selected['backend']}:{selected['model_size']}")
+    else:
+        print("Nenhum candidato cabe no orçamento de latência")
+
+
+# Exemplo de uso
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark dos backends de reconhecimento de fala")
+    parser.add_argument("directory", help="Diretório com arquivos WAV e transcrições de referência")
+    parser.add_argument("--candidates", default="whisper:tiny,whisper:base,faster-whisper:tiny,faster-whisper:base",
+                        help="Lista backend:tamanho separada por vírgulas")
+    parser.add_argument("--latency-budget", type=float, default=1.0,
+                        help="Latência máxima em segundos para uma fala típica")
+    parser.add_argument("--utterance-seconds", type=float, default=3.0)
+    parser.add_argument("--language", default="pt")
+    parser.add_argument("--profile", default="default")
+    parser.add_argument("--device", default=None)
+    parser.add_argument("--output", help="Arquivo JSON de saída (padrão: saída padrão)")
+    args = parser.parse_args()
+    
+    candidates = [tuple(c.split(":", 1)) for c in args.candidates.split(",")]
+    report = run_benchmark(
+        args.directory,
+        candidates,
+        latency_budget=args.latency_budget,
+        utterance_seconds=args.utterance_seconds,
+        language=args.language,
+        profile=args.profile,
+        device=args.device
+    )
+    
+    print_report(report)
+    
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"Relatório salvo em: {args.output}")
+    else:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
@@ -0,0 +1,17 @@
+"""
+Configuração dos testes
+
+Os módulos do assistente são importados como `modules.<nome>`; o diretório
+do repositório é registrado como o pacote `modules`.
+"""
+
+import os
+import sys
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if "modules" not in sys.modules:
+    package = types.ModuleType("modules")
+    package.__path__ = [ROOT]
+    sys.modules["modules"] = package
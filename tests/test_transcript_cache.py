@@ -0,0 +1,116 @@
+"""
+Testes do cache de transcrições (TranscriptCache)
+"""
+
+import numpy as np
+import pytest
+
+from modules.speech_recognition import TranscriptCache, WhisperRecognizer, WhisperModelRegistry
+from modules.stt_backends import STT_BACKENDS
+
+
+def make_clip(seed, seconds=1.0):
+    """Clipe de ruído com fala simulada no meio e silêncio nas pontas"""
+    rng = np.random.default_rng(seed)
+    speech = (rng.standard_normal(int(seconds * 16000)) * 0.2).astype(np.float32)
+    silence = np.zeros(1600, dtype=np.float32)
+    return np.concatenate([silence, speech, silence])
+
+
+class CountingModel:
+    """Modelo falso que conta as decodificações"""
+    
+    def __init__(self, text):
+        self.text = text
+        self.calls = 0
+    
+    def transcribe(self, audio, language=None, fp16=False, **options):
+        self.calls += 1
+        return {"text": self.text, "segments": []}
+
+
+@pytest.fixture
+def fake_backend(monkeypatch):
+    """Backend "test" registrado apenas durante o teste"""
+    monkeypatch.setitem(STT_BACKENDS, "test", {"available": True, "load": None})
+
+
+def make_recognizer(cache, model, model_size="base"):
+    registry = WhisperModelRegistry(idle_ttl=None, loader=lambda *args: model)
+    return WhisperRecognizer(model_size=model_size, registry=registry, cache=cache, backend="test")
+
+
+def test_identical_buffers_hit():
+    cache = TranscriptCache()
+    clip = make_clip(0)
+    
+    key = cache.make_key(clip, "pt", "default")
+    assert cache.get(key) is None
+    cache.put(key, "liga a luz")
+    
+    assert cache.get(cache.make_key(clip.copy(), "pt", "default")) == "liga a luz"
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+
+def test_different_buffers_miss():
+    cache = TranscriptCache()
+    cache.put(cache.make_key(make_clip(0), "pt", "default"), "liga a luz")
+    
+    assert cache.get(cache.make_key(make_clip(1), "pt", "default")) is None
+    assert cache.get(cache.make_key(make_clip(0, seconds=2.0), "pt", "default")) is None
+
+
+def test_exact_only_rejects_small_changes():
+    cache = TranscriptCache(exact_only=True)
+    clip = make_clip(0)
+    cache.put(cache.make_key(clip, "pt", "default"), "liga a luz")
+    
+    changed = clip.copy()
+    changed[5000] += 1e-3
+    assert cache.get(cache.make_key(changed, "pt", "default")) is None
+
+
+def test_key_includes_model():
+    cache = TranscriptCache()
+    clip = make_clip(0)
+    
+    assert cache.make_key(clip, "pt", "default", "whisper", "base") != \
+        cache.make_key(clip, "pt", "default", "whisper", "small")
+    assert cache.make_key(clip, "pt", "default", "whisper", "base") != \
+        cache.make_key(clip, "pt", "default", "faster-whisper", "base")
+
+
+def test_lru_eviction():
+    cache = TranscriptCache(max_entries=2)
+    keys = [cache.make_key(make_clip(seed), "pt", "default") for seed in range(3)]
+    for seed, key in enumerate(keys):
+        cache.put(key, str(seed))
+    
+    assert cache.get(keys[0]) is None
+    assert cache.get(keys[2]) == "2"
+
+
+def test_recognizer_reuses_cached_transcript(fake_backend):
+    cache = TranscriptCache()
+    model = CountingModel("liga a luz")
+    recognizer = make_recognizer(cache, model)
+    clip = make_clip(0)
+    
+    assert recognizer.transcribe(clip) == "liga a luz"
+    assert recognizer.transcribe(clip.copy()) == "liga a luz"
+    assert recognizer.last_decode["cached"]
+    assert model.calls == 1
+    
+    recognizer.transcribe(make_clip(1))
+    assert model.calls == 2
+
+
+def test_recognizers_with_different_models_do_not_share_entries(fake_backend):
+    cache = TranscriptCache()
+    base = make_recognizer(cache, CountingModel("base"), model_size="base")
+    small = make_recognizer(cache, CountingModel("small"), model_size="small")
+    clip = make_clip(0)
+    
+    assert base.transcribe(clip) == "base"
+    assert small.transcribe(clip) == "small"
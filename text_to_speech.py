@@ -4,9 +4,22 @@ Implementa funcionalidades de conversão de texto para fala
 """
 
 import os
+import re
+import json
+import uuid
+import wave
+import shutil
+import hashlib
 import tempfile
+import numpy as np
 from datetime import datetime
 import io
+import queue
+import threading
+import time
+from collections import OrderedDict
+
+from modules.audio_sink import default_sink
 
 # Verificar se pyttsx3 está disponível para síntese offline
 try:
@@ -24,10 +37,543 @@ except ImportError:
     GTTS_AVAILABLE = False
     print("Aviso: gTTS não está disponível. Síntese online não funcionará.")
 
+# Verificar se pydub está disponível para decodificar MP3 (gTTS) em memória
+try:
+    from pydub import AudioSegment
+    PYDUB_AVAILABLE = True
+except ImportError:
+    PYDUB_AVAILABLE = False
+
+class PlaybackHandle:
+    """Controle de uma reprodução de áudio em andamento, que pode ser interrompida"""
+    
+    def __init__(self, filepath):
+        """
+        Inicializa o controle de reprodução
+        
+        Args:
+            filepath (str): Caminho para o arquivo de áudio (None para buffers PCM)
+        """
+        self.filepath = filepath
+        self.interrupted = False
+        self._stop_requested = threading.Event()
+        self._finished = threading.Event()
+        self._stop_backend = None
+    
+    @property
+    def done(self):
+        """Indica se a reprodução terminou (normalmente ou interrompida)"""
+        return self._finished.is_set()
+    
+    def stop(self, timeout=0.5):
+        """
+        Interrompe a reprodução
+        
+        Args:
+            timeout (float): Tempo máximo de espera pelo fim da reprodução em segundos
+            
+        Returns:
+            bool: True se a reprodução terminou dentro do tempo
+        """
+        if self.done:
+            return True
+        
+        self.interrupted = True
+        self._stop_requested.set()
+        
+        stop_backend = self._stop_backend
+        if stop_backend:
+            try:
+                stop_backend()
+            except Exception as e:
+                print(f"Erro ao interromper reprodução: {e}")
+        
+        return self._finished.wait(timeout)
+    
+    def wait(self, timeout=None):
+        """
+        Aguarda o fim da reprodução
+        
+        Args:
+            timeout (float): Tempo máximo de espera em segundos
+            
+        Returns:
+            bool: True se a reprodução terminou
+        """
+        return self._finished.wait(timeout)
+
+
+class PlaybackWorker:
+    """
+    Thread de reprodução permanente com a saída de áudio aberta
+    
+    Os buffers PCM enfileirados são escritos na mesma saída em sequência, sem
+    reabrir o dispositivo, de modo que falas consecutivas tocam sem intervalo.
+    A saída só é reaberta quando a taxa de amostragem muda.
+    """
+    
+    def __init__(self, sink, chunk_frames=1024):
+        """
+        Inicializa a thread de reprodução
+        
+        Args:
+            sink (AudioSink): Saída de áudio (ex: PyAudioSink, NullSink)
+            chunk_frames (int): Amostras por escrita; define a rapidez da interrupção
+        """
+        self.sink = sink
+        self.chunk_frames = chunk_frames
+        self._queue = queue.Queue()
+        self._current = None
+        self._sample_rate = None
+        
+        # Estatísticas
+        self.buffers = 0
+        self.interrupted = 0
+        self.seconds_played = 0.0
+        self.opens = 0
+        self.open_seconds = 0.0
+        self._start_latencies = []
+        
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+    
+    def play(self, samples, sample_rate):
+        """
+        Enfileira um buffer para reprodução após os já enfileirados
+        
+        Args:
+            samples: PCM int16 mono (bytes ou numpy.ndarray)
+            sample_rate (int): Taxa de amostragem em Hz
+        
+        Returns:
+            PlaybackHandle: Controle para aguardar ou interromper a reprodução
+        """
+        if isinstance(samples, (bytes, bytearray)):
+            samples = np.frombuffer(samples, dtype='<i2')
+        
+        handle = PlaybackHandle(None)
+        self._queue.put((np.asarray(samples, dtype=np.int16), sample_rate, handle, time.perf_counter()))
+        return handle
+    
+    def stop_all(self, timeout=0.5):
+        """
+        Descarta os buffers enfileirados e interrompe o atual
+        
+        Args:
+            timeout (float): Tempo máximo de espera pelo fim da reprodução em segundos
+        
+        Returns:
+            bool: True se a reprodução foi encerrada dentro do tempo
+        """
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                handle = item[2]
+                handle.interrupted = True
+                handle._finished.set()
+        
+        current = self._current
+        if current is not None and not current.done:
+            return current.stop(timeout)
+        return True
+    
+    def close(self, timeout=1.0):
+        """
+        Encerra a thread e libera a saída de áudio
+        
+        Args:
+            timeout (float): Tempo máximo de espera pelo fim da thread em segundos
+        """
+        self.stop_all()
+        self._queue.put(None)
+        self._thread.join(timeout)
+    
+    def _run(self):
+        """Escreve os buffers enfileirados na saída de áudio"""
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+                samples, sample_rate, handle, queued_at = item
+                if handle._stop_requested.is_set():
+                    handle._finished.set()
+                    continue
+                
+                self._current = handle
+                try:
+                    self._play_buffer(samples, sample_rate, handle, queued_at)
+                except Exception as e:
+                    print(f"Erro ao reproduzir áudio: {e}")
+                    self._close_sink()
+                finally:
+                    self._current = None
+                    handle._finished.set()
+        finally:
+            self._close_sink()
+            self.sink.terminate()
+    
+    def _play_buffer(self, samples, sample_rate, handle, queued_at):
+        """Escreve um buffer em blocos, verificando interrupções entre eles"""
+        if sample_rate != self._sample_rate:
+            self._close_sink()
+            start = time.perf_counter()
+            self.sink.open(sample_rate)
+            self.open_seconds += time.perf_counter() - start
+            self.opens += 1
+            self._sample_rate = sample_rate
+        
+        self._start_latencies.append(time.perf_counter() - queued_at)
+        if len(self._start_latencies) > 100:
+            self._start_latencies.pop(0)
+        
+        written = 0
+        for offset in range(0, len(samples), self.chunk_frames):
+            if handle._stop_requested.is_set():
+                break
+            chunk = samples[offset:offset + self.chunk_frames]
+            self.sink.write(chunk.tobytes())
+            written += len(chunk)
+        
+        # Sem próximo buffer, aguardar o áudio que ainda está no dispositivo
+        if self._queue.empty() and not handle._stop_requested.is_set():
+            handle._stop_requested.wait(self.sink.latency)
+        
+        self.buffers += 1
+        self.seconds_played += written / sample_rate
+        if handle._stop_requested.is_set():
+            self.interrupted += 1
+    
+    def _close_sink(self):
+        """Fecha a saída de áudio, se aberta"""
+        if self._sample_rate is not None:
+            try:
+                self.sink.close()
+            except Exception as e:
+                print(f"Erro ao fechar saída de áudio: {e}")
+            self._sample_rate = None
+    
+    def get_stats(self):
+        """
+        Obtém estatísticas da reprodução
+        
+        Returns:
+            dict: Buffers reproduzidos e interrompidos, segundos reproduzidos,
+                aberturas da saída, latência do dispositivo e tempo entre
+                enfileirar e começar a tocar
+        """
+        latencies = list(self._start_latencies)
+        return {
+            "sink": type(self.sink).__name__,
+            "buffers": self.buffers,
+            "interrupted": self.interrupted,
+            "seconds_played": self.seconds_played,
+            "pending": self._queue.qsize(),
+            "opens": self.opens,
+            "open_seconds_mean": self.open_seconds / self.opens if self.opens else None,
+            "output_latency": self.sink.latency if self._sample_rate is not None else None,
+            "start_latency_mean": sum(latencies) / len(latencies) if latencies else None,
+            "start_latency_max": max(latencies) if latencies else None
+        }
+
+
+class SynthesisCache:
+    """
+    Cache em disco de áudios sintetizados, endereçado pelo conteúdo
+    
+    A chave é o hash de (texto, engine, voz, velocidade, idioma). Os arquivos
+    são gravados de forma atômica (arquivo temporário + os.replace) e o
+    índice LRU, persistido em index.json, limita o espaço ocupado. A ordem de
+    uso só é gravada no disco junto com as inserções.
+    """
+    
+    INDEX_FILE = "index.json"
+    
+    def __init__(self, cache_dir, max_bytes=200 * 1024 * 1024):
+        """
+        Inicializa o cache
+        
+        Args:
+            cache_dir (str): Diretório dos arquivos em cache
+            max_bytes (int): Espaço máximo ocupado pelos arquivos
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        
+        # Contadores
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load_index()
+    
+    @staticmethod
+    def make_key(text, engine, voice, rate, language):
+        """Chave do cache: hash SHA-256 dos parâmetros da síntese"""
+        payload = json.dumps([text, engine, voice, rate, language], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def _load_index(self):
+        """
+        Carrega o índice, ignorando entradas cujo arquivo não existe mais
+        
+        Se o cache gravado exceder `max_bytes` (ex: limite reduzido desde a
+        última execução), os áudios menos usados são removidos.
+        """
+        index_path = os.path.join(self.cache_dir, self.INDEX_FILE)
+        try:
+            with open(index_path, encoding="utf-8") as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            entries = []
+        
+        for key, filename in entries:
+            path = os.path.join(self.cache_dir, filename)
+            if os.path.exists(path):
+                self._entries[key] = filename
+                self.total_bytes += os.path.getsize(path)
+        
+        if self.total_bytes > self.max_bytes:
+            with self._lock:
+                self._evict()
+                self._save_index()
+        
+        # Remover temporários de gravações interrompidas
+        for filename in os.listdir(self.cache_dir):
+            if filename.startswith(".tmp_"):
+                try:
+                    os.remove(os.path.join(self.cache_dir, filename))
+                except OSError:
+                    pass
+    
+    def _save_index(self):
+        """Grava o índice de forma atômica (chamado com o lock adquirido)"""
+        fd, temp_path = tempfile.mkstemp(prefix=".tmp_", dir=self.cache_dir)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(list(self._entries.items()), f)
+        os.replace(temp_path, os.path.join(self.cache_dir, self.INDEX_FILE))
+    
+    def get(self, key):
+        """
+        Busca um áudio
+        
+        Args:
+            key (str): Chave do áudio (ver make_key)
+            
+        Returns:
+            str: Caminho do arquivo em cache ou None se ausente
+        """
+        with self._lock:
+            filename = self._entries.get(key)
+            if filename is not None:
+                path = os.path.join(self.cache_dir, filename)
+                if os.path.exists(path):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return path
+                # Arquivo removido externamente
+                del self._entries[key]
+            self.misses += 1
+            return None
+    
+    def temp_path(self, extension):
+        """
+        Cria um arquivo temporário no diretório do cache para uma nova síntese
+        
+        Args:
+            extension (str): Extensão do arquivo (ex: '.mp3')
+            
+        Returns:
+            str: Caminho do arquivo temporário
+        """
+        fd, temp_path = tempfile.mkstemp(prefix=".tmp_", suffix=extension, dir=self.cache_dir)
+        os.close(fd)
+        return temp_path
+    
+    def put(self, key, temp_path):
+        """
+        Move uma síntese concluída para o cache
+        
+        Args:
+            key (str): Chave do áudio
+            temp_path (str): Arquivo criado por temp_path() com o áudio sintetizado
+            
+        Returns:
+            str: Caminho definitivo do arquivo em cache
+        """
+        filename = key + os.path.splitext(temp_path)[1]
+        path = os.path.join(self.cache_dir, filename)
+        size = os.path.getsize(temp_path)
+        
+        with self._lock:
+            # Substituir uma versão anterior (possivelmente com outra extensão)
+            old_filename = self._entries.pop(key, None)
+            if old_filename:
+                old_path = os.path.join(self.cache_dir, old_filename)
+                if os.path.exists(old_path):
+                    self.total_bytes -= os.path.getsize(old_path)
+                    if old_path != path:
+                        os.remove(old_path)
+            os.replace(temp_path, path)
+            self._entries[key] = filename
+            self._entries.move_to_end(key)
+            self.total_bytes += size
+            self._evict()
+            self._save_index()
+        return path
+    
+    def _evict(self):
+        """Remove os áudios menos usados até respeitar o limite (chamado com o lock adquirido)"""
+        while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+            _, filename = self._entries.popitem(last=False)
+            path = os.path.join(self.cache_dir, filename)
+            try:
+                self.total_bytes -= os.path.getsize(path)
+                os.remove(path)
+            except OSError:
+                pass
+            self.evictions += 1
+    
+    def has(self, key):
+        """Indica se uma chave está no cache, sem alterar contadores nem a ordem de uso"""
+        with self._lock:
+            filename = self._entries.get(key)
+            return filename is not None and os.path.exists(os.path.join(self.cache_dir, filename))
+    
+    def contains(self, path):
+        """Indica se um caminho pertence ao cache"""
+        return os.path.dirname(os.path.abspath(path)) == os.path.abspath(self.cache_dir)
+    
+    def get_stats(self):
+        """
+        Obtém estatísticas do cache
+        
+        Returns:
+            dict: Entradas, espaço ocupado, acertos, falhas e descartes
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions
+            }
+
+
+def decode_audio(data):
+    """
+    Decodifica áudio sintetizado para PCM int16 mono
+    
+    WAV é decodificado diretamente; outros formatos (ex: MP3 do gTTS)
+    precisam do pydub.
+    
+    Args:
+        data (bytes): Conteúdo do arquivo de áudio
+        
+    Returns:
+        tuple: (numpy.ndarray int16, taxa de amostragem) ou None se o formato
+            não puder ser decodificado
+    """
+    if data[:4] == b'RIFF':
+        with wave.open(io.BytesIO(data), 'rb') as wf:
+            if wf.getsampwidth() != 2:
+                return None
+            channels = wf.getnchannels()
+            rate = wf.getframerate()
+            samples = np.frombuffer(wf.readframes(wf.getnframes()), dtype='<i2')
+        if channels > 1:
+            samples = samples.reshape(-1, channels).mean(axis=1).astype(np.int16)
+        return samples.astype(np.int16, copy=False), rate
+    
+    if PYDUB_AVAILABLE:
+        segment = AudioSegment.from_file(io.BytesIO(data)).set_channels(1).set_sample_width(2)
+        return np.frombuffer(segment.raw_data, dtype='<i2').astype(np.int16), segment.frame_rate
+    
+    return None
+
+
+# Fim de frase: pontuação final seguida de espaço, ou quebra de linha
+_SENTENCE_END = re.compile(r'(?<=[.!?…])\s+|\n+')
+
+
+def _clean_chunk(chunk):
+    """Remove marcações de markdown (títulos, negrito, itens de lista) de um trecho"""
+    chunk = re.sub(r'^\s*(?:#+|[-*])\s+', '', chunk)
+    return chunk.replace('**', '').strip()
+
+
+def split_sentences(text):
+    """
+    Divide um texto em frases para síntese incremental
+    
+    Args:
+        text (str): Texto a dividir
+        
+    Returns:
+        list: Frases não vazias, sem marcações de markdown
+    """
+    chunks = (_clean_chunk(c) for c in _SENTENCE_END.split(text))
+    return [c for c in chunks if c]
+
+
+def iter_sentences(parts):
+    """
+    Agrupa partes de texto (ex: tokens gerados por um LLM) em frases completas
+    
+    Args:
+        parts (iterable): Partes de texto, na ordem
+        
+    Yields:
+        str: Cada frase assim que seu fim é recebido; o restante ao final
+    """
+    buffer = ""
+    for part in parts:
+        buffer += part
+        pieces = _SENTENCE_END.split(buffer)
+        # O último pedaço pode ser uma frase incompleta
+        buffer = pieces.pop()
+        for piece in pieces:
+            piece = _clean_chunk(piece)
+            if piece:
+                yield piece
+    
+    buffer = _clean_chunk(buffer)
+    if buffer:
+        yield buffer
+
+
+def collect_static_responses():
+    """
+    Reúne as respostas fixas dos processadores de comandos, sem repetições
+    
+    Returns:
+        list: Respostas pré-definidas e confirmações fixas de GeneralCommandProcessor
+            (sem as de hora e data), respostas genéricas e resumos da base de conhecimento
+    """
+    from modules.general_command_processor import GeneralCommandProcessor
+    from modules.command_processor import CommandProcessor
+    
+    texts = GeneralCommandProcessor().static_responses() + CommandProcessor().static_responses()
+    return list(dict.fromkeys(t for t in texts if t))
+
+
 class TextToSpeech:
     """Sintetizador de voz com suporte a modos online e offline"""
     
-    def __init__(self, use_offline=True, language="pt-br", voice=None, rate=180):
+    def __init__(self, use_offline=True, language="pt-br", voice=None, rate=180,
+                 cache_max_mb=200, warmup=False, output_max_mb=50, sink=None):
         """
         Inicializa o sintetizador de voz
         
@@ -36,11 +582,19 @@ class TextToSpeech:
             language (str): Código do idioma (ex: 'pt-br', 'en')
             voice (str): ID da voz a ser usada (apenas para pyttsx3)
             rate (int): Velocidade da fala (apenas para pyttsx3)
+            cache_max_mb (float): Espaço máximo do cache de sínteses em MB (0 ou None desativa)
+            warmup (bool): Se True, pré-sintetiza as respostas fixas em segundo plano
+            output_max_mb (float): Espaço máximo dos arquivos tts_* em audio_output;
+                os mais antigos são removidos (None desativa o limite)
+            sink (AudioSink): Saída de áudio mantida aberta pela thread de reprodução
+                (padrão: PyAudioSink se o PyAudio estiver instalado; False usa
+                pygame ou o player do sistema a cada reprodução)
         """
         self.use_offline = use_offline
         self.language = language
         self.voice = voice
         self.rate = rate
+        self.output_max_mb = output_max_mb
         
         # Verificar disponibilidade das bibliotecas
         if use_offline and not PYTTSX3_AVAILABLE:
@@ -66,6 +620,39 @@ class TextToSpeech:
             os.makedirs(self.output_dir, exist_ok=True)
             print(f"Usando diretório alternativo: {self.output_dir}")
         
+        # Cache de sínteses em disco
+        self.cache = None
+        if cache_max_mb:
+            try:
+                self.cache = SynthesisCache(
+                    os.path.join(self.output_dir, "cache"),
+                    max_bytes=int(cache_max_mb * 1024 * 1024)
+                )
+            except Exception as e:
+                print(f"Erro ao inicializar cache de síntese: {e}")
+        
+        # Reprodução atual e fila de falas assíncronas (canceláveis por interrupt)
+        self._current_playback = None
+        self._engine_speaking = False
+        self._generation = 0
+        self._speech_queue = queue.Queue()
+        self._speech_thread = None
+        
+        # Thread de reprodução permanente, criada na primeira reprodução
+        self._sink = default_sink() if sink is None else sink
+        self._player = None
+        self._player_lock = threading.Lock()
+        
+        # Sínteses ao vivo têm prioridade sobre a pré-síntese
+        self._synthesis_lock = threading.Lock()
+        self._live_lock = threading.Lock()
+        self._live_requests = 0
+        self._live_idle = threading.Event()
+        self._live_idle.set()
+        self._warmup_thread = None
+        self._warmup_stop = threading.Event()
+        self.warmup_stats = None
+        
         # Inicializar engine offline
         self.engine = None
         if self.use_offline and PYTTSX3_AVAILABLE:
@@ -89,14 +676,21 @@ class TextToSpeech:
                 print(f"Erro ao inicializar engine de síntese offline: {e}")
                 self.engine = None
                 self.use_offline = False
+        
+        if warmup:
+            self.start_warmup()
     
     def synthesize(self, text, filename=None):
         """
         Sintetiza texto em fala e salva em arquivo
         
+        Textos já sintetizados com a mesma engine, voz, velocidade e idioma são
+        devolvidos do cache sem acionar pyttsx3 nem gTTS.
+        
         Args:
             text (str): Texto a ser sintetizado
-            filename (str): Nome do arquivo de saída (opcional)
+            filename (str): Nome do arquivo de saída (opcional; sem ele, o
+                arquivo do cache é devolvido diretamente)
             
         Returns:
             str: Caminho para o arquivo de áudio gerado
@@ -104,31 +698,62 @@ class TextToSpeech:
         if not text:
             return None
         
-        # Gerar nome de arquivo se não fornecido
-        if not filename:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"tts_{timestamp}.mp3"
+        self._begin_live_request()
+        try:
+            return self._synthesize(text, filename)
+        finally:
+            self._end_live_request()
+    
+    def _begin_live_request(self):
+        """Registra uma síntese ao vivo (a pré-síntese espera até não haver nenhuma)"""
+        with self._live_lock:
+            self._live_requests += 1
+            self._live_idle.clear()
+    
+    def _end_live_request(self):
+        """Encerra o registro de uma síntese ao vivo"""
+        with self._live_lock:
+            self._live_requests -= 1
+            if self._live_requests == 0:
+                self._live_idle.set()
+    
+    def _synthesize(self, text, filename=None):
+        """Sintetiza texto em arquivo, consultando o cache (ver synthesize)"""
+        engine = self._engine_name()
+        key = None
+        if self.cache and engine:
+            key = SynthesisCache.make_key(text, engine, self.voice, self.rate, self.language)
+            cached = self.cache.get(key)
+            if cached:
+                return self._from_cache(cached, filename)
         
-        filepath = os.path.join(self.output_dir, filename)
+        # Gerar nome de arquivo único se não fornecido
+        if not filename and not key:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"tts_{timestamp}_{uuid.uuid4().hex[:8]}.mp3"
         
         try:
-            if self.use_offline and self.engine:
-                # Modo offline com pyttsx3
-                self.engine.save_to_file(text, filepath)
-                self.engine.runAndWait()
-            elif GTTS_AVAILABLE:
-                # Modo online com gTTS
-                tts = gTTS(text=text, lang=self.language[:2], slow=False)
-                tts.save(filepath)
-            else:
-                # Modo simulado - criar arquivo de áudio vazio
-                with open(filepath, 'wb') as f:
-                    f.write(b'')
-                print(f"Simulação de síntese: '{text}'")
+            if key:
+                # Sintetizar em temporário e mover para o cache de forma atômica
+                extension = os.path.splitext(filename)[1] if filename else ".mp3"
+                temp_path = self.cache.temp_path(extension)
+                try:
+                    self._synthesize_to(text, temp_path, engine)
+                    if os.path.getsize(temp_path) > 0:
+                        return self._from_cache(self.cache.put(key, temp_path), filename)
+                finally:
+                    if os.path.exists(temp_path):
+                        os.remove(temp_path)
+                print("Erro: síntese gerou arquivo vazio")
+                return None
+            
+            filepath = os.path.join(self.output_dir, filename)
+            self._synthesize_to(text, filepath, engine)
             
             # Verificar se o arquivo foi realmente criado
             if os.path.exists(filepath):
                 print(f"Arquivo de áudio criado com sucesso: {filepath}")
+                self._enforce_retention()
                 return filepath
             else:
                 print(f"Erro: Arquivo de áudio não foi criado: {filepath}")
@@ -136,14 +761,354 @@ class TextToSpeech:
             
         except Exception as e:
             print(f"Erro na síntese de voz: {e}")
-            # Tentar criar um arquivo vazio como fallback
+            return None
+    
+    def _engine_name(self):
+        """Engine usada na síntese ('pyttsx3', 'gtts' ou None no modo simulado)"""
+        if self.use_offline and self.engine:
+            return "pyttsx3"
+        if GTTS_AVAILABLE:
+            return "gtts"
+        return None
+    
+    def _synthesize_to(self, text, filepath, engine):
+        """
+        Sintetiza texto em um arquivo com a engine indicada
+        
+        Args:
+            text (str): Texto a ser sintetizado
+            filepath (str): Caminho do arquivo de saída
+            engine (str): 'pyttsx3', 'gtts' ou None (simulação)
+        """
+        if engine == "pyttsx3":
+            # Modo offline com pyttsx3 (a engine não pode ser usada por duas threads)
+            with self._synthesis_lock:
+                self.engine.save_to_file(text, filepath)
+                self.engine.runAndWait()
+        elif engine == "gtts":
+            # Modo online com gTTS
+            tts = gTTS(text=text, lang=self.language[:2], slow=False)
+            tts.save(filepath)
+        else:
+            # Modo simulado - criar arquivo de áudio vazio
+            with open(filepath, 'wb') as f:
+                f.write(b'')
+            print(f"Simulação de síntese: '{text}'")
+    
+    def _from_cache(self, cached, filename):
+        """Devolve o arquivo do cache, copiando-o se um nome de saída foi pedido"""
+        if not filename:
+            return cached
+        filepath = os.path.join(self.output_dir, filename)
+        shutil.copyfile(cached, filepath)
+        self._enforce_retention()
+        return filepath
+    
+    def _enforce_retention(self):
+        """Remove os arquivos tts_* mais antigos de audio_output além do limite de espaço"""
+        if not self.output_max_mb:
+            return
+        
+        files = []
+        for name in os.listdir(self.output_dir):
+            path = os.path.join(self.output_dir, name)
+            if name.startswith("tts_") and os.path.isfile(path):
+                stat = os.stat(path)
+                files.append((stat.st_mtime, stat.st_size, path))
+        
+        total = sum(size for _, size, _ in files)
+        limit = self.output_max_mb * 1024 * 1024
+        for _, size, path in sorted(files):
+            if total <= limit:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+    
+    def synthesize_to_buffer(self, text, as_array=False):
+        """
+        Sintetiza texto em memória, sem criar arquivos em audio_output
+        
+        O gTTS é lido diretamente da memória (decodificação de MP3 requer
+        pydub); o pyttsx3 só grava em arquivo, então usa um temporário do
+        sistema removido em seguida. Com o cache ativo, textos repetidos são
+        lidos do cache e novos textos são guardados nele.
+        
+        Args:
+            text (str): Texto a ser sintetizado
+            as_array (bool): Se True, retorna um array numpy int16; senão, bytes PCM
+            
+        Returns:
+            tuple: (PCM int16 mono, taxa de amostragem) ou None em caso de erro
+        """
+        if not text:
+            return None
+        
+        self._begin_live_request()
+        try:
+            decoded = self._synthesize_pcm(text)
+        finally:
+            self._end_live_request()
+        
+        if decoded is None:
+            return None
+        samples, sample_rate = decoded
+        return (samples if as_array else samples.tobytes()), sample_rate
+    
+    def _synthesize_pcm(self, text):
+        """Sintetiza texto e decodifica para PCM (ver synthesize_to_buffer)"""
+        engine = self._engine_name()
+        if engine is None:
+            print(f"Simulação de síntese: '{text}'")
+            return np.zeros(0, dtype=np.int16), 16000
+        
+        key = None
+        data = None
+        if self.cache:
+            key = SynthesisCache.make_key(text, engine, self.voice, self.rate, self.language)
+            cached = self.cache.get(key)
+            if cached:
+                with open(cached, 'rb') as f:
+                    data = f.read()
+        
+        try:
+            if data is None and engine == "gtts":
+                buffer = io.BytesIO()
+                gTTS(text=text, lang=self.language[:2], slow=False).write_to_fp(buffer)
+                data = buffer.getvalue()
+                extension = ".mp3"
+            elif data is None:
+                fd, temp_path = tempfile.mkstemp(prefix="tts_", suffix=".wav")
+                os.close(fd)
+                try:
+                    self._synthesize_to(text, temp_path, engine)
+                    with open(temp_path, 'rb') as f:
+                        data = f.read()
+                finally:
+                    os.remove(temp_path)
+                extension = ".wav"
+            else:
+                key = None
+        except Exception as e:
+            print(f"Erro na síntese de voz: {e}")
+            return None
+        
+        if not data:
+            print("Erro: síntese gerou áudio vazio")
+            return None
+        
+        if key:
+            temp_path = self.cache.temp_path(extension)
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+            self.cache.put(key, temp_path)
+        
+        try:
+            decoded = decode_audio(data)
+        except Exception as e:
+            print(f"Erro ao decodificar áudio: {e}")
+            return None
+        if decoded is None:
+            print("Erro: formato de áudio não suportado sem pydub")
+        return decoded
+    
+    def speak_stream(self, text, max_ahead=2):
+        """
+        Sintetiza e reproduz um texto frase a frase
+        
+        Uma thread sintetiza a frase N+1 enquanto a frase N é reproduzida, com
+        no máximo `max_ahead` frases prontas à frente da reprodução. O tempo
+        até o primeiro áudio depende apenas da primeira frase. Com a thread de
+        reprodução permanente, as frases são sintetizadas em memória e a
+        seguinte é enfileirada enquanto a atual toca, sem intervalo entre
+        elas. Bloqueia até o fim da reprodução ou até interrupt().
+        
+        Args:
+            text: Texto (str) ou iterável de partes de texto (ex: tokens de um LLM)
+            max_ahead (int): Número máximo de frases sintetizadas à espera de reprodução
+            
+        Returns:
+            dict: Frases reproduzidas, tempo até o primeiro áudio e tempo total em segundos
+        """
+        start = time.perf_counter()
+        generation = self._generation
+        use_buffers = self._can_play_buffers()
+        sentences = split_sentences(text) if isinstance(text, str) else iter_sentences(text)
+        ready = queue.Queue(maxsize=max(1, max_ahead))
+        done = object()
+        
+        def producer():
             try:
-                with open(filepath, 'wb') as f:
-                    f.write(b'')
-                print(f"Arquivo de áudio vazio criado como fallback: {filepath}")
-                return filepath
-            except:
-                return None
+                for sentence in sentences:
+                    if generation != self._generation:
+                        return
+                    audio = self.synthesize_to_buffer(sentence, as_array=True) if use_buffers else None
+                    if audio is None:
+                        # Sem buffer (ex: decodificação indisponível): usar arquivo
+                        audio = self.synthesize(sentence)
+                    if audio:
+                        self._put_while_current(ready, audio, generation)
+            except Exception as e:
+                print(f"Erro na síntese incremental: {e}")
+            finally:
+                self._put_while_current(ready, done, generation)
+        
+        thread = threading.Thread(target=producer)
+        thread.daemon = True
+        thread.start()
+        
+        stats = {"sentences": 0, "time_to_first_audio": None, "total_seconds": 0.0}
+        previous = None
+        while generation == self._generation:
+            try:
+                audio = ready.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if audio is done:
+                break
+            if generation != self._generation:
+                break
+            
+            if stats["time_to_first_audio"] is None:
+                stats["time_to_first_audio"] = time.perf_counter() - start
+            stats["sentences"] += 1
+            if isinstance(audio, tuple):
+                # Enfileirar antes do fim da frase anterior mantém a saída sem intervalo
+                handle = self.play_buffer(*audio)
+                if generation != self._generation:
+                    handle.stop(0)
+                    break
+                if previous is not None:
+                    previous.wait()
+                previous = handle
+            else:
+                if previous is not None:
+                    previous.wait()
+                    previous = None
+                if os.path.exists(audio):
+                    self.play(audio).wait()
+        
+        if previous is not None:
+            previous.wait()
+        
+        stats["total_seconds"] = time.perf_counter() - start
+        return stats
+    
+    def _put_while_current(self, q, item, generation):
+        """Enfileira um item, desistindo se houver interrupt() durante a espera"""
+        while generation == self._generation:
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def start_warmup(self, texts=None, delay=2.0):
+        """
+        Inicia a pré-síntese de respostas fixas em segundo plano
+        
+        A thread de pré-síntese tem prioridade reduzida e espera enquanto há
+        sínteses ao vivo em andamento. Textos já presentes no cache são pulados.
+        
+        Args:
+            texts (list): Textos a sintetizar (padrão: collect_static_responses())
+            delay (float): Espera inicial em segundos, para não competir com a inicialização
+            
+        Returns:
+            bool: True se a pré-síntese foi iniciada
+        """
+        if not self.cache or not self._engine_name():
+            print("Pré-síntese indisponível: cache desativado ou modo simulado")
+            return False
+        if self._warmup_thread and self._warmup_thread.is_alive():
+            return False
+        
+        self._warmup_stop.clear()
+        self._warmup_thread = threading.Thread(target=self._warmup_loop, args=(texts, delay))
+        self._warmup_thread.daemon = True
+        self._warmup_thread.start()
+        return True
+    
+    def stop_warmup(self, timeout=None):
+        """
+        Interrompe a pré-síntese após o texto em andamento
+        
+        Args:
+            timeout (float): Tempo máximo de espera pelo fim da thread em segundos
+        """
+        self._warmup_stop.set()
+        if self._warmup_thread:
+            self._warmup_thread.join(timeout)
+    
+    def _warmup_loop(self, texts, delay):
+        """Pré-sintetiza os textos, cedendo a vez às sínteses ao vivo"""
+        # Prioridade baixa para a thread (Linux: cada thread tem seu próprio nice)
+        try:
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 19)
+        except (AttributeError, OSError):
+            pass
+        
+        if self._warmup_stop.wait(delay):
+            return
+        
+        if texts is None:
+            texts = collect_static_responses()
+        
+        engine = self._engine_name()
+        stats = self.warmup_stats = {
+            "total": len(texts),
+            "done": 0,
+            "synthesized": 0,
+            "already_cached": 0,
+            "failed": 0,
+            "seconds": 0.0,
+            "yield_seconds": 0.0,
+            "running": True
+        }
+        print(f"Pré-síntese de {len(texts)} respostas iniciada")
+        
+        for text in texts:
+            # Ceder a vez enquanto houver sínteses ao vivo
+            wait_start = time.perf_counter()
+            while not self._live_idle.wait(0.1):
+                if self._warmup_stop.is_set():
+                    break
+            stats["yield_seconds"] += time.perf_counter() - wait_start
+            if self._warmup_stop.is_set():
+                break
+            
+            key = SynthesisCache.make_key(text, engine, self.voice, self.rate, self.language)
+            if self.cache.has(key):
+                stats["already_cached"] += 1
+            else:
+                start = time.perf_counter()
+                try:
+                    if self._synthesize(text):
+                        stats["synthesized"] += 1
+                    else:
+                        stats["failed"] += 1
+                except Exception as e:
+                    print(f"Erro na pré-síntese: {e}")
+                    stats["failed"] += 1
+                stats["seconds"] += time.perf_counter() - start
+            stats["done"] += 1
+        
+        stats["running"] = False
+        print(f"Pré-síntese concluída: {stats['synthesized']} sintetizadas, "
+              f"{stats['already_cached']} já em cache, {stats['seconds']:.1f}s")
+    
+    def get_warmup_progress(self):
+        """
+        Obtém o progresso da pré-síntese
+        
+        Returns:
+            dict: Total, concluídas, sintetizadas, já em cache, falhas, tempo
+                gasto e tempo cedido a sínteses ao vivo (None se não iniciada)
+        """
+        return dict(self.warmup_stats) if self.warmup_stats else None
     
     def speak(self, text, save_to_file=True, play_sound=False):
         """
@@ -160,30 +1125,211 @@ class TextToSpeech:
         if not text:
             return None
         
+        generation = self._generation
+        
+        if play_sound and not save_to_file and self._can_play_buffers():
+            # Reproduzir direto da memória na saída de áudio já aberta
+            decoded = self.synthesize_to_buffer(text, as_array=True)
+            if decoded is not None:
+                if generation == self._generation:
+                    self.play_buffer(*decoded).wait()
+                return None
+            # Sem áudio decodificado: seguir pelo caminho com arquivo
+        
         if save_to_file or not self.use_offline:
             # Sintetizar e salvar em arquivo
             filepath = self.synthesize(text)
             
-            # Reproduzir som se solicitado
-            if play_sound and filepath and os.path.exists(filepath):
+            # Reproduzir som se solicitado e se não houve interrupção durante a síntese
+            if play_sound and filepath and os.path.exists(filepath) and generation == self._generation:
                 self._play_audio(filepath)
             
             return filepath
         elif self.use_offline and self.engine:
-            # Apenas reproduzir sem salvar
+            # Apenas reproduzir sem salvar; a engine é compartilhada com a pré-síntese
+            self._begin_live_request()
             try:
-                self.engine.say(text)
-                self.engine.runAndWait()
+                with self._synthesis_lock:
+                    self._engine_speaking = True
+                    self.engine.say(text)
+                    self.engine.runAndWait()
             except Exception as e:
                 print(f"Erro ao reproduzir fala: {e}")
+            finally:
+                self._engine_speaking = False
+                self._end_live_request()
         else:
             print(f"Simulação de fala: '{text}'")
         
         return None
     
+    def speak_async(self, text):
+        """
+        Enfileira um texto para síntese e reprodução em segundo plano
+        
+        Falas enfileiradas são descartadas por interrupt().
+        
+        Args:
+            text (str): Texto a ser sintetizado
+        """
+        if not text:
+            return
+        
+        self._speech_queue.put((text, self._generation))
+        
+        if self._speech_thread is None or not self._speech_thread.is_alive():
+            self._speech_thread = threading.Thread(target=self._speech_loop)
+            self._speech_thread.daemon = True
+            self._speech_thread.start()
+    
+    def _speech_loop(self):
+        """Processa a fila de falas assíncronas"""
+        while True:
+            text, generation = self._speech_queue.get()
+            
+            # Ignorar falas enfileiradas antes de uma interrupção
+            if generation != self._generation:
+                continue
+            
+            try:
+                self.speak(text, save_to_file=True, play_sound=True)
+            except Exception as e:
+                print(f"Erro na fala assíncrona: {e}")
+    
+    def interrupt(self, timeout=0.5):
+        """
+        Interrompe a fala atual e descarta as falas pendentes (barge-in)
+        
+        Args:
+            timeout (float): Tempo máximo de espera pelo fim da reprodução em segundos
+            
+        Returns:
+            bool: True se a reprodução dos buffers e a de arquivo foram
+                encerradas dentro do tempo
+        """
+        self._generation += 1
+        
+        # Descartar falas enfileiradas
+        while True:
+            try:
+                self._speech_queue.get_nowait()
+            except queue.Empty:
+                break
+        
+        if self._engine_speaking and self.engine:
+            try:
+                self.engine.stop()
+            except Exception as e:
+                print(f"Erro ao interromper engine de síntese: {e}")
+        
+        # A reprodução de arquivo (fallback) pode estar ativa junto com o worker:
+        # sinalizar a parada dela primeiro e esperar as duas dentro do mesmo prazo
+        deadline = time.monotonic() + timeout
+        playback = self._current_playback
+        if playback is not None and not playback.done:
+            playback.stop(0)
+        
+        stopped = True
+        if self._player is not None:
+            stopped = self._player.stop_all(timeout)
+        
+        if playback is not None:
+            stopped = playback.wait(max(0.0, deadline - time.monotonic())) and stopped
+        return stopped
+    
+    def play(self, filepath):
+        """
+        Inicia a reprodução de um arquivo de áudio em segundo plano
+        
+        Args:
+            filepath (str): Caminho para o arquivo de áudio
+            
+        Returns:
+            PlaybackHandle: Controle para aguardar ou interromper a reprodução
+        """
+        player = self._get_player()
+        if player is not None:
+            try:
+                with open(filepath, 'rb') as f:
+                    decoded = decode_audio(f.read())
+            except Exception as e:
+                # Ex: pydub sem ffmpeg; usar o player por arquivo
+                print(f"Erro ao decodificar áudio: {e}")
+                decoded = None
+            if decoded is not None:
+                return self.play_buffer(*decoded)
+        
+        handle = PlaybackHandle(filepath)
+        self._current_playback = handle
+        
+        thread = threading.Thread(target=self._playback_worker, args=(handle,))
+        thread.daemon = True
+        thread.start()
+        return handle
+    
+    def play_buffer(self, samples, sample_rate):
+        """
+        Enfileira PCM na thread de reprodução permanente
+        
+        Buffers enfileirados em sequência tocam sem intervalo entre eles.
+        
+        Args:
+            samples: PCM int16 mono (bytes ou numpy.ndarray)
+            sample_rate (int): Taxa de amostragem em Hz
+            
+        Returns:
+            PlaybackHandle: Controle para aguardar ou interromper a reprodução
+                ou None se não houver saída de áudio
+        """
+        player = self._get_player()
+        if player is None:
+            print("Nenhuma saída de áudio disponível para reproduzir PCM")
+            return None
+        
+        handle = player.play(samples, sample_rate)
+        self._current_playback = handle
+        return handle
+    
+    def _can_play_buffers(self):
+        """
+        Indica se a fala pode ir da memória para a thread de reprodução
+        
+        Requer uma saída de áudio e, com gTTS (MP3), o pydub para decodificar.
+        """
+        if self._get_player() is None:
+            return False
+        return self._engine_name() != "gtts" or PYDUB_AVAILABLE
+    
+    def _get_player(self):
+        """Obtém a thread de reprodução, criando-a no primeiro uso (None sem saída de áudio)"""
+        if not self._sink:
+            return None
+        with self._player_lock:
+            if self._player is None:
+                self._player = PlaybackWorker(self._sink)
+            return self._player
+    
+    def get_playback_stats(self):
+        """
+        Obtém estatísticas da thread de reprodução
+        
+        Returns:
+            dict: Ver PlaybackWorker.get_stats (None se não iniciada)
+        """
+        return self._player.get_stats() if self._player else None
+    
+    def close(self):
+        """Interrompe a fala, a pré-síntese e libera a saída de áudio"""
+        self.interrupt()
+        self.stop_warmup(timeout=1.0)
+        with self._player_lock:
+            if self._player is not None:
+                self._player.close()
+                self._player = None
+    
     def _play_audio(self, filepath):
         """
-        Reproduz arquivo de áudio
+        Reproduz arquivo de áudio, bloqueando até o fim ou até interrupt()
         
         Args:
             filepath (str): Caminho para o arquivo de áudio
@@ -191,49 +1337,106 @@ class TextToSpeech:
         if not os.path.exists(filepath):
             print(f"Erro: Arquivo de áudio não encontrado: {filepath}")
             return
-            
+        
+        self.play(filepath).wait()
+    
+    def _playback_worker(self, handle):
+        """
+        Reproduz o áudio de um controle de reprodução
+        
+        Os métodos interrompíveis (pygame e player do sistema) são tentados
+        primeiro; playsound não pode ser interrompido e fica como último recurso.
+        
+        Args:
+            handle (PlaybackHandle): Controle da reprodução
+        """
         try:
-            # Tentar reproduzir com diferentes métodos
-            try:
-                # Método 1: playsound
-                from playsound import playsound
-                playsound(filepath)
+            if self._play_pygame(handle):
+                return
+            if self._play_system(handle):
                 return
-            except ImportError:
-                pass
             
             try:
-                # Método 2: pygame
-                import pygame
-                pygame.mixer.init()
-                pygame.mixer.music.load(filepath)
-                pygame.mixer.music.play()
-                while pygame.mixer.music.get_busy():
-                    pygame.time.Clock().tick(10)
-                return
+                from playsound import playsound
+                playsound(handle.filepath)
             except ImportError:
-                pass
-            
-            # Método 3: sistema operacional
-            import platform
-            import subprocess
-            
-            system = platform.system()
-            if system == 'Darwin':  # macOS
-                subprocess.call(['afplay', filepath])
-            elif system == 'Linux':
-                subprocess.call(['aplay', filepath])
-            elif system == 'Windows':
-                try:
-                    import winsound
-                    winsound.PlaySound(filepath, winsound.SND_FILENAME)
-                except Exception as e:
-                    print(f"Erro ao reproduzir com winsound: {e}")
-                    # Alternativa para Windows
-                    os.startfile(filepath)
-            
+                print("Nenhum método de reprodução de áudio disponível")
         except Exception as e:
             print(f"Erro ao reproduzir áudio: {e}")
+        finally:
+            handle._finished.set()
+    
+    def _play_pygame(self, handle):
+        """
+        Reproduz com pygame
+        
+        Returns:
+            bool: True se o pygame estava disponível
+        """
+        try:
+            import pygame
+        except ImportError:
+            return False
+        
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
+        
+        pygame.mixer.music.load(handle.filepath)
+        handle._stop_backend = pygame.mixer.music.stop
+        pygame.mixer.music.play()
+        while pygame.mixer.music.get_busy() and not handle._stop_requested.is_set():
+            handle._stop_requested.wait(0.02)
+        
+        if handle._stop_requested.is_set():
+            pygame.mixer.music.stop()
+        return True
+    
+    def _play_system(self, handle):
+        """
+        Reproduz com o player do sistema operacional
+        
+        Returns:
+            bool: True se um player do sistema foi usado
+        """
+        import platform
+        import subprocess
+        
+        system = platform.system()
+        if system == 'Windows':
+            try:
+                import winsound
+                # PlaySound(None, 0) encerra o som em reprodução a partir de outra thread
+                handle._stop_backend = lambda: winsound.PlaySound(None, 0)
+                winsound.PlaySound(handle.filepath, winsound.SND_FILENAME)
+            except Exception as e:
+                print(f"Erro ao reproduzir com winsound: {e}")
+                # Alternativa para Windows
+                os.startfile(handle.filepath)
+            return True
+        
+        if system == 'Darwin':  # macOS
+            command = ['afplay', handle.filepath]
+        elif system == 'Linux':
+            command = ['aplay', handle.filepath]
+        else:
+            return False
+        
+        try:
+            process = subprocess.Popen(command)
+        except FileNotFoundError:
+            return False
+        
+        handle._stop_backend = process.terminate
+        while process.poll() is None:
+            if handle._stop_requested.wait(0.02):
+                process.terminate()
+                break
+        
+        try:
+            process.wait(timeout=1.0)
+        except subprocess.TimeoutExpired:
+            process.kill()
+        return True
     
     def get_available_voices(self):
         """
@@ -0,0 +1,178 @@
+"""
+Módulo de orçamento de threads de CPU
+Distribui os núcleos entre Whisper (PyTorch), o modelo local do LLMManager (transformers) e o openWakeWord
+"""
+
+import os
+
+# Componentes com orçamento próprio
+COMPONENTS = ("whisper", "llm", "wake_word")
+
+# Variáveis de ambiente lidas pelas bibliotecas numéricas ao serem importadas; só
+# têm efeito em um processo novo (ver thread_budget_benchmark), pois os módulos
+# do assistente importam NumPy antes de qualquer configuração do orçamento
+THREAD_ENV_VARS = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS")
+
+
+class ThreadBudget:
+    """
+    Orçamento de threads por componente
+    
+    Cada componente recebe threads intra-op (paralelismo dentro de um
+    operador) e inter-op (operadores em paralelo). Whisper e o LLM local
+    usam o mesmo pool de threads do PyTorch no processo, por isso o
+    orçamento é reaplicado antes de cada inferência (apply_torch); se os
+    dois executarem ao mesmo tempo no mesmo processo, ambos usam o valor do
+    último que começou. O openWakeWord usa o pool do ONNX Runtime ou
+    TFLite, configurado por modelo.
+    """
+    
+    def __init__(self, cores=None, allocation=None):
+        """
+        Inicializa o orçamento
+        
+        Args:
+            cores (int): Núcleos disponíveis (padrão: número de CPUs)
+            allocation (dict): Componente -> {"intra": int, "inter": int}
+                (padrão: divisão calculada por default_allocation)
+        """
+        self.cores = cores or os.cpu_count() or 1
+        self.allocation = self.default_allocation(self.cores)
+        if allocation:
+            for component, threads in allocation.items():
+                self.set(component, **threads)
+        
+        self._interop_applied = False
+        self._torch_threads = None
+    
+    @staticmethod
+    def default_allocation(cores):
+        """
+        Divisão padrão dos núcleos
+        
+        Um núcleo fica com a palavra de ativação, que roda continuamente; o
+        restante é dividido entre Whisper (metade arredondada para cima) e
+        o LLM local.
+        
+        Args:
+            cores (int): Núcleos disponíveis
+        
+        Returns:
+            dict: Componente -> {"intra": int, "inter": int}
+        """
+        remaining = max(1, cores - 1)
+        whisper = (remaining + 1) // 2
+        return {
+            "whisper": {"intra": whisper, "inter": 1},
+            "llm": {"intra": max(1, remaining - whisper), "inter": 1},
+            "wake_word": {"intra": 1, "inter": 1}
+        }
+    
+    def set(self, component, intra=None, inter=None):
+        """
+        Altera as threads de um componente
+        
+        Args:
+            component (str): Componente (ver COMPONENTS)
+            intra (int): Threads intra-op
+            inter (int): Threads inter-op
+        """
+        if component not in COMPONENTS:
+            raise ValueError(f"Componente desconhecido: {component}")
+        
+        threads = self.allocation[component]
+        if intra is not None:
+            threads["intra"] = max(1, int(intra))
+        if inter is not None:
+            threads["inter"] = max(1, int(inter))
+    
+    def threads(self, component):
+        """
+        Threads de um componente
+        
+        Args:
+            component (str): Componente (ver COMPONENTS)
+        
+        Returns:
+            tuple: (intra-op, inter-op)
+        """
+        threads = self.allocation[component]
+        return threads["intra"], threads["inter"]
+    
+    def total_threads(self):
+        """Soma das threads intra-op de todos os componentes"""
+        return sum(threads["intra"] for threads in self.allocation.values())
+    
+    def apply_torch(self, component, verbose=True):
+        """
+        Aplica o orçamento de um componente ao pool de threads do PyTorch
+        
+        Deve ser chamado antes de cada inferência, pois o pool é do processo
+        e é compartilhado por Whisper e LLM.
+        
+        Args:
+            component (str): 'whisper' ou 'llm'
+            verbose (bool): Se True, informa a configuração aplicada
+        
+        Returns:
+            bool: True se o PyTorch está disponível e foi configurado
+        """
+        try:
+            import torch
+        except ImportError:
+            return False
+        
+        intra, inter = self.threads(component)
+        if intra != self._torch_threads:
+            torch.set_num_threads(intra)
+            self._torch_threads = intra
+        
+        # O pool inter-op só pode ser definido uma vez, antes do primeiro uso
+        if not self._interop_applied:
+            try:
+                torch.set_num_interop_threads(inter)
+            except RuntimeError:
+                pass
+            self._interop_applied = True
+        
+        if verbose:
+            print(f"Threads do PyTorch para {component}: {intra} intra-op, {inter} inter-op")
+        return True
+    
+    def get_stats(self):
+        """
+        Obtém a configuração atual
+        
+        Returns:
+            dict: Núcleos, alocação por componente e total de threads
+        """
+        return {
+            "cores": self.cores,
+            "allocation": {c: dict(t) for c, t in self.allocation.items()},
+            "total_threads": self.total_threads()
+        }
+
+
+# Orçamento compartilhado pelos módulos do assistente
+thread_budget = ThreadBudget()
+
+
+def configure(cores=None, allocation=None):
+    """
+    Substitui o orçamento compartilhado
+    
+    Deve ser chamado na inicialização, antes de carregar os modelos. O objeto
+    é alterado no lugar, de modo que as referências importadas continuam válidas.
+    
+    Args:
+        cores (int): Núcleos disponíveis (padrão: número de CPUs)
+        allocation (dict): Componente -> {"intra": int, "inter": int}
+    
+    Returns:
+        ThreadBudget: Orçamento configurado
+    """
+    thread_budget.cores = cores or os.cpu_count() or 1
+    thread_budget.allocation = ThreadBudget.default_allocation(thread_budget.cores)
+    for component, threads in (allocation or {}).items():
+        thread_budget.set(component, **threads)
+    return thread_budget
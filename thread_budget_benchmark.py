@@ -0,0 +1,336 @@
+"""
+Módulo de benchmark do orçamento de threads
+Executa Whisper, o LLM local e a palavra de ativação ao mesmo tempo com diferentes divisões dos núcleos
+e informa a divisão com menor latência de resposta que mantém a palavra de ativação em tempo real
+
+Cada componente roda em um processo próprio, com seu próprio pool de
+threads do PyTorch: no mesmo processo, Whisper e LLM executando ao mesmo
+tempo compartilhariam o pool e a divisão entre eles não teria efeito.
+"""
+
+import os
+import json
+import time
+import argparse
+import multiprocessing
+from queue import Empty
+import numpy as np
+
+from modules.thread_budget import COMPONENTS, THREAD_ENV_VARS, ThreadBudget, configure
+
+
+def candidate_allocations(cores):
+    """
+    Gera as divisões de núcleos a avaliar
+    
+    Inclui a divisão padrão, todas as divisões de `cores` threads intra-op
+    entre palavra de ativação (1 ou 2), Whisper e LLM, e a configuração sem
+    orçamento (todos os componentes com todos os núcleos) como referência.
+    
+    Args:
+        cores (int): Núcleos disponíveis
+    
+    Returns:
+        list: Alocações no formato de ThreadBudget
+    """
+    allocations = [
+        {component: {"intra": cores, "inter": 1} for component in ("whisper", "llm", "wake_word")},
+        ThreadBudget.default_allocation(cores)
+    ]
+    
+    for wake in (1, 2):
+        remaining = cores - wake
+        for whisper in range(1, remaining):
+            allocation = {
+                "whisper": {"intra": whisper, "inter": 1},
+                "llm": {"intra": remaining - whisper, "inter": 1},
+                "wake_word": {"intra": wake, "inter": 1}
+            }
+            if allocation not in allocations:
+                allocations.append(allocation)
+    
+    return allocations
+
+
+def _percentiles(values):
+    """Média, p50 e p95 de uma lista de latências"""
+    if not values:
+        return {"count": 0, "mean": None, "p50": None, "p95": None}
+    return {
+        "count": len(values),
+        "mean": float(np.mean(values)),
+        "p50": float(np.percentile(values, 50)),
+        "p95": float(np.percentile(values, 95))
+    }
+
+
+def _run_component(component, allocation, config, ready, start, results):
+    """
+    Executa a carga de um componente com uma alocação (em processo próprio)
+    
+    Cada componente roda em seu processo, com seu próprio pool de threads do
+    PyTorch, de modo que a divisão entre Whisper e LLM avaliada é de fato a
+    usada. O processo carrega o modelo, avisa em `ready`, espera `start` e
+    mede durante `config["duration"]` segundos.
+    
+    Args:
+        component (str): Componente avaliado (ver COMPONENTS)
+        allocation (dict): Alocação avaliada
+        config (dict): Parâmetros da carga (ver run_sweep)
+        ready (multiprocessing.Queue): Fila para avisar que o modelo foi carregado
+        start (multiprocessing.Event): Sinal de início da carga simultânea
+        results (multiprocessing.Queue): Fila para devolver as latências
+    """
+    # Configurar o ambiente antes de importar os modelos
+    budget = configure(cores=config["cores"], allocation=allocation)
+    for name in THREAD_ENV_VARS:
+        os.environ[name] = str(budget.threads(component)[0])
+    
+    from modules.speech_recognition import WhisperRecognizer, WhisperModelRegistry, decode_wav
+    from modules.llm_manager import LLMManager
+    from modules.wake_word import WakeWordDetector
+    
+    if component == "whisper":
+        recognizer = WhisperRecognizer(
+            model_size=config["whisper_model"],
+            registry=WhisperModelRegistry(idle_ttl=None),
+            preload=True
+        )
+        if config["wav"]:
+            # Taxas diferentes de 16 kHz são decodificadas pelo ffmpeg a cada turno
+            audio = decode_wav(config["wav"])
+            if audio is None:
+                audio = config["wav"]
+        else:
+            audio = (np.random.default_rng(0).standard_normal(3 * 16000) * 0.1).astype(np.float32)
+        step = lambda turn: recognizer.transcribe(audio)
+        period = None
+    elif component == "llm":
+        llm = LLMManager(local_model=config["llm_model"])
+        llm._initialize_local_model()
+        step = lambda turn: llm.generate_response(config["prompt"], conversation_id=f"bench_{turn}",
+                                                  max_tokens=config["max_tokens"])
+        period = None
+    else:
+        detector = WakeWordDetector(energy_gate=False, simulation_seed=0)
+        frame = (np.random.default_rng(1).standard_normal(detector.chunk_size) * 1000).astype(np.int16)
+        step = lambda turn: detector.detect(frame)
+        # Cadenciado como o microfone: um frame a cada chunk_size amostras
+        period = detector.chunk_size / detector.sample_rate
+    
+    ready.put(component)
+    start.wait()
+    
+    latencies = []
+    turn = 0
+    end = time.perf_counter() + config["duration"]
+    next_step = time.perf_counter()
+    while time.perf_counter() < end:
+        step_start = time.perf_counter()
+        step(turn)
+        latencies.append(time.perf_counter() - step_start)
+        turn += 1
+        if period:
+            next_step += period
+            time.sleep(max(0.0, next_step - time.perf_counter()))
+    
+    results.put((component, latencies, period))
+
+
+def _get_from(queue, processes, timeout):
+    """
+    Lê um item de uma fila de processos filhos
+    
+    Raises:
+        RuntimeError: Se um processo terminar com erro ou o tempo esgotar
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            return queue.get(timeout=1.0)
+        except Empty:
+            pass
+        for process in processes:
+            if process.exitcode not in (None, 0):
+                raise RuntimeError(f"Processo {process.name} terminou com código {process.exitcode}")
+    raise RuntimeError(f"Tempo esgotado após {timeout:.0f} s")
+
+
+def _run_allocation(allocation, config, context):
+    """
+    Executa os três componentes ao mesmo tempo, cada um em seu processo
+    
+    Args:
+        allocation (dict): Alocação avaliada
+        config (dict): Parâmetros da carga (ver run_sweep)
+        context: Contexto de multiprocessing
+    
+    Returns:
+        dict: Métricas da alocação (com "error" se um processo falhar)
+    """
+    ready = context.Queue()
+    results = context.Queue()
+    start = context.Event()
+    processes = [
+        context.Process(target=_run_component, name=component,
+                        args=(component, allocation, config, ready, start, results))
+        for component in COMPONENTS
+    ]
+    for process in processes:
+        process.start()
+    
+    latencies = {}
+    frame_seconds = None
+    try:
+        for _ in processes:
+            _get_from(ready, processes, config["load_timeout"])
+        start.set()
+        for _ in processes:
+            component, values, period = _get_from(results, processes, config["duration"] + 60.0)
+            latencies[component] = values
+            frame_seconds = period or frame_seconds
+    except RuntimeError as e:
+        print(f"Falha na alocação: {e}")
+        return {"allocation": allocation, "error": str(e)}
+    finally:
+        for process in processes:
+            process.join(5.0)
+            if process.is_alive():
+                process.terminate()
+    
+    wake_word = _percentiles(latencies["wake_word"])
+    return {
+        "allocation": allocation,
+        "total_threads": ThreadBudget(cores=config["cores"], allocation=allocation).total_threads(),
+        "whisper": _percentiles(latencies["whisper"]),
+        "llm": _percentiles(latencies["llm"]),
+        "wake_word": wake_word,
+        # Fração do tempo real consumida pela palavra de ativação (p95)
+        "wake_word_load": wake_word["p95"] / frame_seconds if wake_word["p95"] else 0.0
+    }
+
+
+def select_allocation(results, max_wake_word_load=0.5):
+    """
+    Escolhe a alocação com menor latência de resposta
+    
+    A latência de resposta é a soma do p95 de Whisper e do LLM, o caminho
+    crítico de uma interação. Só são consideradas alocações em que o p95 da
+    palavra de ativação usa no máximo `max_wake_word_load` da duração de um frame.
+    
+    Args:
+        results (list): Métricas por alocação
+        max_wake_word_load (float): Fração máxima do tempo real da palavra de ativação
+    
+    Returns:
+        dict: Resultado escolhido ou None se nenhum atender ao limite
+    """
+    fitting = [
+        r for r in results
+        if not r.get("error") and r["whisper"]["count"] and r["llm"]["count"]
+        and r["wake_word_load"] <= max_wake_word_load
+    ]
+    if not fitting:
+        return None
+    return min(fitting, key=lambda r: r["whisper"]["p95"] + r["llm"]["p95"])
+
+
+def run_sweep(cores=None, duration=20.0, whisper_model="base", llm_model="gpt2",
+              prompt="Qual é a capital do Brasil?", max_tokens=32, wav=None,
+              max_wake_word_load=0.5, load_timeout=600.0):
+    """
+    Avalia as divisões de núcleos com carga simultânea
+    
+    Args:
+        cores (int): Núcleos disponíveis (padrão: número de CPUs)
+        duration (float): Segundos de carga por alocação
+        whisper_model (str): Tamanho do modelo Whisper
+        llm_model (str): Modelo local do LLMManager
+        prompt (str): Pergunta enviada ao LLM
+        max_tokens (int): Tokens gerados por resposta
+        wav (str): Arquivo WAV transcrito repetidamente (padrão: 3 s de ruído)
+        max_wake_word_load (float): Fração máxima do tempo real da palavra de ativação
+        load_timeout (float): Tempo máximo de carga dos modelos por alocação em segundos
+    
+    Returns:
+        dict: Configuração, métricas por alocação e alocação escolhida
+    """
+    cores = cores or ThreadBudget().cores
+    config = {
+        "cores": cores,
+        "duration": duration,
+        "whisper_model": whisper_model,
+        "llm_model": llm_model,
+        "prompt": prompt,
+        "max_tokens": max_tokens,
+        "wav": wav,
+        "load_timeout": load_timeout
+    }
+    
+    context = multiprocessing.get_context("spawn")
+    results = []
+    for allocation in candidate_allocations(cores):
+        summary = ", ".join(f"{c}={t['intra']}" for c, t in allocation.items())
+        print(f"Avaliando {summary}...")
+        results.append(_run_allocation(allocation, config, context))
+    
+    return {
+        "config": dict(config, max_wake_word_load=max_wake_word_load),
+        "results": results,
+        "selected": select_allocation(results, max_wake_word_load)
+    }
+
+
+def print_report(report):
+    """Exibe as latências por alocação e a escolha"""
+    for r in report["results"]:
+        summary = ", ".join(f"{c}={t['intra']}" for c, t in r["allocation"].items())
+        if r.get("error"):
+            print(f"{summary}: falhou ({r['error']})")
+            continue
+        whisper = r["whisper"]["p95"] or 0.0
+        llm = r["llm"]["p95"] or 0.0
+        print(f"{summary}: Whisper p95 {whisper * 1000:.0f} ms, LLM p95 {llm * 1000:.0f} ms, "
+              f"palavra de ativação {r['wake_word_load'] * 100:.1f}% do tempo real")
+    
+    selected = report["selected"]
+    if selected:
+        print(f"Melhor alocação: {json.dumps(selected['allocation'])}")
+    else:
+        print("Nenhuma alocação mantém a palavra de ativação em tempo real")
+
+
+# Exemplo de uso
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark do orçamento de threads")
+    parser.add_argument("--cores", type=int, default=None)
+    parser.add_argument("--duration", type=float, default=20.0, help="Segundos de carga por alocação")
+    parser.add_argument("--whisper-model", default="base")
+    parser.add_argument("--llm-model", default="gpt2")
+    parser.add_argument("--max-tokens", type=int, default=32)
+    parser.add_argument("--wav", default=None, help="Arquivo WAV transcrito repetidamente")
+    parser.add_argument("--max-wake-word-load", type=float, default=0.5)
+    parser.add_argument("--load-timeout", type=float, default=600.0,
+                        help="Tempo máximo de carga dos modelos por alocação em segundos")
+    parser.add_argument("--output", help="Arquivo JSON de saída (padrão: saída padrão)")
+    args = parser.parse_args()
+    
+    report = run_sweep(
+        cores=args.cores,
+        duration=args.duration,
+        whisper_model=args.whisper_model,
+        llm_model=args.llm_model,
+        max_tokens=args.max_tokens,
+        wav=args.wav,
+        max_wake_word_load=args.max_wake_word_load,
+        load_timeout=args.load_timeout
+    )
+    
+    print_report(report)
+    
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"Relatório salvo em: {args.output}")
+    else:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
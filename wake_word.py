@@ -5,12 +5,15 @@ Utiliza a biblioteca openWakeWord para detecção de palavras-chave no áudio
 
 import os
 import numpy as np
-import pyaudio
 import wave
 import io
 import time
+import copy
 import threading
 import queue
+from collections import deque
+from modules.audio_source import AudioStreamClosed, MicrophoneSource
+from modules.thread_budget import thread_budget
 
 # Verificar se openWakeWord está disponível, caso contrário usar mock
 try:
@@ -20,10 +23,626 @@ except ImportError:
     OPENWAKEWORD_AVAILABLE = False
     print("Aviso: openWakeWord não está disponível. Usando implementação simulada.")
 
+def _process_memory_mb():
+    """
+    Obtém a memória residente (RSS) do processo atual em MB
+    
+    Returns:
+        float: Memória em MB ou None se não for possível medir
+    """
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except ImportError:
+        pass
+    
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _memory_delta(before, after):
+    """Diferença entre duas medições de memória, ou None se alguma falhou"""
+    if before is None or after is None:
+        return None
+    return after - before
+
+
+def _file_size_mb(path):
+    """Tamanho de um arquivo em MB, ou None se não existir"""
+    try:
+        return os.path.getsize(path) / (1024 * 1024)
+    except OSError:
+        return None
+
+
+class AudioRingBuffer:
+    """
+    Buffer circular pré-alocado de amostras int16
+    
+    O buffer é espelhado (cada amostra é gravada em duas posições), de modo que
+    qualquer janela de até `capacity` amostras é contígua na memória e pode ser
+    devolvida como view, sem cópia.
+    """
+    
+    def __init__(self, capacity):
+        """
+        Inicializa o buffer circular
+        
+        Args:
+            capacity (int): Número máximo de amostras retidas
+        """
+        if capacity <= 0:
+            raise ValueError("A capacidade do buffer deve ser positiva")
+        
+        self.capacity = int(capacity)
+        self._buffer = np.zeros(2 * self.capacity, dtype=np.int16)
+        self._total_written = 0
+        self._lock = threading.Lock()
+    
+    @property
+    def total_written(self):
+        """Número total de amostras gravadas desde a criação (posição absoluta)"""
+        return self._total_written
+    
+    def write(self, samples):
+        """
+        Grava amostras no buffer, sobrescrevendo as mais antigas
+        
+        Args:
+            samples (numpy.ndarray): Amostras int16
+        """
+        samples = np.asarray(samples, dtype=np.int16).reshape(-1)
+        
+        with self._lock:
+            total = self._total_written + len(samples)
+            
+            # Apenas as últimas `capacity` amostras podem ser retidas
+            if len(samples) > self.capacity:
+                samples = samples[-self.capacity:]
+            
+            offset = (total - len(samples)) % self.capacity
+            first = min(len(samples), self.capacity - offset)
+            rest = len(samples) - first
+            
+            self._buffer[offset:offset + first] = samples[:first]
+            self._buffer[offset + self.capacity:offset + self.capacity + first] = samples[:first]
+            if rest:
+                self._buffer[:rest] = samples[first:]
+                self._buffer[self.capacity:self.capacity + rest] = samples[first:]
+            
+            self._total_written = total
+    
+    def view(self, start, end):
+        """
+        Obtém uma view (sem cópia) das amostras no intervalo absoluto [start, end)
+        
+        A view compartilha memória com o buffer: deve ser consumida antes que
+        `capacity` novas amostras sejam gravadas.
+        
+        Args:
+            start (int): Posição absoluta inicial
+            end (int): Posição absoluta final (exclusiva)
+            
+        Returns:
+            numpy.ndarray: View das amostras solicitadas
+        """
+        with self._lock:
+            oldest = max(0, self._total_written - self.capacity)
+            if start < oldest or end > self._total_written or start > end:
+                raise ValueError(
+                    f"Intervalo [{start}, {end}) fora do buffer "
+                    f"[{oldest}, {self._total_written})"
+                )
+            
+            offset = start % self.capacity
+            return self._buffer[offset:offset + (end - start)]
+    
+    def latest(self, num_samples):
+        """
+        Obtém uma view das últimas amostras gravadas
+        
+        Args:
+            num_samples (int): Número de amostras
+            
+        Returns:
+            numpy.ndarray: View das amostras mais recentes
+        """
+        end = self._total_written
+        start = max(0, end - self.capacity, end - int(num_samples))
+        return self.view(start, end)
+
+
+class VoiceActivityDetector:
+    """
+    Detector de atividade de voz (VAD) baseado em energia e taxa de cruzamentos por zero
+    
+    Quadros com energia alta são classificados como fala. Quadros de energia
+    moderada também contam como fala quando a taxa de cruzamentos por zero está
+    na faixa típica de consoantes fricativas. Um temporizador de hangover evita
+    que pausas curtas entre palavras encerrem a captura.
+    """
+    
+    # Margem (dB) abaixo do limiar de energia em que quadros fricativos ainda contam como fala
+    WEAK_SPEECH_MARGIN_DB = 10.0
+    # Taxa de cruzamentos acima da qual o quadro é tratado como ruído branco
+    NOISE_ZCR = 0.45
+    
+    def __init__(self, sample_rate=16000, frame_ms=20, energy_threshold_db=-40.0,
+                 zcr_threshold=0.1, hangover_ms=600):
+        """
+        Inicializa o detector de atividade de voz
+        
+        Args:
+            sample_rate (int): Taxa de amostragem em Hz
+            frame_ms (int): Duração de cada quadro de análise em milissegundos
+            energy_threshold_db (float): Energia mínima (dBFS) para considerar fala
+            zcr_threshold (float): Taxa mínima de cruzamentos por zero de quadros fricativos
+            hangover_ms (int): Silêncio contínuo (ms) necessário para encerrar a fala
+        """
+        self.sample_rate = sample_rate
+        self.frame_length = int(sample_rate * frame_ms / 1000)
+        self.energy_threshold_db = energy_threshold_db
+        self.zcr_threshold = zcr_threshold
+        self.hangover_frames = max(1, int(hangover_ms / frame_ms))
+        self.reset()
+    
+    def reset(self):
+        """Reinicia o estado para uma nova captura"""
+        self.speech_frames = 0
+        self.silence_run = 0
+        self.speech_started = False
+    
+    def classify(self, samples):
+        """
+        Classifica os quadros de um bloco de amostras como fala ou silêncio
+        
+        Amostras que não completam um quadro no final do bloco são ignoradas.
+        
+        Args:
+            samples (numpy.ndarray): Amostras int16
+            
+        Returns:
+            numpy.ndarray: Máscara booleana com um valor por quadro
+        """
+        num_frames = len(samples) // self.frame_length
+        if num_frames == 0:
+            return np.zeros(0, dtype=bool)
+        
+        frames = samples[:num_frames * self.frame_length].reshape(num_frames, self.frame_length)
+        frames = frames.astype(np.float32) / 32768.0
+        
+        energy_db = 10.0 * np.log10(np.mean(frames * frames, axis=1) + 1e-10)
+        signs = np.signbit(frames)
+        zcr = np.mean(signs[:, 1:] != signs[:, :-1], axis=1)
+        
+        loud = energy_db > self.energy_threshold_db
+        fricative = (
+            (energy_db > self.energy_threshold_db - self.WEAK_SPEECH_MARGIN_DB)
+            & (zcr > self.zcr_threshold)
+            & (zcr < self.NOISE_ZCR)
+        )
+        return loud | fricative
+    
+    def process(self, samples):
+        """
+        Atualiza o estado com um novo bloco de amostras
+        
+        Args:
+            samples (numpy.ndarray): Amostras int16
+            
+        Returns:
+            bool: True se houve fala e o silêncio posterior excedeu o hangover
+        """
+        mask = self.classify(samples)
+        
+        if mask.any():
+            self.speech_started = True
+            self.speech_frames += int(np.count_nonzero(mask))
+            # Quadros de silêncio após o último quadro de fala do bloco
+            self.silence_run = len(mask) - 1 - int(np.flatnonzero(mask)[-1])
+        else:
+            self.silence_run += len(mask)
+        
+        return self.speech_started and self.silence_run >= self.hangover_frames
+
+
+class EnergyGate:
+    """
+    Porta de energia que evita inferência do modelo em quadros silenciosos
+    
+    Mantém uma estimativa adaptativa do piso de ruído e só deixa passar
+    quadros acima dele por uma margem. Após um quadro alto, a porta permanece
+    aberta por alguns quadros para que o modelo veja o final da palavra.
+    """
+    
+    def __init__(self, margin_db=6.0, min_energy_db=-60.0, hold_frames=10,
+                 adaptation=0.05):
+        """
+        Inicializa a porta de energia
+        
+        Args:
+            margin_db (float): Margem acima do piso de ruído para abrir a porta
+            min_energy_db (float): Energia (dBFS) abaixo da qual o quadro é sempre silêncio
+            hold_frames (int): Quadros em que a porta permanece aberta após um quadro alto
+            adaptation (float): Taxa de adaptação do piso de ruído (0.0 a 1.0)
+        """
+        self.margin_db = margin_db
+        self.min_energy_db = min_energy_db
+        self.hold_frames = hold_frames
+        self.adaptation = adaptation
+        self.noise_floor_db = None
+        self._hold = 0
+        
+        # Contadores
+        self.frames_total = 0
+        self.frames_skipped = 0
+    
+    def reset(self):
+        """Descarta a estimativa do piso de ruído (os contadores são mantidos)"""
+        self.noise_floor_db = None
+        self._hold = 0
+    
+    def update(self, audio_frame):
+        """
+        Avalia um quadro de áudio
+        
+        Args:
+            audio_frame (numpy.ndarray): Quadro de áudio int16
+            
+        Returns:
+            bool: True se o quadro deve ser analisado pelo modelo
+        """
+        samples = audio_frame.astype(np.float32) / 32768.0
+        energy_db = float(10.0 * np.log10(np.dot(samples, samples) / max(1, len(samples)) + 1e-10))
+        return self.update_energy(energy_db)
+    
+    def update_energy(self, energy_db):
+        """
+        Avalia um quadro a partir da sua energia já calculada
+        
+        Args:
+            energy_db (float): Energia do quadro em dBFS
+            
+        Returns:
+            bool: True se o quadro deve ser analisado pelo modelo
+        """
+        if self.noise_floor_db is None:
+            self.noise_floor_db = energy_db
+        
+        is_open = energy_db > max(self.noise_floor_db + self.margin_db, self.min_energy_db)
+        
+        if is_open:
+            self._hold = self.hold_frames
+            # Adaptação lenta para cima, caso o ruído de fundo aumente
+            self.noise_floor_db += self.adaptation * 0.1 * (energy_db - self.noise_floor_db)
+        else:
+            self.noise_floor_db += self.adaptation * (energy_db - self.noise_floor_db)
+            if self._hold > 0:
+                self._hold -= 1
+                is_open = True
+        
+        self.frames_total += 1
+        if not is_open:
+            self.frames_skipped += 1
+        
+        return is_open
+    
+    @property
+    def skip_ratio(self):
+        """Fração dos quadros que não passaram pelo modelo"""
+        return self.frames_skipped / self.frames_total if self.frames_total else 0.0
+
+
+class ScoreSmoother:
+    """
+    Suavização das pontuações do modelo por média em janela deslizante
+    
+    Após um disparo, novos disparos são suprimidos durante o período
+    refratário, evitando que uma única fala ative o detector duas vezes.
+    """
+    
+    def __init__(self, window=3, refractory_frames=12):
+        """
+        Inicializa o suavizador
+        
+        Args:
+            window (int): Número de quadros na média deslizante
+            refractory_frames (int): Quadros após um disparo em que novos disparos são ignorados
+        """
+        self.window = max(1, window)
+        self.refractory_frames = refractory_frames
+        self._scores = np.zeros(self.window, dtype=np.float32)
+        self._index = 0
+        self._cooldown = 0
+        self.last_score = 0.0
+        
+        # Contadores
+        self.triggers = 0
+        self.suppressed = 0
+    
+    def reset(self):
+        """Limpa a janela de pontuações e o período refratário (os contadores são mantidos)"""
+        self._scores[:] = 0.0
+        self._index = 0
+        self._cooldown = 0
+        self.last_score = 0.0
+    
+    def update(self, score, threshold):
+        """
+        Adiciona a pontuação de um quadro
+        
+        Args:
+            score (float): Pontuação do modelo (0.0 para quadros não analisados)
+            threshold (float): Limiar de disparo
+            
+        Returns:
+            bool: True se a pontuação suavizada disparou o detector
+        """
+        self._scores[self._index] = score
+        self._index = (self._index + 1) % self.window
+        self.last_score = float(self._scores.mean())
+        
+        if self._cooldown > 0:
+            self._cooldown -= 1
+            if self.last_score > threshold:
+                self.suppressed += 1
+            return False
+        
+        if self.last_score > threshold:
+            self.triggers += 1
+            self._cooldown = self.refractory_frames
+            self._scores[:] = 0.0
+            return True
+        
+        return False
+
+
+class _CaptureSession:
+    """Estado de uma captura em andamento após a detecção da palavra de ativação"""
+    
+    def __init__(self, ring_buffer, sample_rate, vad, min_duration, max_duration,
+                 pre_roll, no_speech_timeout, headroom=0):
+        trigger = ring_buffer.total_written
+        pre_roll_samples = min(int(sample_rate * pre_roll), trigger)
+        max_samples = int(sample_rate * max_duration)
+        
+        # A captura termina em limite de frame: até `headroom` amostras podem
+        # ser gravadas além do fim antes de o áudio ser lido
+        if pre_roll_samples + max_samples + headroom > ring_buffer.capacity:
+            raise ValueError("Captura maior que a capacidade do buffer circular")
+        
+        self.ring_buffer = ring_buffer
+        self.vad = vad
+        self.start = trigger - pre_roll_samples
+        self.position = trigger
+        self.min_end = trigger + int(sample_rate * min_duration)
+        self.max_end = trigger + max_samples
+        self.no_speech_end = trigger + int(sample_rate * no_speech_timeout)
+        self.speech_ended = False
+        self.done = False
+        
+        # Apenas o áudio posterior à detecção é analisado pelo VAD
+        if vad is not None:
+            vad.reset()
+    
+    def advance(self):
+        """
+        Processa o áudio gravado no buffer desde a última chamada
+        
+        Returns:
+            bool: True quando a captura terminou
+        """
+        if self.done:
+            return True
+        
+        end = min(self.ring_buffer.total_written, self.max_end)
+        if end > self.position:
+            if self.vad is not None:
+                self.speech_ended = self.vad.process(self.ring_buffer.view(self.position, end))
+            self.position = end
+        
+        if self.position >= self.max_end:
+            self.done = True
+        elif self.vad is not None:
+            if self.speech_ended and self.position >= self.min_end:
+                self.done = True
+            elif not self.vad.speech_started and self.position >= self.no_speech_end:
+                self.done = True
+        
+        return self.done
+    
+    def result(self):
+        """
+        Obtém o áudio capturado
+        
+        Returns:
+            numpy.ndarray: View int16 do áudio ou None se o VAD não detectou fala
+        """
+        if self.vad is not None and not self.vad.speech_started:
+            return None
+        return self.ring_buffer.view(self.start, self.position)
+
+
+def _put_with_policy(target_queue, item, policy):
+    """
+    Insere um item em uma fila limitada aplicando a política de descarte
+    
+    Args:
+        target_queue (queue.Queue): Fila de destino
+        item: Item a ser inserido
+        policy (str): 'drop_oldest' descarta o item mais antigo, 'drop_newest' rejeita o novo
+        
+    Returns:
+        tuple: (item inserido (bool), número de itens descartados)
+    """
+    dropped = 0
+    while True:
+        try:
+            target_queue.put_nowait(item)
+            return True, dropped
+        except queue.Full:
+            if policy == "drop_newest":
+                return False, dropped + 1
+            try:
+                target_queue.get_nowait()
+                target_queue.task_done()
+                dropped += 1
+            except queue.Empty:
+                pass
+
+
+class UtteranceDispatcher:
+    """
+    Distribui as capturas para um pool de threads que executa o callback do usuário
+    
+    A thread de detecção apenas enfileira as capturas e volta a escutar. A fila
+    é limitada; quando cheia, a política 'drop_oldest' descarta a captura mais
+    antiga e 'drop_newest' rejeita a nova. Capturas mais antigas que `max_age`
+    são descartadas ao serem retiradas da fila.
+    """
+    
+    POLICIES = ("drop_oldest", "drop_newest")
+    
+    def __init__(self, callback, num_workers=2, max_pending=4, max_age=None,
+                 policy="drop_oldest"):
+        """
+        Inicializa o despachante de capturas
+        
+        Args:
+            callback (callable): Função chamada com cada captura (io.BytesIO)
+            num_workers (int): Número de threads de processamento
+            max_pending (int): Capturas aguardando processamento antes de aplicar a política
+            max_age (float): Idade máxima em segundos de uma captura (None para sem limite)
+            policy (str): Política quando a fila está cheia ('drop_oldest' ou 'drop_newest')
+        """
+        if policy not in self.POLICIES:
+            raise ValueError(f"Política inválida: {policy}. Use uma de {self.POLICIES}")
+        
+        self.callback = callback
+        self.num_workers = max(1, num_workers)
+        self.max_age = max_age
+        self.policy = policy
+        self.pending = queue.Queue(maxsize=max_pending)
+        self.running = False
+        self.workers = []
+        
+        # Contadores
+        self.submitted = 0
+        self.processed = 0
+        self.dropped = 0
+        self.stale = 0
+        self.errors = 0
+        self._stats_lock = threading.Lock()
+    
+    def start(self):
+        """Inicia as threads de processamento"""
+        if self.running:
+            return
+        
+        self.running = True
+        self.workers = []
+        for i in range(self.num_workers):
+            worker = threading.Thread(target=self._worker_loop, name=f"utterance-worker-{i}")
+            worker.daemon = True
+            worker.start()
+            self.workers.append(worker)
+    
+    def stop(self, timeout=2.0, drain=False):
+        """
+        Para as threads de processamento
+        
+        Args:
+            timeout (float): Tempo máximo de espera por thread em segundos
+            drain (bool): Se True, processa as capturas pendentes antes de parar;
+                caso contrário elas são descartadas
+        """
+        if drain:
+            while self.pending.unfinished_tasks and any(w.is_alive() for w in self.workers):
+                time.sleep(0.01)
+        
+        self.running = False
+        for worker in self.workers:
+            worker.join(timeout=timeout)
+        self.workers = []
+    
+    def submit(self, audio_buffer):
+        """
+        Enfileira uma captura para processamento
+        
+        Args:
+            audio_buffer (io.BytesIO): Áudio capturado
+            
+        Returns:
+            bool: True se a captura foi aceita
+        """
+        accepted, dropped = _put_with_policy(
+            self.pending, (audio_buffer, time.monotonic()), self.policy
+        )
+        with self._stats_lock:
+            self.submitted += 1
+            self.dropped += dropped
+        
+        if dropped:
+            print(f"Fila de capturas cheia, {dropped} captura(s) descartada(s)")
+        return accepted
+    
+    def _worker_loop(self):
+        """Loop das threads de processamento"""
+        while self.running:
+            try:
+                audio_buffer, submitted_at = self.pending.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            
+            try:
+                if self.max_age is not None and time.monotonic() - submitted_at > self.max_age:
+                    with self._stats_lock:
+                        self.stale += 1
+                    continue
+                
+                self.callback(audio_buffer)
+                with self._stats_lock:
+                    self.processed += 1
+            except Exception as e:
+                with self._stats_lock:
+                    self.errors += 1
+                print(f"Erro no callback de palavra de ativação: {e}")
+            finally:
+                self.pending.task_done()
+    
+    def get_stats(self):
+        """
+        Obtém os contadores do despachante
+        
+        Returns:
+            dict: Capturas enviadas, processadas, descartadas, expiradas, com erro e pendentes
+        """
+        with self._stats_lock:
+            return {
+                "submitted": self.submitted,
+                "processed": self.processed,
+                "dropped": self.dropped,
+                "stale": self.stale,
+                "errors": self.errors,
+                "pending": self.pending.qsize()
+            }
+
+
 class WakeWordDetector:
     """Detector de palavra de ativação usando openWakeWord ou simulação"""
     
-    def __init__(self, model_name="ei brandini", threshold=0.5, offline=True):
+    def __init__(self, model_name="ei brandini", threshold=0.5, offline=True,
+                 pre_roll=0.5, buffer_seconds=10.0, use_vad=True,
+                 min_duration=0.5, max_duration=5.0, no_speech_timeout=2.0,
+                 callback_mode=False, max_queued_frames=25, num_workers=2,
+                 max_pending=4, max_utterance_age=None, stale_policy="drop_oldest",
+                 energy_gate=True, gate_margin_db=6.0, smoothing_window=3,
+                 refractory=1.0, model_path=None, inference_framework=None,
+                 num_threads=None, audio_source=None, simulation_seed=None, model=None):
         """
         Inicializa o detector de palavra de ativação
         
@@ -31,29 +650,132 @@ class WakeWordDetector:
             model_name (str): Nome do modelo de palavra de ativação
             threshold (float): Limiar de confiança para detecção (0.0 a 1.0)
             offline (bool): Se True, tenta usar openWakeWord, caso contrário usa simulação
+            pre_roll (float): Segundos de áudio anteriores à detecção incluídos na captura
+            buffer_seconds (float): Capacidade do buffer circular de áudio em segundos (mínimo pre_roll + max_duration + um frame)
+            use_vad (bool): Se True, encerra a captura quando a fala termina
+            min_duration (float): Duração mínima da captura em segundos (com VAD)
+            max_duration (float): Duração máxima da captura em segundos
+            no_speech_timeout (float): Segundos sem fala após a detecção para descartar a captura
+            callback_mode (bool): Se True, usa o modo callback (não bloqueante) do PyAudio
+            max_queued_frames (int): Frames pendentes no modo callback antes de descartar os mais antigos
+            num_workers (int): Threads que executam o callback enquanto a detecção continua
+            max_pending (int): Capturas pendentes (no callback e em audio_queue) antes de descartar
+            max_utterance_age (float): Idade máxima em segundos de uma captura antes do callback
+            stale_policy (str): Política com a fila cheia ('drop_oldest' ou 'drop_newest')
+            energy_gate (bool): Se True, não executa o modelo em quadros silenciosos
+            gate_margin_db (float): Margem acima do piso de ruído para executar o modelo
+            smoothing_window (int): Quadros na média deslizante das pontuações
+            refractory (float): Segundos após um disparo em que novos disparos são ignorados
+            model_path (str): Caminho para um modelo personalizado (.onnx ou .tflite)
+            inference_framework (str): Runtime do openWakeWord ('onnx' ou 'tflite', padrão da biblioteca)
+            num_threads (int): Threads de CPU usadas no cálculo das features do modelo
+                (padrão: orçamento de 'wake_word' em thread_budget)
+            audio_source (AudioSource): Fonte de áudio (padrão: microfone via PyAudio)
+            simulation_seed (int): Semente da simulação sem openWakeWord, para execuções reproduzíveis
+            model: Modelo já carregado (ex: compartilhado entre detectores); nenhum outro é carregado
         """
+        if stale_policy not in UtteranceDispatcher.POLICIES:
+            raise ValueError(f"Política inválida: {stale_policy}. Use uma de {UtteranceDispatcher.POLICIES}")
+        
         self.model_name = model_name
         self.threshold = threshold
         self.offline = offline
+        self.pre_roll = pre_roll
+        self.min_duration = min_duration
+        self.max_duration = max_duration
+        self.no_speech_timeout = no_speech_timeout
         self.running = False
         self.detected_callback = None
         self.detection_thread = None
-        self.audio_queue = queue.Queue()
+        self.audio_queue = queue.Queue(maxsize=max_pending)
+        
+        # Despacho das capturas para o callback fora da thread de detecção
+        self.num_workers = num_workers
+        self.max_pending = max_pending
+        self.max_utterance_age = max_utterance_age
+        self.stale_policy = stale_policy
+        self.dispatcher = None
+        self._capture = None
+        
+        # Barge-in: sinalizado a cada detecção para interromper a fala do assistente
+        self.barge_in_event = threading.Event()
+        self._barge_in_listeners = []
         
         # Configurações de áudio
         self.sample_rate = 16000
         self.chunk_size = 1280  # 80ms a 16kHz
         
-        # Inicializar PyAudio
-        self.p = pyaudio.PyAudio()
-        self.stream = None
+        # Buffer circular alimentado continuamente pelo loop de detecção; precisa
+        # conter pre-roll, captura máxima e o frame que ultrapassa o fim da captura
+        required = int(self.sample_rate * pre_roll) + int(self.sample_rate * max_duration) + self.chunk_size
+        if int(self.sample_rate * buffer_seconds) < required:
+            raise ValueError(
+                f"buffer_seconds deve ser pelo menos pre_roll + max_duration + um frame "
+                f"({required / self.sample_rate:.2f} s)"
+            )
+        self.ring_buffer = AudioRingBuffer(int(self.sample_rate * buffer_seconds))
+        
+        # Detector de atividade de voz para encerrar a captura
+        self.vad = VoiceActivityDetector(sample_rate=self.sample_rate) if use_vad else None
+        
+        # Porta de energia e suavização das pontuações do modelo
+        frame_seconds = self.chunk_size / self.sample_rate
+        self.energy_gate = EnergyGate(margin_db=gate_margin_db) if energy_gate else None
+        self.score_smoother = ScoreSmoother(
+            window=smoothing_window,
+            refractory_frames=int(refractory / frame_seconds)
+        )
+        
+        # Modo callback: fila limitada preenchida pela thread de áudio do PortAudio.
+        # append/popleft de deque são atômicos, dispensando locks entre as threads.
+        self.callback_mode = callback_mode
+        self._use_callback = False
+        self._frames = deque(maxlen=max_queued_frames)
+        self._frame_available = threading.Event()
+        self._last_frame_time = None
+        
+        # Contadores do stream de áudio
+        self.frames_received = 0
+        self.frames_dropped = 0
+        self.input_overflows = 0
+        self.detection_lag = 0.0
+        self.max_detection_lag = 0.0
+        
+        # Fonte de áudio (o PyAudio só é inicializado ao abrir o microfone)
+        self.audio_source = audio_source or MicrophoneSource()
+        
+        # Gerador da simulação (determinístico quando há semente)
+        self.simulation_seed = simulation_seed
+        self._rng = np.random.default_rng(simulation_seed)
+        
+        # Modelo a carregar: caminho personalizado ou nome de modelo pré-treinado
+        self.model_path = model_path
+        self.inference_framework = inference_framework
+        self.num_threads = num_threads or thread_budget.threads("wake_word")[0]
+        wakeword_model = model_path or model_name.replace(" ", "_")
+        # O openWakeWord indexa as predições pelo nome do arquivo sem extensão
+        self.prediction_key = os.path.splitext(os.path.basename(wakeword_model))[0]
+        self.model_info = {}
         
         # Inicializar modelo se disponível
-        if OPENWAKEWORD_AVAILABLE and offline:
+        if model is not None:
+            self.model = model
+        elif OPENWAKEWORD_AVAILABLE and offline:
             try:
                 print(f"Inicializando modelo openWakeWord para '{model_name}'...")
-                self.model = openwakeword.Model()
+                memory_before = _process_memory_mb()
+                load_start = time.time()
+                self.model = self._load_model(wakeword_model)
+                self.model_info = {
+                    "model": wakeword_model,
+                    "inference_framework": inference_framework or "padrão",
+                    "num_threads": self.num_threads,
+                    "load_time": time.time() - load_start,
+                    "file_size_mb": _file_size_mb(model_path) if model_path else None,
+                    "memory_mb": _memory_delta(memory_before, _process_memory_mb())
+                }
                 print("Modelo inicializado com sucesso!")
+                self._print_model_info()
             except Exception as e:
                 print(f"Erro ao inicializar openWakeWord: {e}")
                 self.model = None
@@ -61,6 +783,36 @@ class WakeWordDetector:
             self.model = None
             print("Usando detector de palavra de ativação simulado")
     
+    def _load_model(self, wakeword_model):
+        """
+        Carrega apenas o modelo de palavra de ativação solicitado
+        
+        Args:
+            wakeword_model (str): Caminho ou nome do modelo pré-treinado
+            
+        Returns:
+            openwakeword.Model: Modelo carregado
+        """
+        kwargs = {"ncpu": self.num_threads}
+        if self.inference_framework:
+            kwargs["inference_framework"] = self.inference_framework
+        
+        try:
+            return openwakeword.Model(wakeword_models=[wakeword_model], **kwargs)
+        except TypeError:
+            # Versões antigas do openWakeWord usam wakeword_model_paths
+            return openwakeword.Model(wakeword_model_paths=[wakeword_model], **kwargs)
+    
+    def _print_model_info(self):
+        """Exibe o relatório de carregamento e memória do modelo"""
+        info = self.model_info
+        print(f"  Modelo: {info['model']} (runtime: {info['inference_framework']}, threads: {info['num_threads']})")
+        print(f"  Tempo de carregamento: {info['load_time']:.2f}s")
+        if info["file_size_mb"] is not None:
+            print(f"  Tamanho do arquivo: {info['file_size_mb']:.1f} MB")
+        if info["memory_mb"] is not None:
+            print(f"  Memória do processo após carregamento: +{info['memory_mb']:.1f} MB")
+    
     def start(self, callback=None):
         """
         Inicia a detecção de palavra de ativação em segundo plano
@@ -72,17 +824,7 @@ class WakeWordDetector:
             print("Detector já está em execução")
             return
         
-        self.detected_callback = callback
-        self.running = True
-        
-        # Iniciar stream de áudio
-        self.stream = self.p.open(
-            format=pyaudio.paInt16,
-            channels=1,
-            rate=self.sample_rate,
-            input=True,
-            frames_per_buffer=self.chunk_size
-        )
+        self._open(callback)
         
         # Iniciar thread de detecção
         self.detection_thread = threading.Thread(target=self._detection_loop)
@@ -91,22 +833,116 @@ class WakeWordDetector:
         
         print("Detector de palavra de ativação iniciado")
     
-    def stop(self):
-        """Para a detecção de palavra de ativação"""
+    def run(self, callback=None):
+        """
+        Executa a detecção na thread atual até o fim da fonte de áudio
+        
+        Útil com fontes de arquivo ou array: com realtime=False o áudio é
+        processado tão rápido quanto a CPU permite.
+        
+        Args:
+            callback (callable): Função a ser chamada quando a palavra for detectada
+            
+        Returns:
+            dict: Duração do áudio processado, tempo de execução e fator de tempo real
+        """
+        if self.running:
+            print("Detector já está em execução")
+            return None
+        
+        self._open(callback)
+        frames_before = self.frames_received
+        start_time = time.time()
+        
+        try:
+            self._detection_loop()
+        finally:
+            elapsed = time.time() - start_time
+            self.stop(drain=True)
+        
+        audio_seconds = (self.frames_received - frames_before) * self.chunk_size / self.sample_rate
+        return {
+            "audio_seconds": audio_seconds,
+            "elapsed_seconds": elapsed,
+            "real_time_factor": elapsed / audio_seconds if audio_seconds else 0.0,
+            "frames_per_second": (self.frames_received - frames_before) / elapsed if elapsed else 0.0
+        }
+    
+    def wait(self, timeout=None):
+        """
+        Aguarda o fim da thread de detecção (ex: fim de um arquivo de áudio)
+        
+        Args:
+            timeout (float): Tempo máximo de espera em segundos
+            
+        Returns:
+            bool: True se a detecção terminou
+        """
+        if self.detection_thread:
+            self.detection_thread.join(timeout=timeout)
+            return not self.detection_thread.is_alive()
+        return True
+    
+    def _open(self, callback):
+        """
+        Abre a fonte de áudio e inicia as threads do callback
+        
+        Args:
+            callback (callable): Função a ser chamada quando a palavra for detectada
+        """
+        self.detected_callback = callback
+        self.running = True
+        self._frames.clear()
+        self._capture = None
+        
+        # Iniciar threads que executam o callback
+        if callback:
+            self.dispatcher = UtteranceDispatcher(
+                callback,
+                num_workers=self.num_workers,
+                max_pending=self.max_pending,
+                max_age=self.max_utterance_age,
+                policy=self.stale_policy
+            )
+            self.dispatcher.start()
+        
+        # Modo callback apenas em fontes que o suportam (ex: microfone)
+        use_callback = self.callback_mode and self.audio_source.supports_callback
+        if self.callback_mode and not use_callback:
+            print("Fonte de áudio não suporta modo callback, usando leitura bloqueante")
+        self._use_callback = use_callback
+        
+        # Iniciar stream de áudio
+        self.audio_source.open(
+            self.sample_rate,
+            self.chunk_size,
+            on_frame=self._on_audio_frame if use_callback else None
+        )
+    
+    def stop(self, drain=False):
+        """
+        Para a detecção de palavra de ativação
+        
+        Args:
+            drain (bool): Se True, aguarda o callback processar as capturas pendentes
+        """
         if not self.running:
             return
         
         self.running = False
+        self._frame_available.set()
         
         # Aguardar thread terminar
-        if self.detection_thread:
+        if self.detection_thread and self.detection_thread is not threading.current_thread():
             self.detection_thread.join(timeout=2.0)
+        self.detection_thread = None
+        
+        if self.dispatcher:
+            self.dispatcher.stop(drain=drain)
+            self.dispatcher = None
         
         # Fechar stream de áudio
-        if self.stream:
-            self.stream.stop_stream()
-            self.stream.close()
-            self.stream = None
+        self.audio_source.close()
         
         print("Detector de palavra de ativação parado")
     
@@ -114,33 +950,226 @@ class WakeWordDetector:
         """Loop principal de detecção em segundo plano"""
         while self.running:
             try:
-                # Ler frame de áudio
-                audio_data = self.stream.read(self.chunk_size, exception_on_overflow=False)
+                # Ler frame de áudio (já gravado no buffer circular)
+                audio_frame = self._read_frame()
                 
-                # Converter para numpy array
-                audio_frame = np.frombuffer(audio_data, dtype=np.int16)
+                # Captura em andamento: avançar sem bloquear a leitura de frames
+                if self._step_capture():
+                    continue
                 
                 # Detectar palavra de ativação
-                if self.detect(audio_frame):
-                    print(f"Palavra de ativação '{self.model_name}' detectada!")
-                    
-                    # Capturar áudio adicional após detecção
-                    audio_buffer = self.capture_audio(duration=5.0)
-                    
-                    # Adicionar à fila
-                    self.audio_queue.put(audio_buffer)
-                    
-                    # Chamar callback se definido
-                    if self.detected_callback:
-                        self.detected_callback(audio_buffer)
+                detected = self.detect(audio_frame)
+                self._update_detection_lag()
                 
-                # Pequena pausa para reduzir uso de CPU
-                time.sleep(0.01)
+                if detected:
+                    print(f"Palavra de ativação '{self.model_name}' detectada!")
+                    self._handle_detection()
                 
+            except AudioStreamClosed:
+                self._end_of_stream()
+                break
             except Exception as e:
                 print(f"Erro no loop de detecção: {e}")
                 time.sleep(0.1)
     
+    def add_barge_in_listener(self, listener):
+        """
+        Registra uma função chamada a cada detecção, antes da captura do comando
+        
+        Usada para interromper a fala em andamento, ex:
+        detector.add_barge_in_listener(lambda: tts.interrupt(timeout=0)). A função
+        é executada na thread de detecção e deve retornar rapidamente: não espere
+        a reprodução terminar (o timeout padrão de interrupt bloquearia a detecção).
+        
+        Args:
+            listener (callable): Função sem argumentos
+        """
+        self._barge_in_listeners.append(listener)
+    
+    def remove_barge_in_listener(self, listener):
+        """
+        Remove uma função registrada com add_barge_in_listener
+        
+        Args:
+            listener (callable): Função registrada
+        """
+        if listener in self._barge_in_listeners:
+            self._barge_in_listeners.remove(listener)
+    
+    def _handle_detection(self):
+        """Sinaliza o barge-in e inicia a captura do comando"""
+        self.barge_in_event.set()
+        for listener in list(self._barge_in_listeners):
+            try:
+                listener()
+            except Exception as e:
+                print(f"Erro no listener de barge-in: {e}")
+        
+        self._start_capture()
+    
+    def _start_capture(self):
+        """Inicia a captura do comando após a detecção, incluindo o pre-roll"""
+        if self.vad is not None:
+            self._capture = self._begin_capture(
+                self.min_duration, self.max_duration, None, self.vad
+            )
+        else:
+            self._capture = self._begin_capture(
+                self.max_duration, self.max_duration, None, None
+            )
+    
+    def _step_capture(self):
+        """
+        Avança a captura em andamento com o áudio já gravado no buffer
+        
+        Returns:
+            bool: True se havia captura em andamento (o frame pertence ao comando)
+        """
+        if self._capture is None:
+            return False
+        
+        if self._capture.advance():
+            self._finish_capture()
+        return True
+    
+    def _end_of_stream(self):
+        """Fim da fonte de áudio: entregar a captura em andamento"""
+        if self._capture is not None:
+            self._capture.advance()
+            self._finish_capture()
+    
+    def _finish_capture(self):
+        """Encerra a captura em andamento e entrega o áudio, se houver fala"""
+        try:
+            samples = self._capture.result()
+        except ValueError as e:
+            # Áudio sobrescrito no buffer circular: a captura não pode ser recuperada
+            print(f"Captura descartada: {e}")
+            return
+        finally:
+            self._capture = None
+        
+        if samples is None:
+            print("Nenhuma fala detectada após a palavra de ativação, captura descartada")
+        else:
+            self._dispatch(self._to_wav(samples))
+    
+    def _dispatch(self, audio_buffer):
+        """
+        Entrega uma captura à fila de áudio e às threads do callback
+        
+        Args:
+            audio_buffer (io.BytesIO): Áudio capturado em WAV
+        """
+        _, dropped = _put_with_policy(self.audio_queue, audio_buffer, self.stale_policy)
+        if dropped:
+            print(f"Fila de áudio cheia, {dropped} captura(s) descartada(s)")
+        
+        if self.dispatcher:
+            # Cada consumidor recebe seu próprio buffer para leituras independentes
+            self.dispatcher.submit(io.BytesIO(audio_buffer.getvalue()))
+    
+    def _on_audio_frame(self, in_data, overflowed):
+        """
+        Recebe um frame no modo callback (executado na thread de áudio da fonte)
+        
+        Apenas enfileira o frame; quando a fila está cheia o frame mais antigo
+        é descartado e contabilizado, limitando a latência de detecção.
+        
+        Args:
+            in_data (bytes): Amostras int16
+            overflowed (bool): Se a fonte reportou overflow de entrada
+        """
+        self.frames_received += 1
+        if overflowed:
+            self.input_overflows += 1
+        
+        if len(self._frames) == self._frames.maxlen:
+            self.frames_dropped += 1
+        self._frames.append((in_data, time.monotonic()))
+        self._frame_available.set()
+    
+    def _next_queued_frame(self):
+        """
+        Obtém o próximo frame enfileirado pelo callback, aguardando se necessário
+        
+        Returns:
+            bytes: Dados do frame de áudio
+        """
+        while True:
+            try:
+                audio_data, self._last_frame_time = self._frames.popleft()
+                return audio_data
+            except IndexError:
+                if not self.running:
+                    raise AudioStreamClosed()
+                self._frame_available.clear()
+                # Verificar novamente para não perder um frame chegado antes do clear
+                if not self._frames:
+                    self._frame_available.wait(timeout=0.5)
+    
+    def _read_frame(self):
+        """
+        Lê um frame do stream de áudio e o grava no buffer circular
+        
+        Returns:
+            numpy.ndarray: Frame de áudio como array int16
+        """
+        if self._use_callback:
+            audio_data = self._next_queued_frame()
+        else:
+            audio_data = self.audio_source.read(self.chunk_size)
+            self._last_frame_time = time.monotonic()
+            self.frames_received += 1
+        
+        audio_frame = np.frombuffer(audio_data, dtype=np.int16)
+        self.ring_buffer.write(audio_frame)
+        return audio_frame
+    
+    def _update_detection_lag(self):
+        """Atualiza o atraso entre a chegada do frame e o fim da sua análise"""
+        if self._last_frame_time is None:
+            return
+        
+        self.detection_lag = time.monotonic() - self._last_frame_time
+        self.max_detection_lag = max(self.max_detection_lag, self.detection_lag)
+    
+    def get_stream_stats(self):
+        """
+        Obtém os contadores do stream de áudio
+        
+        Returns:
+            dict: Frames recebidos, descartados, pendentes, overflows e atraso de detecção
+        """
+        received = self.frames_received
+        return {
+            "frames_received": received,
+            "frames_dropped": self.frames_dropped,
+            "frames_queued": len(self._frames),
+            "drop_rate": self.frames_dropped / received if received else 0.0,
+            "input_overflows": self.input_overflows,
+            "detection_lag": self.detection_lag,
+            "max_detection_lag": self.max_detection_lag
+        }
+    
+    def get_detection_stats(self):
+        """
+        Obtém estatísticas da porta de energia e da suavização
+        
+        Returns:
+            dict: Quadros analisados e ignorados, piso de ruído, disparos e supressões
+        """
+        gate = self.energy_gate
+        return {
+            "frames_total": gate.frames_total if gate else None,
+            "frames_skipped": gate.frames_skipped if gate else 0,
+            "skip_ratio": gate.skip_ratio if gate else 0.0,
+            "noise_floor_db": gate.noise_floor_db if gate else None,
+            "last_score": self.score_smoother.last_score,
+            "triggers": self.score_smoother.triggers,
+            "suppressed": self.score_smoother.suppressed
+        }
+    
     def detect(self, audio_frame):
         """
         Detecta palavra de ativação em um frame de áudio
@@ -151,43 +1180,139 @@ class WakeWordDetector:
         Returns:
             bool: True se a palavra de ativação foi detectada, False caso contrário
         """
+        # Quadros silenciosos não passam pelo modelo
+        if self.energy_gate is not None and not self.energy_gate.update(audio_frame):
+            if self.model is not None:
+                self.score_smoother.update(0.0, self.threshold)
+            return False
+        
         if self.model is not None:
             # Usar openWakeWord
             prediction = self.model.predict(audio_frame)
-            score = prediction.get(self.model_name, 0.0)
-            return score > self.threshold
+            score = prediction.get(self.prediction_key, 0.0)
+            return self.score_smoother.update(score, self.threshold)
         else:
             # Simulação: detecta aleatoriamente com baixa probabilidade
             # Apenas para fins de teste quando openWakeWord não está disponível
-            return np.random.random() > 0.995  # ~0.5% de chance de detecção
+            return self._rng.random() > 0.995  # ~0.5% de chance de detecção
+    
+    def reset(self):
+        """
+        Reinicia o estado de detecção entre fluxos de áudio independentes
+        
+        Limpa a porta de energia, a suavização, o buffer interno do modelo e
+        reinicia a simulação a partir da semente configurada.
+        """
+        if self.energy_gate is not None:
+            self.energy_gate.reset()
+        self.score_smoother.reset()
+        
+        if self.model is not None and hasattr(self.model, "reset"):
+            self.model.reset()
+        
+        self._rng = np.random.default_rng(self.simulation_seed)
     
-    def capture_audio(self, duration=5.0):
+    def _begin_capture(self, min_duration, max_duration, pre_roll, vad):
+        """
+        Inicia uma captura a partir da posição atual do buffer circular
+        
+        Args:
+            min_duration (float): Duração mínima em segundos
+            max_duration (float): Duração máxima em segundos
+            pre_roll (float): Segundos anteriores à detecção
+            vad (VoiceActivityDetector): Detector de fim de fala ou None para duração fixa
+            
+        Returns:
+            _CaptureSession: Estado da captura
+        """
+        if pre_roll is None:
+            pre_roll = self.pre_roll
+        
+        return _CaptureSession(
+            self.ring_buffer,
+            self.sample_rate,
+            vad,
+            min_duration,
+            max_duration,
+            pre_roll,
+            self.no_speech_timeout,
+            headroom=self.chunk_size
+        )
+    
+    def capture_array(self, duration=5.0, pre_roll=None):
+        """
+        Captura áudio após detecção da palavra de ativação como array
+        
+        O áudio continua sendo lido para o buffer circular; o resultado é uma
+        view (sem cópia) que começa `pre_roll` segundos antes da detecção.
+        
+        Args:
+            duration (float): Duração em segundos após a detecção
+            pre_roll (float): Segundos anteriores à detecção (padrão: self.pre_roll)
+            
+        Returns:
+            numpy.ndarray: View int16 do áudio capturado
+        """
+        session = self._begin_capture(duration, duration, pre_roll, None)
+        while not session.advance():
+            self._read_frame()
+        return session.result()
+    
+    def capture_until_silence(self, min_duration=None, max_duration=None, pre_roll=None):
+        """
+        Captura áudio após detecção até que a fala termine
+        
+        A captura é encerrada quando o VAD detecta o fim da fala (respeitando a
+        duração mínima), ao atingir a duração máxima, ou quando nenhuma fala
+        começa dentro de `no_speech_timeout`.
+        
+        Args:
+            min_duration (float): Duração mínima em segundos (padrão: self.min_duration)
+            max_duration (float): Duração máxima em segundos (padrão: self.max_duration)
+            pre_roll (float): Segundos anteriores à detecção (padrão: self.pre_roll)
+            
+        Returns:
+            numpy.ndarray: View int16 do áudio capturado ou None se não houve fala
+        """
+        session = self._begin_capture(
+            self.min_duration if min_duration is None else min_duration,
+            self.max_duration if max_duration is None else max_duration,
+            pre_roll,
+            self.vad or VoiceActivityDetector(sample_rate=self.sample_rate)
+        )
+        while not session.advance():
+            self._read_frame()
+        return session.result()
+    
+    def capture_audio(self, duration=5.0, pre_roll=None):
         """
         Captura áudio adicional após detecção da palavra de ativação
         
         Args:
             duration (float): Duração em segundos
+            pre_roll (float): Segundos anteriores à detecção (padrão: self.pre_roll)
             
         Returns:
             io.BytesIO: Buffer contendo áudio WAV
         """
-        frames = []
-        
-        # Calcular número de chunks para a duração desejada
-        num_chunks = int(self.sample_rate * duration / self.chunk_size)
-        
-        # Capturar áudio
-        for _ in range(num_chunks):
-            data = self.stream.read(self.chunk_size, exception_on_overflow=False)
-            frames.append(data)
+        return self._to_wav(self.capture_array(duration, pre_roll))
+    
+    def _to_wav(self, samples):
+        """
+        Converte amostras int16 em um arquivo WAV em memória
         
-        # Criar arquivo WAV em memória
+        Args:
+            samples (numpy.ndarray): Amostras int16
+            
+        Returns:
+            io.BytesIO: Buffer contendo áudio WAV
+        """
         wav_buffer = io.BytesIO()
         with wave.open(wav_buffer, 'wb') as wf:
             wf.setnchannels(1)
             wf.setsampwidth(2)  # 16 bits
             wf.setframerate(self.sample_rate)
-            wf.writeframes(b''.join(frames))
+            wf.writeframes(samples)
         
         wav_buffer.seek(0)
         return wav_buffer
@@ -211,8 +1336,286 @@ class WakeWordDetector:
         """Limpar recursos ao destruir o objeto"""
         self.stop()
         
-        if hasattr(self, 'p') and self.p:
-            self.p.terminate()
+        if hasattr(self, 'audio_source') and self.audio_source:
+            self.audio_source.terminate()
+
+
+def _clone_stream_state(model):
+    """
+    Cria uma cópia do modelo com estado de stream próprio e pesos compartilhados
+    
+    O openWakeWord guarda buffers de áudio e features por instância. A cópia
+    rasa compartilha as sessões ONNX/tflite (os pesos) e `reset()` recria
+    apenas os buffers, de modo que cada sala tem seu próprio histórico.
+    
+    Args:
+        model: Modelo openWakeWord carregado
+        
+    Returns:
+        Modelo com estado independente
+    """
+    clone = copy.copy(model)
+    if hasattr(model, "preprocessor"):
+        clone.preprocessor = copy.copy(model.preprocessor)
+    if hasattr(clone, "reset"):
+        clone.reset()
+    return clone
+
+
+class MultiRoomWakeWordDetector:
+    """
+    Detector de palavra de ativação para várias fontes de áudio com um único modelo
+    
+    Uma única thread lê um frame de cada sala, empilha os frames em um lote
+    pré-alocado, aplica a porta de energia de forma vetorizada e executa o
+    modelo apenas nas salas ativas. Modelos que implementam
+    `predict_batch(frames)` (lista de dicts de pontuação) recebem o lote em uma
+    única chamada; para o openWakeWord, que não tem inferência multi-stream,
+    cada sala usa uma cópia do modelo com pesos compartilhados e buffers próprios.
+    
+    Cada sala é um WakeWordDetector sem thread própria, preservando limiar,
+    captura, VAD e callback individuais.
+    """
+    
+    def __init__(self, rooms, model_name="ei brandini", threshold=0.5, offline=True,
+                 model_path=None, inference_framework=None, num_threads=None,
+                 simulation_seed=None, **detector_kwargs):
+        """
+        Inicializa o detector multi-sala
+        
+        Args:
+            rooms (dict): Nome da sala -> AudioSource, ou dict com as chaves
+                'source', 'threshold' (opcional) e 'callback' (opcional)
+            model_name (str): Nome do modelo de palavra de ativação
+            threshold (float): Limiar padrão das salas
+            offline (bool): Se True, tenta usar openWakeWord, caso contrário usa simulação
+            model_path (str): Caminho para um modelo personalizado
+            inference_framework (str): Runtime do openWakeWord ('onnx' ou 'tflite')
+            num_threads (int): Threads de CPU usadas pelo modelo (padrão: orçamento de 'wake_word')
+            simulation_seed (int): Semente da simulação sem openWakeWord
+            **detector_kwargs: Demais argumentos de WakeWordDetector aplicados a cada sala
+        """
+        if not rooms:
+            raise ValueError("É necessário ao menos uma sala")
+        
+        self.model_name = model_name
+        self.running = False
+        self.detection_thread = None
+        self._rng = np.random.default_rng(simulation_seed)
+        
+        # Modelo único, carregado uma vez para todas as salas
+        loader = WakeWordDetector(
+            model_name=model_name,
+            offline=offline,
+            model_path=model_path,
+            inference_framework=inference_framework,
+            num_threads=num_threads
+        )
+        self.model = loader.model
+        self.model_info = loader.model_info
+        self.batched = self.model is not None and hasattr(self.model, "predict_batch")
+        
+        # Salas: detectores sem thread própria, com estado de stream independente
+        self.room_names = []
+        self.rooms = []
+        self.callbacks = []
+        for name, config in rooms.items():
+            if not isinstance(config, dict):
+                config = {"source": config}
+            
+            room_model = None
+            if self.model is not None:
+                room_model = self.model if self.batched else _clone_stream_state(self.model)
+            
+            room = WakeWordDetector(
+                model_name=model_name,
+                threshold=config.get("threshold", threshold),
+                offline=room_model is not None,
+                model_path=model_path,
+                audio_source=config["source"],
+                model=room_model,
+                **detector_kwargs
+            )
+            self.room_names.append(name)
+            self.rooms.append(room)
+            self.callbacks.append(config.get("callback"))
+        
+        # Lote pré-alocado com um frame por sala
+        self.chunk_size = self.rooms[0].chunk_size
+        self._batch = np.zeros((len(self.rooms), self.chunk_size), dtype=np.int16)
+        self._finished = [False] * len(self.rooms)
+        
+        # Contadores
+        self.batches = 0
+        self.inferences = 0
+    
+    def start(self, callback=None):
+        """
+        Inicia a detecção em segundo plano
+        
+        Args:
+            callback (callable): Callback padrão chamado com (nome da sala, áudio)
+                para salas sem callback próprio
+        """
+        if self.running:
+            print("Detector já está em execução")
+            return
+        
+        self._open(callback)
+        
+        self.detection_thread = threading.Thread(target=self._detection_loop)
+        self.detection_thread.daemon = True
+        self.detection_thread.start()
+        
+        print(f"Detector multi-sala iniciado com {len(self.rooms)} sala(s)")
+    
+    def run(self, callback=None):
+        """
+        Executa a detecção na thread atual até o fim de todas as fontes
+        
+        Args:
+            callback (callable): Callback padrão chamado com (nome da sala, áudio)
+        """
+        if self.running:
+            print("Detector já está em execução")
+            return
+        
+        self._open(callback)
+        try:
+            self._detection_loop()
+        finally:
+            self.stop(drain=True)
+    
+    def _open(self, callback):
+        """Abre as fontes de áudio e os despachantes de cada sala"""
+        self.running = True
+        self._finished = [False] * len(self.rooms)
+        
+        for name, room, room_callback in zip(self.room_names, self.rooms, self.callbacks):
+            if room_callback is None and callback is not None:
+                room_callback = self._bind_room_callback(callback, name)
+            room._open(room_callback)
+    
+    @staticmethod
+    def _bind_room_callback(callback, name):
+        """Cria um callback de sala que repassa o nome da sala ao callback padrão"""
+        return lambda audio_buffer: callback(name, audio_buffer)
+    
+    def stop(self, drain=False):
+        """
+        Para a detecção em todas as salas
+        
+        Args:
+            drain (bool): Se True, aguarda os callbacks processarem as capturas pendentes
+        """
+        if not self.running:
+            return
+        
+        self.running = False
+        if self.detection_thread and self.detection_thread is not threading.current_thread():
+            self.detection_thread.join(timeout=2.0)
+        self.detection_thread = None
+        
+        for room in self.rooms:
+            room.stop(drain=drain)
+    
+    def _detection_loop(self):
+        """Loop de detecção: um frame por sala, uma passada do modelo por lote"""
+        while self.running and not all(self._finished):
+            try:
+                self._process_batch()
+            except Exception as e:
+                print(f"Erro no loop de detecção multi-sala: {e}")
+                time.sleep(0.1)
+    
+    def _process_batch(self):
+        """Lê um frame de cada sala e executa a detecção em lote"""
+        candidates = []
+        for i, room in enumerate(self.rooms):
+            if self._finished[i]:
+                continue
+            
+            try:
+                self._batch[i] = room._read_frame()
+            except AudioStreamClosed:
+                room._end_of_stream()
+                self._finished[i] = True
+                continue
+            
+            # Salas capturando um comando não passam pela detecção
+            if not room._step_capture():
+                candidates.append(i)
+        
+        if not candidates:
+            return
+        
+        # Porta de energia vetorizada sobre o lote
+        frames = self._batch[candidates].astype(np.float32) / 32768.0
+        energies_db = 10.0 * np.log10(np.mean(frames * frames, axis=1) + 1e-10)
+        
+        active = []
+        for i, energy_db in zip(candidates, energies_db):
+            room = self.rooms[i]
+            if room.energy_gate is None or room.energy_gate.update_energy(float(energy_db)):
+                active.append(i)
+            elif self.model is not None:
+                room.score_smoother.update(0.0, room.threshold)
+        
+        if not active:
+            return
+        
+        self.batches += 1
+        for i, detected in zip(active, self._predict(active)):
+            if detected:
+                room = self.rooms[i]
+                print(f"Palavra de ativação '{self.model_name}' detectada na sala '{self.room_names[i]}'!")
+                room._handle_detection()
+    
+    def _predict(self, active):
+        """
+        Executa o modelo nas salas ativas
+        
+        Args:
+            active (list): Índices das salas cujo frame passou pela porta de energia
+            
+        Returns:
+            list: Disparo (bool) de cada sala ativa
+        """
+        if self.model is None:
+            # Simulação: detecta aleatoriamente com baixa probabilidade
+            return list(self._rng.random(len(active)) > 0.995)
+        
+        if self.batched:
+            self.inferences += 1
+            predictions = self.model.predict_batch(self._batch[active])
+        else:
+            self.inferences += len(active)
+            predictions = [self.rooms[i].model.predict(self._batch[i]) for i in active]
+        
+        results = []
+        for i, prediction in zip(active, predictions):
+            room = self.rooms[i]
+            score = prediction.get(room.prediction_key, 0.0)
+            results.append(room.score_smoother.update(score, room.threshold))
+        return results
+    
+    def get_stats(self):
+        """
+        Obtém estatísticas do detector multi-sala
+        
+        Returns:
+            dict: Lotes processados, chamadas ao modelo e estatísticas por sala
+        """
+        return {
+            "rooms": len(self.rooms),
+            "batched": self.batched,
+            "batches": self.batches,
+            "inferences": self.inferences,
+            "per_room": {
+                name: room.get_detection_stats()
+                for name, room in zip(self.room_names, self.rooms)
+            }
+        }
 
 
 # Exemplo de uso
@@ -0,0 +1,284 @@
+"""
+Módulo de benchmark do detector de palavra de ativação
+Mede latência de disparo, falsos aceites por hora, perdas e custo de CPU sobre arquivos WAV rotulados
+
+Rótulos: um arquivo labels.json no diretório, no formato
+    {"arquivo.wav": [1.25, 7.80], "ruido.wav": []}
+com os instantes (em segundos) em que cada ocorrência da palavra de ativação
+termina. Alternativamente, cada arquivo pode ter um JSON ao lado
+(arquivo.json) com {"keyword_ends": [...]}. Arquivos sem rótulo são tratados
+como negativos (sem palavra de ativação).
+"""
+
+import os
+import json
+import time
+import wave
+import argparse
+import numpy as np
+
+from modules.audio_source import WavFileSource, AudioStreamClosed
+from modules.wake_word import WakeWordDetector
+
+
+def load_labels(directory):
+    """
+    Carrega os rótulos dos arquivos WAV de um diretório
+    
+    Args:
+        directory (str): Diretório com os arquivos WAV
+    
+    Returns:
+        dict: Nome do arquivo -> lista de instantes de fim da palavra (segundos)
+    """
+    labels = {}
+    labels_path = os.path.join(directory, "labels.json")
+    if os.path.exists(labels_path):
+        with open(labels_path, encoding="utf-8") as f:
+            labels.update(json.load(f))
+    
+    for filename in sorted(os.listdir(directory)):
+        if not filename.lower().endswith(".wav") or filename in labels:
+            continue
+        
+        sidecar = os.path.join(directory, os.path.splitext(filename)[0] + ".json")
+        if os.path.exists(sidecar):
+            with open(sidecar, encoding="utf-8") as f:
+                labels[filename] = json.load(f).get("keyword_ends", [])
+        else:
+            labels[filename] = []
+    
+    return labels
+
+
+def match_detections(detections, keyword_ends, early_tolerance=0.5, max_latency=1.5):
+    """
+    Associa disparos aos rótulos
+    
+    Um disparo é aceite verdadeiro se ocorre entre `early_tolerance` segundos
+    antes e `max_latency` segundos depois do fim de uma palavra ainda não
+    associada. Os demais disparos são falsos aceites.
+    
+    Args:
+        detections (list): Instantes dos disparos em segundos
+        keyword_ends (list): Instantes de fim da palavra de ativação em segundos
+        early_tolerance (float): Antecedência máxima aceita em segundos
+        max_latency (float): Atraso máximo aceito em segundos
+    
+    Returns:
+        tuple: (latências dos acertos, número de falsos aceites, número de perdas)
+    """
+    pending = sorted(keyword_ends)
+    latencies = []
+    false_accepts = 0
+    
+    for detection in sorted(detections):
+        match = next(
+            (end for end in pending if -early_tolerance <= detection - end <= max_latency),
+            None
+        )
+        if match is None:
+            false_accepts += 1
+        else:
+            pending.remove(match)
+            latencies.append(detection - match)
+    
+    return latencies, false_accepts, len(pending)
+
+
+def run_file(detector, path, keyword_ends, early_tolerance=0.5, max_latency=1.5):
+    """
+    Executa o detector sobre um arquivo WAV na velocidade máxima
+    
+    Args:
+        detector (WakeWordDetector): Detector configurado
+        path (str): Caminho para o arquivo WAV
+        keyword_ends (list): Instantes de fim da palavra de ativação em segundos
+        early_tolerance (float): Antecedência máxima aceita em segundos
+        max_latency (float): Atraso máximo aceito em segundos
+    
+    Returns:
+        dict: Métricas do arquivo ou None se o formato não for suportado
+    """
+    try:
+        source = WavFileSource(path, realtime=False)
+        source.open(detector.sample_rate, detector.chunk_size)
+    except (ValueError, EOFError, wave.Error) as e:
+        print(f"Ignorando {os.path.basename(path)}: {str(e) or 'arquivo WAV inválido'}")
+        return None
+    detector.reset()
+    
+    gate = detector.energy_gate
+    skipped_before = gate.frames_skipped if gate else 0
+    detections = []
+    frames = 0
+    
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    try:
+        while True:
+            audio_frame = np.frombuffer(source.read(detector.chunk_size), dtype=np.int16)
+            frames += 1
+            if detector.detect(audio_frame):
+                # Disparo no fim do frame que o provocou
+                detections.append(frames * detector.chunk_size / detector.sample_rate)
+    except AudioStreamClosed:
+        pass
+    finally:
+        source.close()
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    
+    latencies, false_accepts, misses = match_detections(
+        detections, keyword_ends, early_tolerance, max_latency
+    )
+    
+    return {
+        "file": os.path.basename(path),
+        "audio_seconds": source.duration,
+        "wall_seconds": wall,
+        "cpu_seconds": cpu,
+        "keywords": len(keyword_ends),
+        "detections": detections,
+        "hits": len(latencies),
+        "misses": misses,
+        "false_accepts": false_accepts,
+        "latencies": latencies,
+        "frames": frames,
+        "frames_skipped": (gate.frames_skipped - skipped_before) if gate else 0
+    }
+
+
+def summarize(results):
+    """
+    Agrega as métricas de todos os arquivos
+    
+    Args:
+        results (list): Métricas por arquivo (ver run_file)
+    
+    Returns:
+        dict: Métricas agregadas
+    """
+    audio_seconds = sum(r["audio_seconds"] for r in results)
+    audio_hours = audio_seconds / 3600.0
+    wall = sum(r["wall_seconds"] for r in results)
+    cpu = sum(r["cpu_seconds"] for r in results)
+    keywords = sum(r["keywords"] for r in results)
+    hits = sum(r["hits"] for r in results)
+    false_accepts = sum(r["false_accepts"] for r in results)
+    frames = sum(r["frames"] for r in results)
+    latencies = [latency for r in results for latency in r["latencies"]]
+    
+    summary = {
+        "files": len(results),
+        "audio_seconds": audio_seconds,
+        "keywords": keywords,
+        "hits": hits,
+        "misses": sum(r["misses"] for r in results),
+        "miss_rate": (keywords - hits) / keywords if keywords else 0.0,
+        "false_accepts": false_accepts,
+        "false_accepts_per_hour": false_accepts / audio_hours if audio_hours else 0.0,
+        "real_time_factor": wall / audio_seconds if audio_seconds else 0.0,
+        "cpu_seconds_per_audio_hour": cpu / audio_hours if audio_hours else 0.0,
+        "skip_ratio": sum(r["frames_skipped"] for r in results) / frames if frames else 0.0,
+        "latency_mean": None,
+        "latency_p50": None,
+        "latency_p95": None
+    }
+    
+    if latencies:
+        summary["latency_mean"] = float(np.mean(latencies))
+        summary["latency_p50"] = float(np.percentile(latencies, 50))
+        summary["latency_p95"] = float(np.percentile(latencies, 95))
+    
+    return summary
+
+
+def run_benchmark(directory, detector=None, early_tolerance=0.5, max_latency=1.5, **detector_kwargs):
+    """
+    Executa o benchmark sobre um diretório de arquivos WAV rotulados
+    
+    Args:
+        directory (str): Diretório com os arquivos WAV
+        detector (WakeWordDetector): Detector a avaliar (criado com detector_kwargs se None)
+        early_tolerance (float): Antecedência máxima aceita em segundos
+        max_latency (float): Atraso máximo aceito em segundos
+        **detector_kwargs: Argumentos para WakeWordDetector
+    
+    Returns:
+        dict: Configuração, métricas por arquivo e resumo
+    """
+    if detector is None:
+        detector = WakeWordDetector(**detector_kwargs)
+    
+    labels = load_labels(directory)
+    results = []
+    for filename, keyword_ends in sorted(labels.items()):
+        path = os.path.join(directory, filename)
+        print(f"Processando {filename}...")
+        result = run_file(detector, path, keyword_ends, early_tolerance, max_latency)
+        if result is not None:
+            results.append(result)
+    
+    return {
+        "config": {
+            "directory": os.path.abspath(directory),
+            "model": detector.model_path or detector.model_name,
+            "simulated": detector.model is None,
+            "simulation_seed": detector.simulation_seed,
+            "threshold": detector.threshold,
+            "energy_gate": detector.energy_gate is not None,
+            "early_tolerance": early_tolerance,
+            "max_latency": max_latency
+        },
+        "files": results,
+        "summary": summarize(results)
+    }
+
+
+def print_summary(summary):
+    """Exibe o resumo do benchmark"""
+    print(f"Arquivos: {summary['files']} ({summary['audio_seconds'] / 60:.1f} min de áudio)")
+    print(f"Acertos: {summary['hits']}/{summary['keywords']} (perdas: {summary['misses']})")
+    print(f"Falsos aceites por hora: {summary['false_accepts_per_hour']:.2f}")
+    if summary["latency_mean"] is not None:
+        print(f"Latência após o fim da palavra: média {summary['latency_mean'] * 1000:.0f} ms, "
+              f"p50 {summary['latency_p50'] * 1000:.0f} ms, p95 {summary['latency_p95'] * 1000:.0f} ms")
+    print(f"Fator de tempo real: {summary['real_time_factor']:.4f}")
+    print(f"CPU por hora de áudio: {summary['cpu_seconds_per_audio_hour']:.1f} s")
+    print(f"Quadros sem inferência: {summary['skip_ratio'] * 100:.1f}%")
+
+
+# Exemplo de uso
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark do detector de palavra de ativação")
+    parser.add_argument("directory", help="Diretório com arquivos WAV rotulados")
+    parser.add_argument("--model-name", default="ei brandini")
+    parser.add_argument("--model-path", default=None)
+    parser.add_argument("--threshold", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=0, help="Semente da simulação sem openWakeWord")
+    parser.add_argument("--no-energy-gate", action="store_true")
+    parser.add_argument("--early-tolerance", type=float, default=0.5)
+    parser.add_argument("--max-latency", type=float, default=1.5)
+    parser.add_argument("--output", help="Arquivo JSON de saída (padrão: saída padrão)")
+    args = parser.parse_args()
+    
+    report = run_benchmark(
+        args.directory,
+        early_tolerance=args.early_tolerance,
+        max_latency=args.max_latency,
+        model_name=args.model_name,
+        model_path=args.model_path,
+        threshold=args.threshold,
+        simulation_seed=args.seed,
+        energy_gate=not args.no_energy_gate
+    )
+    
+    print_summary(report["summary"])
+    
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"Relatório salvo em: {args.output}")
+    else:
+        print(json.dumps(report, indent=2, ensure_ascii=False))